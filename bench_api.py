@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарки загрузки через API на локальном моке GitHub (github_mock_server)
+
+Мок работает в этом процессе, а каждый сценарий — в отдельном дочернем
+процессе, чтобы пиковый RSS относился только к клиенту. Сценарии:
+
+    many-small   — много маленьких файлов
+    few-huge     — несколько больших файлов
+    unchanged    — повторная загрузка дерева, которое уже есть в ветке
+    list-repos   — список из 5000 репозиториев (постранично)
+
+Пример:
+    python bench_api.py --latency 0.01 --jitter 0.005 --json bench_api.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from github_mock_server import MockGitHubServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# name: (files, size) для полного и быстрого (--quick) прогона
+SCENARIOS = {
+    "many-small": {"full": (2000, 2 * 1024), "quick": (200, 2 * 1024), "engines": True},
+    "few-huge": {"full": (3, 32 * 1024 * 1024), "quick": (2, 4 * 1024 * 1024), "engines": True},
+    "unchanged": {"full": (2000, 2 * 1024), "quick": (200, 2 * 1024), "engines": True},
+    "list-repos": {"full": (5000, 0), "quick": (500, 0), "engines": False},
+}
+
+ENGINES = ["contents", "tree"]
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Пиковый RSS текущего процесса в KB (None, если платформа не сообщает)"""
+    # VmHWM сбрасывается при exec; ru_maxrss на Linux наследует пик родителя (мока)
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS отдаёт байты, Linux — килобайты
+        return peak // 1024 if sys.platform == "darwin" else peak
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset // 1024
+    except Exception:
+        return None
+
+
+def make_tree(root: str, count: int, size: int, seed: int = 0) -> str:
+    """Дерево файлов: по 50 файлов в папке, детерминированное содержимое"""
+    src = os.path.join(root, "src")
+    for i in range(count):
+        folder = os.path.join(src, f"dir{i // 50:04d}")
+        os.makedirs(folder, exist_ok=True)
+        header = f"file {i} seed {seed}\n".encode()
+        body = (header * (size // len(header) + 1))[:size] if size else header
+        with open(os.path.join(folder, f"file{i:06d}.bin"), "wb") as f:
+            f.write(body)
+    return src
+
+
+def seed_repo_from_tree(server: MockGitHubServer, repo_name: str, src: str):
+    """Положить дерево в ветку мока напрямую (без HTTP)"""
+    repo = server.repos[repo_name]
+    changes = {}
+    top = os.path.basename(src)
+    for root, _dirs, files in os.walk(src):
+        for name in files:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, src).replace(os.sep, "/")
+            with open(path, "rb") as f:
+                changes[f"{top}/{rel}"] = ("100644", repo.put_blob(f.read()))
+    repo.commit_files("main", changes, "seed")
+
+
+def run_child(scenario: str, engine: str, api_url: str, workdir: str) -> Dict:
+    """Тело сценария в дочернем процессе"""
+    from github_automation import GitHubAutomation
+
+    gh = GitHubAutomation(token="bench", username="bench", api_base=api_url)
+    # Замеры мока не должны попадать в историю скорости пользователя
+    gh.throughput_history.path = None
+    started = time.perf_counter()
+    if scenario == "list-repos":
+        ok = len(gh.list_repositories()) > 0
+    else:
+        upload = {"contents": gh.upload_files, "tree": gh.upload_files_tree}[engine]
+        ok = upload(repo_name="bench", files=[os.path.join(workdir, "src")], branch="main",
+                    commit_message="bench")
+    wall = time.perf_counter() - started
+    totals = gh.metrics.totals()
+    return {"ok": bool(ok), "wall": wall, "peak_rss_kb": peak_rss_kb(),
+            "client_requests": totals["http_requests"], "bytes_sent": totals["bytes_out"]}
+
+
+def run_scenario(server: MockGitHubServer, scenario: str, engine: Optional[str], quick: bool) -> Dict:
+    count, size = SCENARIOS[scenario]["quick" if quick else "full"]
+    workdir = tempfile.mkdtemp(prefix="gh-bench-")
+    try:
+        server.repos.clear()
+        if scenario == "list-repos":
+            server.add_many_repos(count)
+        else:
+            server.add_repo("bench", {"README.md": b"# bench\n"})
+            src = make_tree(workdir, count, size)
+            if scenario == "unchanged":
+                seed_repo_from_tree(server, "bench", src)
+        server.reset_counters()
+
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", scenario,
+               "--engine", engine or "-", "--api", server.url, "--workdir", workdir]
+        proc = subprocess.run(cmd, capture_output=True, text=True, cwd=HERE)
+        if proc.returncode != 0:
+            return {"scenario": scenario, "engine": engine, "ok": False, "error": proc.stderr.strip()[-500:]}
+        child = json.loads(proc.stdout.strip().splitlines()[-1])
+        return {
+            "scenario": scenario,
+            "engine": engine,
+            "files": count if scenario != "list-repos" else 0,
+            "bytes": count * size,
+            "ok": child["ok"],
+            "wall": round(child["wall"], 4),
+            "requests": server.request_count,
+            "requests_by_route": dict(sorted(server.requests_by_route.items())),
+            "bytes_sent": child["bytes_sent"],
+            "peak_rss_kb": child["peak_rss_kb"],
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_all(scenarios: List[str], engines: List[str], latency: float = 0.0, jitter: float = 0.0,
+            rate_limit: Optional[int] = None, quick: bool = False, seed: int = 0) -> Dict:
+    results = []
+    with MockGitHubServer(latency=latency, jitter=jitter, rate_limit=rate_limit, seed=seed) as server:
+        for scenario in scenarios:
+            for engine in (engines if SCENARIOS[scenario]["engines"] else [None]):
+                result = run_scenario(server, scenario, engine, quick)
+                results.append(result)
+                print(format_row(result), flush=True)
+    return {
+        "meta": {
+            "suite": "api",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": latency,
+            "jitter": jitter,
+            "rate_limit": rate_limit,
+            "quick": quick,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def format_row(r: Dict) -> str:
+    name = f"{r['scenario']}[{r['engine']}]" if r.get("engine") else r["scenario"]
+    if not r.get("ok"):
+        return f"❌ {name:<24} {r.get('error', 'failed')}"
+    rss = f"{r['peak_rss_kb'] / 1024:.1f} MB" if r.get("peak_rss_kb") else "n/a"
+    return (f"✅ {name:<24} {r['wall']:>9.3f} s  {r['requests']:>7} req  "
+            f"{r['bytes_sent'] / 1024 / 1024:>9.2f} MB sent  peak RSS {rss}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки загрузки через API на локальном моке")
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--engine", nargs="+", default=ENGINES, help="contents, tree")
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа мока (с)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Случайная добавка к задержке (с)")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Лимит запросов мока")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="Уменьшенные размеры сценариев")
+    parser.add_argument("--json", help="Сохранить результаты в JSON")
+    # Внутренний режим: тело сценария в дочернем процессе
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--api", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        engine = args.engine[0] if isinstance(args.engine, list) else args.engine
+        print(json.dumps(run_child(args.child, engine, args.api, args.workdir)))
+        return
+
+    report = run_all(args.scenario, args.engine, latency=args.latency, jitter=args.jitter,
+                     rate_limit=args.rate_limit, quick=args.quick, seed=args.seed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📊 Результаты сохранены: {args.json}")
+    if not all(r.get("ok") for r in report["results"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Гейт регрессий производительности
+
+Прогоняет сценарии bench_api (загрузка/список через мок API), bench_git
+(загрузка через локальные bare-репозитории), bench_plan (память плана на
+файл) и отрисовку GUI, сравнивает их
+с сохранённым bench_baseline.json и завершается с кодом 1, если какая-то
+метрика вышла за допуск. Работает без сети и без дисплея: GUI-сценарии
+пропускаются, если нет ни DISPLAY, ни xvfb-run.
+
+Число запросов, отправленные байты, пиковая память и байты на файл плана
+от машины не зависят: их рост сверх допуска — регрессия. Время зависит: каждый
+сценарий прогоняется несколько раз (repeat) и берётся медиана, а перед
+каждым прогоном набора в том же процессе замеряется калибровочная нагрузка
+(CPU или запуски git). Базовое время масштабируется отношением калибровок —
+сравнивается время на этой машине сейчас с ожидаемым для неё же. Рост
+времени выводится как slower и ошибкой становится только с --strict-wall.
+
+Пример:
+    python bench_gate.py                     # сравнить с bench_baseline.json
+    python bench_gate.py --strict-wall       # время тоже блокирует (выделенная машина)
+    python bench_gate.py --update-baseline   # перезаписать базовые значения
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "bench_baseline.json")
+
+# Допустимый относительный рост метрики (0.25 — на 25% хуже базового)
+DEFAULT_TOLERANCES = {
+    "wall": 0.5,
+    "requests": 0.0,
+    "bytes_sent": 0.05,
+    "peak_rss_kb": 0.25,
+    "bytes_per_file": 0.1,
+}
+# Зависят от машины и её загрузки: без --strict-wall только предупреждение
+TIMING_METRICS = ("wall",)
+# Ниже этих абсолютных значений колебания считаются шумом
+NOISE_FLOOR = {"wall": 0.1, "peak_rss_kb": 4096}
+
+DEFAULT_CONFIG = {"suites": ["api", "git", "plan", "gui"], "latency": 0.002, "jitter": 0.0, "seed": 0,
+                  "repeat": 3}
+
+# Калибровка: какой нагрузкой масштабируется время сценариев набора
+CALIBRATION_KIND = {"api": "cpu", "git": "git", "plan": "cpu", "gui": "cpu"}
+CALIBRATION_RUNS = 3
+CALIBRATION_FILES = 50
+
+GUI_REPOS = 300
+GUI_PATHS = 200
+
+
+# ─── сбор метрик ──────────────────────────────────────────────────────────────
+
+def collect_api(config: Dict) -> Dict[str, Dict[str, float]]:
+    import bench_api
+    report = bench_api.run_all(list(bench_api.SCENARIOS), bench_api.ENGINES, latency=config["latency"],
+                               jitter=config["jitter"], quick=True, seed=config["seed"])
+    metrics = {}
+    for r in report["results"]:
+        name = f"api/{r['scenario']}" + (f"[{r['engine']}]" if r.get("engine") else "")
+        metrics[name] = _pick(r, ("ok", "wall", "requests", "bytes_sent", "peak_rss_kb"))
+    return metrics
+
+
+def collect_git(config: Dict) -> Dict[str, Dict[str, float]]:
+    import bench_git
+    report = bench_git.run_all(bench_git.MATRIX["quick"])
+    metrics = {}
+    for r in report["results"]:
+        name = f"git/existing={r['existing_files']},new={r['new_files']}"
+        metrics[name] = _pick(r, ("ok", "wall"))
+    return metrics
+
+
+def collect_plan(config: Dict) -> Dict[str, Dict[str, float]]:
+    import bench_plan
+    report = bench_plan.run_all(bench_plan.SIZES["quick"])
+    return {"plan/upload-plan": _pick(dict(report["results"]["plan"], ok=True), ("ok", "wall", "bytes_per_file"))}
+
+
+def collect_gui(config: Dict) -> Dict[str, Dict[str, float]]:
+    cmd = [sys.executable, os.path.abspath(__file__), "--gui-child"]
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        xvfb = shutil.which("xvfb-run")
+        if not xvfb:
+            print("⏭️ GUI-сценарии пропущены: нет DISPLAY и xvfb-run", flush=True)
+            return {}
+        cmd = [xvfb, "-a"] + cmd
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=HERE)
+    if proc.returncode != 0:
+        print(f"❌ GUI-сценарии не выполнены: {proc.stderr.strip()[-300:]}", flush=True)
+        return {"gui/render": {"ok": False}}
+    metrics = json.loads(proc.stdout.strip().splitlines()[-1])
+    for name, values in metrics.items():
+        print(f"✅ {name:<24} {values['wall']:>9.3f} s", flush=True)
+    return metrics
+
+
+def gui_child() -> Dict[str, Dict[str, float]]:
+    """Отрисовка списка репозиториев и списка файлов (в дочернем процессе)"""
+    import tempfile
+    import customtkinter as ctk
+    from bench_api import peak_rss_kb
+    from github_automation import GitHubAutomation
+    from github_gui_ctk import FileDropZone, ReposPanel, StatusBar
+
+    root = ctk.CTk()
+    root.withdraw()
+    gh = GitHubAutomation(token="bench", username="bench", api_base="http://127.0.0.1:9")
+    gh.list_repositories = lambda: []
+    status = StatusBar(root)
+    repos = [{"name": f"repo-{i:04d}", "private": i % 2 == 0, "description": "bench " * (i % 20),
+              "stargazers_count": i, "forks_count": i // 3, "html_url": ""} for i in range(GUI_REPOS)]
+
+    results = {}
+    panel = ReposPanel(root, gh, status)
+    started = time.perf_counter()
+    panel._fill(repos)
+    root.update_idletasks()
+    results["gui/repos-fill"] = {"ok": True, "wall": time.perf_counter() - started}
+
+    workdir = tempfile.mkdtemp(prefix="gh-bench-gui-")
+    try:
+        paths = []
+        for i in range(GUI_PATHS):
+            path = os.path.join(workdir, f"file{i:04d}.txt")
+            with open(path, "w") as f:
+                f.write("x" * i)
+            paths.append(path)
+        zone = FileDropZone(root)
+        started = time.perf_counter()
+        zone._add_paths(paths)
+        root.update_idletasks()
+        results["gui/file-list"] = {"ok": True, "wall": time.perf_counter() - started}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    rss = peak_rss_kb()
+    for values in results.values():
+        values["peak_rss_kb"] = rss
+    root.destroy()
+    return results
+
+
+def _pick(result: Dict, keys) -> Dict:
+    return {k: result[k] for k in keys if result.get(k) is not None}
+
+
+def collect(config: Dict) -> Tuple[Dict[str, Dict[str, float]], Dict[str, float]]:
+    """
+    Метрики сценариев и калибровка по наборам
+
+    Метрики — из первого прогона, время — медиана repeat прогонов. Перед
+    каждым прогоном набора замеряется его калибровочная нагрузка; калибровка
+    набора — медиана этих замеров.
+    """
+    collectors = {"api": collect_api, "git": collect_git, "plan": collect_plan, "gui": collect_gui}
+    metrics, calibration = {}, {}
+    for suite in config["suites"]:
+        runs, times = [], []
+        for n in range(max(1, config.get("repeat", 1))):
+            measured = calibrate(CALIBRATION_KIND[suite])
+            if measured is not None:
+                times.append(measured)
+            print(f"▶ {suite} ({n + 1})", flush=True)
+            runs.append(collectors[suite](config))
+            if not runs[-1]:
+                break
+        if times:
+            calibration[suite] = statistics.median(times)
+        for name, values in runs[0].items():
+            walls = [run[name]["wall"] for run in runs if run.get(name, {}).get("wall") is not None]
+            if walls:
+                values["wall"] = statistics.median(walls)
+            values["ok"] = all(run.get(name, {}).get("ok", True) for run in runs)
+            metrics[name] = values
+    return metrics, calibration
+
+
+# ─── калибровка ───────────────────────────────────────────────────────────────
+
+def _calibrate_cpu():
+    data = bytes(range(256)) * 4096
+    for _ in range(8):
+        data = hashlib.sha1(data).digest() * 4096 * 16
+    sum(i * i for i in range(1_000_000))
+
+
+def _calibrate_git(workdir: str):
+    subprocess.run(["git", "init", "-q", workdir], check=True, capture_output=True)
+    for i in range(CALIBRATION_FILES):
+        with open(os.path.join(workdir, f"f{i}.txt"), "w") as f:
+            f.write(f"calibration {i}\n" * 64)
+    subprocess.run(["git", "add", "."], cwd=workdir, check=True, capture_output=True)
+    subprocess.run(["git", "-c", "user.name=bench", "-c", "user.email=bench@localhost", "commit", "-q", "-m", "c"],
+                   cwd=workdir, check=True, capture_output=True)
+
+
+def calibrate(kind: str) -> Optional[float]:
+    """Медианное время калибровочной нагрузки kind ('cpu' или 'git'), секунды; None — git нет"""
+    if kind == "git" and not shutil.which("git"):
+        return None
+    times = []
+    for _ in range(CALIBRATION_RUNS):
+        workdir = tempfile.mkdtemp(prefix="gh-bench-cal-")
+        try:
+            started = time.perf_counter()
+            _calibrate_cpu() if kind == "cpu" else _calibrate_git(workdir)
+            times.append(time.perf_counter() - started)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return statistics.median(times)
+
+
+def wall_scale(baseline: Dict, calibration: Dict[str, float], name: str) -> float:
+    """Во сколько раз эта машина сейчас медленнее той, где записана база (для набора сценария)"""
+    suite = name.split("/", 1)[0]
+    base, now = baseline.get("calibration", {}).get(suite), calibration.get(suite)
+    return now / base if base and now else 1.0
+
+
+# ─── сравнение ────────────────────────────────────────────────────────────────
+
+def compare(baseline: Dict, current: Dict[str, Dict[str, float]], calibration: Optional[Dict[str, float]] = None,
+            strict_wall: bool = False) -> Tuple[List[Tuple], int]:
+    """
+    Строки таблицы (scenario, metric, base, cur, delta, limit, status) и число регрессий
+
+    Базовое время умножается на wall_scale: в таблице — ожидаемое время на этой машине.
+    Рост времени сверх допуска — «slower» без ошибки; регрессией он считается
+    только со strict_wall (выделенная машина без посторонней нагрузки).
+    """
+    tolerances = dict(DEFAULT_TOLERANCES, **baseline.get("tolerances", {}))
+    rows, regressions = [], 0
+    for name, base in sorted(baseline.get("scenarios", {}).items()):
+        cur = current.get(name)
+        if cur is None:
+            rows.append((name, "-", "", "", "", "", "skipped"))
+            continue
+        if not cur.get("ok", True):
+            rows.append((name, "ok", "true", "false", "", "", "FAILED"))
+            regressions += 1
+            continue
+        limits = dict(tolerances, **base.get("tolerances", {}))
+        for metric, base_value in base.items():
+            if metric in ("ok", "tolerances") or metric not in limits:
+                continue
+            value = cur.get(metric)
+            if value is None:
+                continue
+            if metric == "wall":
+                base_value *= wall_scale(baseline, calibration or {}, name)
+            limit = limits[metric]
+            allowed = base_value * (1 + limit)
+            delta = (value - base_value) / base_value * 100 if base_value else 0.0
+            if value > allowed and value - base_value > NOISE_FLOOR.get(metric, 0):
+                if metric in TIMING_METRICS and not strict_wall:
+                    status = "slower"
+                else:
+                    status = "REGRESSION"
+                    regressions += 1
+            elif value < base_value * (1 - max(limit, 0.05)):
+                status = "improved"
+            else:
+                status = "ok"
+            rows.append((name, metric, _fmt(metric, base_value), _fmt(metric, value),
+                         f"{delta:+.1f}%", f"+{limit * 100:.0f}%", status))
+    for name in sorted(set(current) - set(baseline.get("scenarios", {}))):
+        rows.append((name, "-", "", "", "", "", "new"))
+    return rows, regressions
+
+
+def _fmt(metric: str, value: float) -> str:
+    if metric == "wall":
+        return f"{value:.3f}s"
+    if metric == "peak_rss_kb":
+        return f"{value / 1024:.1f}MB"
+    if metric == "bytes_per_file":
+        return f"{value:.1f}B"
+    if metric == "bytes_sent":
+        return f"{value / 1024:.1f}KB"
+    return str(int(value))
+
+
+def print_table(rows: List[Tuple]):
+    headers = ("scenario", "metric", "baseline", "current", "delta", "limit", "status")
+    widths = [max(len(str(r[i])) for r in rows + [headers]) for i in range(len(headers))]
+    line = "  ".join(h.ljust(w) for h, w in zip(headers, widths))
+    print(line)
+    print("-" * len(line))
+    for r in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(r, widths)))
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_baseline(path: str, current: Dict, previous: Optional[Dict], config: Dict,
+                   calibration: Dict[str, float]):
+    previous = previous or {}
+    scenarios = {}
+    for name, values in sorted(current.items()):
+        entry = {k: (round(v, 4) if isinstance(v, float) else v) for k, v in values.items() if k != "ok"}
+        # Пер-сценарные допуски переживают обновление базы
+        if "tolerances" in previous.get("scenarios", {}).get(name, {}):
+            entry["tolerances"] = previous["scenarios"][name]["tolerances"]
+        scenarios[name] = entry
+    data = {
+        "config": config,
+        "calibration": {k: round(v, 4) for k, v in sorted(calibration.items())},
+        "tolerances": previous.get("tolerances", DEFAULT_TOLERANCES),
+        "scenarios": scenarios,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Гейт регрессий производительности")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Файл базовых значений")
+    parser.add_argument("--suite", nargs="+", choices=["api", "git", "plan", "gui"], help="Какие наборы прогонять")
+    parser.add_argument("--update-baseline", action="store_true", help="Записать текущие значения как базовые")
+    parser.add_argument("--json", help="Сохранить текущие метрики в JSON")
+    parser.add_argument("--strict-wall", action="store_true",
+                        help="Рост времени сверх допуска — тоже регрессия (для выделенной машины)")
+    parser.add_argument("--gui-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.gui_child:
+        print(json.dumps(gui_child()))
+        return
+
+    baseline = load_baseline(args.baseline)
+    config = dict(DEFAULT_CONFIG, **(baseline or {}).get("config", {}))
+    if args.suite:
+        config["suites"] = args.suite
+
+    current, calibration = collect(config)
+    print("⚖️ Калибровка: " + ", ".join(f"{k} {v:.3f} s" for k, v in sorted(calibration.items())), flush=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline or baseline is None:
+        write_baseline(args.baseline, current, baseline, config, calibration)
+        print(f"📌 Базовые значения записаны: {args.baseline}")
+        return
+
+    if args.suite:
+        baseline = dict(baseline, scenarios={k: v for k, v in baseline["scenarios"].items()
+                                             if k.split("/", 1)[0] in args.suite})
+    rows, regressions = compare(baseline, current, calibration, strict_wall=args.strict_wall)
+    print()
+    print_table(rows)
+    print()
+    if regressions:
+        print(f"❌ Регрессий: {regressions}")
+        sys.exit(1)
+    print("✅ Регрессий нет")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарки загрузки через Git (upload_files_git) на локальных bare-репозиториях
+
+Remote подменяется через git_base: file:// (по умолчанию) или локальный
+`git daemon` (--transport daemon). Каждый прогон получает свежий bare-репозиторий
+с заданным числом уже существующих файлов; время снимается по этапам
+clone / stage / add / status / commit / push.
+
+Пример:
+    python bench_git.py --json bench_git.json
+    python bench_git.py --compare old.json new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from github_automation import GitHubAutomation
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+OWNER = "bench"
+PHASES = ["clone", "stage", "add", "status", "commit", "push"]
+
+# (файлов уже в репозитории, новых файлов, размер файла)
+MATRIX = {
+    "full": [(0, 100, 4096), (0, 5000, 4096), (5000, 100, 4096), (5000, 5000, 4096), (20000, 1000, 4096)],
+    "quick": [(0, 50, 1024), (500, 50, 1024), (500, 500, 1024)],
+}
+
+
+def git(args: List[str], cwd: Optional[str] = None) -> str:
+    return subprocess.run(["git"] + args, cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+def write_files(root: str, prefix: str, count: int, size: int):
+    for i in range(count):
+        folder = os.path.join(root, prefix, f"dir{i // 100:04d}")
+        os.makedirs(folder, exist_ok=True)
+        header = f"{prefix} {i}\n".encode()
+        with open(os.path.join(folder, f"f{i:06d}.txt"), "wb") as f:
+            f.write((header * (size // len(header) + 1))[:size])
+
+
+def make_remote(remotes_root: str, repo_name: str, existing: int, size: int) -> str:
+    """Bare-репозиторий с одним коммитом, в котором `existing` файлов"""
+    bare = os.path.join(remotes_root, OWNER, f"{repo_name}.git")
+    git(["init", "-q", "--bare", "-b", "main", bare])
+    seed = tempfile.mkdtemp(prefix="gh-bench-seed-")
+    try:
+        git(["init", "-q", "-b", "main"], cwd=seed)
+        with open(os.path.join(seed, "README.md"), "w") as f:
+            f.write("# bench\n")
+        write_files(seed, "existing", existing, size)
+        git(["add", "."], cwd=seed)
+        git(["-c", "user.name=bench", "-c", "user.email=bench@localhost", "commit", "-q", "-m", "seed"], cwd=seed)
+        git(["push", "-q", bare, "main"], cwd=seed)
+    finally:
+        shutil.rmtree(seed, ignore_errors=True)
+    return bare
+
+
+def start_daemon(base_path: str):
+    """git daemon на свободном порту; возвращает (процесс, git://-адрес)"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    proc = subprocess.Popen(
+        ["git", "daemon", "--reuseaddr", "--export-all", "--enable=receive-pack",
+         f"--base-path={base_path}", "--listen=127.0.0.1", f"--port={port}", base_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                break
+        except OSError:
+            time.sleep(0.05)
+    return proc, f"git://127.0.0.1:{port}"
+
+
+def run_case(git_base: str, remotes_root: str, existing: int, new: int, size: int) -> Dict:
+    repo_name = f"bench-{existing}-{new}"
+    make_remote(remotes_root, repo_name, existing, size)
+    src_root = tempfile.mkdtemp(prefix="gh-bench-src-")
+    try:
+        write_files(src_root, "upload", new, size)
+        gh = GitHubAutomation(token="bench", username=OWNER, git_base=git_base)
+        started = time.perf_counter()
+        ok = gh.upload_files_git(repo_name, [os.path.join(src_root, "upload")], branch="main",
+                                 commit_message="bench")
+        wall = time.perf_counter() - started
+        phases = gh.metrics.phases()
+        return {
+            "case": f"existing={existing} new={new} size={size}",
+            "existing_files": existing,
+            "new_files": new,
+            "file_size": size,
+            "ok": bool(ok),
+            "wall": round(wall, 4),
+            "phases": {name: round(phases.get(name, 0.0), 4) for name in PHASES},
+            "git_commands": gh.metrics.totals()["git_commands"],
+        }
+    finally:
+        shutil.rmtree(src_root, ignore_errors=True)
+
+
+def tool_version() -> str:
+    try:
+        return git(["describe", "--always", "--dirty"], cwd=HERE).strip()
+    except Exception:
+        return "unknown"
+
+
+def run_all(matrix: List, transport: str = "file") -> Dict:
+    remotes_root = tempfile.mkdtemp(prefix="gh-bench-remotes-")
+    daemon = None
+    try:
+        if transport == "daemon":
+            daemon, git_base = start_daemon(remotes_root)
+        else:
+            git_base = "file://" + remotes_root.replace(os.sep, "/")
+        results = []
+        for existing, new, size in matrix:
+            result = run_case(git_base, remotes_root, existing, new, size)
+            results.append(result)
+            print(format_row(result), flush=True)
+    finally:
+        if daemon:
+            daemon.terminate()
+            daemon.wait()
+        shutil.rmtree(remotes_root, ignore_errors=True)
+    return {
+        "meta": {
+            "suite": "git",
+            "transport": transport,
+            "version": tool_version(),
+            "git": git(["--version"]).strip(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def format_row(r: Dict) -> str:
+    if not r["ok"]:
+        return f"❌ {r['case']}"
+    phases = "  ".join(f"{name} {r['phases'][name]:.3f}" for name in PHASES)
+    return f"✅ {r['case']:<36} {r['wall']:>8.3f} s  |  {phases}"
+
+
+def compare(old_path: str, new_path: str):
+    """Таблица изменения времени этапов между двумя прогонами"""
+    with open(old_path, encoding="utf-8") as f:
+        old = {r["case"]: r for r in json.load(f)["results"]}
+    with open(new_path, encoding="utf-8") as f:
+        new_report = json.load(f)
+    print(f"{'case':<36} {'phase':<8} {'old':>9} {'new':>9} {'delta':>8}")
+    for r in new_report["results"]:
+        base = old.get(r["case"])
+        if not base:
+            continue
+        for name in PHASES + ["wall"]:
+            a = base["wall"] if name == "wall" else base["phases"].get(name, 0.0)
+            b = r["wall"] if name == "wall" else r["phases"].get(name, 0.0)
+            delta = f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+            print(f"{r['case']:<36} {name:<8} {a:>9.3f} {b:>9.3f} {delta:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки загрузки через Git на локальных bare-репозиториях")
+    parser.add_argument("--transport", choices=["file", "daemon"], default="file",
+                        help="file:// или локальный git daemon (git://)")
+    parser.add_argument("--quick", action="store_true", help="Уменьшенная матрица размеров")
+    parser.add_argument("--json", help="Сохранить результаты в JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Сравнить два JSON-отчёта")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run_all(MATRIX["quick" if args.quick else "full"], transport=args.transport)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📊 Результаты сохранены: {args.json}")
+    if not all(r["ok"] for r in report["results"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пропускная способность локального хеширования (github_hashing)
+
+Сравнивает последовательное чтение + hash_data с BlobHasher в потоках
+хеширования конвейера загрузки (github_pipeline, mmap для крупных файлов)
+на дереве из мелких и крупных файлов. Сеть не используется.
+
+Пример:
+    python bench_hash.py --workers 1 4 8
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from github_hashing import BlobHasher, hash_data
+from github_pipeline import UploadPipeline
+
+# (мелких файлов, размер мелкого, крупных файлов, размер крупного)
+SIZES = {
+    "full": (20000, 4 * 1024, 8, 128 * 1024 * 1024),
+    "quick": (2000, 4 * 1024, 4, 16 * 1024 * 1024),
+}
+
+
+def make_files(root: str, small: int, small_size: int, large: int, large_size: int) -> List[Tuple[str, int]]:
+    items = []
+    for i in range(small):
+        folder = os.path.join(root, f"dir{i // 100:04d}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"f{i:06d}.txt")
+        with open(path, "wb") as f:
+            f.write(os.urandom(small_size))
+        items.append((path, small_size))
+    chunk = os.urandom(1024 * 1024)
+    for i in range(large):
+        path = os.path.join(root, f"large{i}.bin")
+        with open(path, "wb") as f:
+            for _ in range(large_size // len(chunk)):
+                f.write(chunk)
+        items.append((path, large_size))
+    return items
+
+
+def sequential(items: List[Tuple[str, int]]) -> Dict[str, str]:
+    result = {}
+    for path, _size in items:
+        with open(path, "rb") as f:
+            result[path] = hash_data(f.read())
+    return result
+
+
+def run(items: List[Tuple[str, int]], workers: List[int]) -> List[Dict]:
+    total = sum(size for _path, size in items)
+    rows = []
+    started = time.perf_counter()
+    expected = sequential(items)
+    wall = time.perf_counter() - started
+    rows.append({"method": "sequential read", "workers": 1, "wall": round(wall, 3),
+                 "mb_per_s": round(total / 1024 / 1024 / wall, 1)})
+    for n in workers:
+        hasher = BlobHasher(n)
+        hashes = {}
+        # Как при загрузке: обход кладёт файлы в очередь, n потоков хешируют
+        pipeline = UploadPipeline(lambda item: (item[0], hasher.hash_file(*item)),
+                                  lambda result: hashes.__setitem__(*result), hashers=n)
+        started = time.perf_counter()
+        pipeline.run(items)
+        wall = time.perf_counter() - started
+        assert hashes == expected
+        rows.append({"method": "BlobHasher", "workers": n, "wall": round(wall, 3),
+                     "mb_per_s": round(total / 1024 / 1024 / wall, 1)})
+    for r in rows:
+        print(f"✅ {r['method']:<16} workers={r['workers']:<3} {r['wall']:>8.3f} s  {r['mb_per_s']:>8.1f} MB/s",
+              flush=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пропускная способность локального хеширования")
+    parser.add_argument("--workers", nargs="+", type=int, default=sorted({1, 4, os.cpu_count() or 4}))
+    parser.add_argument("--quick", action="store_true", help="Уменьшенные размеры")
+    parser.add_argument("--json", help="Сохранить результаты в JSON")
+    args = parser.parse_args()
+
+    small, small_size, large, large_size = SIZES["quick" if args.quick else "full"]
+    workdir = tempfile.mkdtemp(prefix="gh-bench-hash-")
+    try:
+        items = make_files(workdir, small, small_size, large, large_size)
+        # Первый проход прогревает page cache, чтобы сравнивать хеширование, а не диск
+        sequential(items)
+        rows = run(items, args.workers)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"files": len(items), "results": rows}, f, ensure_ascii=False, indent=2)
+        print(f"📊 Результаты сохранены: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
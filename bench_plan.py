@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Память плана загрузки на файл: UploadPlan против списка кортежей
+
+Строит план для синтетического дерева (по 50 файлов в каталоге, глубина 3)
+и меряет прирост памяти через tracemalloc. Диск и сеть не используются.
+
+Пример:
+    python bench_plan.py --files 1000000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Dict, Iterator, Tuple
+
+from github_plan import UploadPlan
+
+SIZES = {"full": 1_000_000, "quick": 100_000}
+LOCAL_ROOT = "/home/user/projects/monorepo"
+
+
+def synthetic_paths(count: int) -> Iterator[Tuple[str, str]]:
+    """(local_path, repo_path) в духе make_tree из bench_api"""
+    for i in range(count):
+        rel = f"pkg{i // 50000:03d}/mod{i // 2500:04d}/dir{i // 50:05d}/file{i:07d}.bin"
+        yield f"{LOCAL_ROOT}/{rel}", f"monorepo/{rel}"
+
+
+def measure(count: int, build) -> Dict:
+    # Время — без tracemalloc (он замедляет каждое выделение), память — отдельным прогоном
+    gc.collect()
+    started = time.perf_counter()
+    plan = build(count)
+    wall = time.perf_counter() - started
+    del plan
+    gc.collect()
+    tracemalloc.start()
+    plan = build(count)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del plan
+    return {"bytes_per_file": round(current / count, 1), "total_mb": round(current / 1024 / 1024, 1),
+            "wall": round(wall, 3)}
+
+
+def build_tuples(count: int):
+    # Прежнее представление: пары строк + размер и sha в hex
+    return [(local, repo, 4096, "0" * 40) for local, repo in synthetic_paths(count)]
+
+
+def build_plan(count: int) -> UploadPlan:
+    plan = UploadPlan()
+    sha = "ab" * 20
+    for local, repo in synthetic_paths(count):
+        plan.add(repo, local, 4096, sha=sha)
+    return plan
+
+
+def run_all(count: int) -> Dict:
+    results = {"tuples": measure(count, build_tuples), "plan": measure(count, build_plan)}
+    for name, r in results.items():
+        print(f"✅ {name:<8} {count} файлов  {r['bytes_per_file']:>7.1f} B/файл  "
+              f"{r['total_mb']:>8.1f} MB  {r['wall']:.2f} s", flush=True)
+    return {"files": count, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Память плана загрузки на файл")
+    parser.add_argument("--files", type=int, default=SIZES["full"], help="Число файлов в плане")
+    parser.add_argument("--quick", action="store_true", help=f"{SIZES['quick']} файлов")
+    parser.add_argument("--json", help="Сохранить результаты в JSON")
+    args = parser.parse_args()
+
+    report = run_all(SIZES["quick"] if args.quick else args.files)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📊 Результаты сохранены: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
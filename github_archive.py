@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Архивы .zip / .tar(.gz, .bz2, .xz) как источник загрузки
+
+Записи читаются прямо из архива, без распаковки на диск: ArchiveReader
+отдаёт файлы архива по порядку с содержимым в памяти (по одной записи),
+и они идут в тот же конвейер хеширования и отправки, что и файлы с диска.
+tar читается потоком (r|*), поэтому распаковка идёт одновременно с
+отправкой уже прочитанных записей.
+
+Без содержимого (with_data=False) читаются только заголовки: у zip это
+центральный каталог, у tar — проход по архиву без сохранения данных.
+Записи с небезопасными путями ('..', абсолютные), не обычные файлы
+(ссылки, устройства) и всё под .git пропускаются; правила исключения
+применяются к путям внутри архива, .gitignore из архива не учитывается.
+"""
+
+import os
+import stat
+import tarfile
+import time
+import zipfile
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from github_walker import IgnoreRules, in_git_dir
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+class ArchiveEntry(NamedTuple):
+    """Файл архива"""
+    rel_path: str  # путь внутри архива, через '/'
+    size: int
+    mode: int
+    mtime: float
+    data: Optional[bytes] = None
+
+
+def is_archive(path: str) -> bool:
+    """Архив ли это (по расширению)"""
+    return path.lower().endswith(ARCHIVE_SUFFIXES) and os.path.isfile(path)
+
+
+def safe_member_path(name: str) -> Optional[str]:
+    """Путь записи архива через '/' или None, если он выходит за пределы архива"""
+    path = name.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    if path.startswith("/") or (len(path) > 1 and path[1] == ":"):
+        return None
+    parts = [p for p in path.split("/") if p and p != "."]
+    if not parts or ".." in parts:
+        return None
+    return "/".join(parts)
+
+
+class ArchiveReader:
+    """
+    Чтение файлов архива с правилами исключения
+
+    Args:
+        path: Путь к архиву
+        rules: Правила исключения (пути внутри архива)
+    """
+
+    def __init__(self, path: str, rules: Optional[IgnoreRules] = None):
+        self.path = path
+        self.rules = rules or IgnoreRules()
+        # Записи, пропущенные из-за пути (для предупреждения)
+        self.skipped: List[str] = []
+        self._dirs: Dict[str, bool] = {}
+
+    def entries(self, with_data: bool = True) -> Iterator[ArchiveEntry]:
+        """Файлы архива в порядке записи; ошибки чтения — ArchiveError"""
+        try:
+            if self.path.lower().endswith(".zip"):
+                yield from self._zip_entries(with_data)
+            else:
+                yield from self._tar_entries(with_data)
+        except (OSError, EOFError, RuntimeError, zipfile.BadZipFile, tarfile.TarError) as e:
+            raise ArchiveError(f"{self.path}: {e}") from e
+
+    def _zip_entries(self, with_data: bool) -> Iterator[ArchiveEntry]:
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                # Права unix в старших битах; у архивов из Windows их нет
+                mode = info.external_attr >> 16
+                if stat.S_IFMT(mode) and not stat.S_ISREG(mode):
+                    continue
+                rel_path = self._accept(info.filename)
+                if rel_path is None:
+                    continue
+                mtime = time.mktime(info.date_time + (0, 0, -1))
+                data = archive.read(info) if with_data else None
+                mode = stat.S_IFREG | (stat.S_IMODE(mode) or 0o644)
+                yield ArchiveEntry(rel_path, info.file_size, mode, mtime, data)
+
+    def _tar_entries(self, with_data: bool) -> Iterator[ArchiveEntry]:
+        # Потоковый режим: архив читается один раз от начала до конца
+        with tarfile.open(self.path, "r|*") as archive:
+            for member in archive:
+                if not member.isreg():
+                    continue
+                rel_path = self._accept(member.name)
+                if rel_path is None:
+                    continue
+                data = archive.extractfile(member).read() if with_data else None
+                yield ArchiveEntry(rel_path, member.size, stat.S_IFREG | stat.S_IMODE(member.mode),
+                                   float(member.mtime), data)
+
+    def _accept(self, name: str) -> Optional[str]:
+        rel_path = safe_member_path(name)
+        if rel_path is None:
+            self.skipped.append(name)
+            return None
+        if in_git_dir(rel_path) or self.rules and self._excluded(rel_path):
+            return None
+        return rel_path
+
+    def _excluded(self, rel_path: str) -> bool:
+        # Исключённый каталог отсекает всё под ним, как при обходе папок
+        parts = rel_path.split("/")
+        for depth in range(1, len(parts)):
+            dir_path = "/".join(parts[:depth])
+            ignored = self._dirs.get(dir_path)
+            if ignored is None:
+                ignored = self._dirs[dir_path] = self.rules.ignored(dir_path, True)
+            if ignored:
+                return True
+        return self.rules.ignored(rel_path, False)
+
+
+class ArchiveError(Exception):
+    """Архив не удалось прочитать"""
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Фоновый процесс (демон) для частых вызовов CLI
+
+Каждый запуск github_automation.py заново импортирует requests, создаёт
+GitHubAutomation, открывает соединения TLS и начинает с пустым регулятором
+лимита запросов. Когда сценарий вызывает CLI сотни раз, запуск дороже самой
+операции. Демон держит всё это прогретым в одном процессе и слушает
+Unix-сокет; тонкий клиент (этот же файл) передаёт ему те же аргументы, что
+и github_automation.py, и выводит поток вывода по мере выполнения:
+
+    python github_daemon.py --serve &
+    python github_daemon.py --action upload-files --repo-name demo --files ./src
+    python github_daemon.py --stop
+
+Для каждых учётных данных (token, username, адреса API и git) между вызовами
+сохраняются сессия с открытыми соединениями, регулятор лимита запросов,
+последний остаток лимита, история замеров полосы и пороги выбора способа
+загрузки (GitHubAutomation.WARM_STATE). Остальное — настройки, метрики,
+подписчики событий — у каждого вызова своё, как при обычном запуске.
+
+Вызов выполняется в рабочей папке и с переменными GITHUB_* клиента; вывод
+и запросы подтверждения (input) идут через сокет. Вызовы выполняются по
+очереди. Если демон не запущен, клиент выполняет команду сам — сценарии
+работают и без него.
+
+Протокол — строки JSON: клиент отправляет {"argv", "cwd", "env", "tty"}
+(или {"command": "stop"}), демон отвечает {"out"} / {"err"} с текстом,
+{"input": true} (клиент отвечает {"line"}) и в конце {"exit": код}.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import traceback
+from typing import Dict, List, Optional
+
+# Переменные окружения клиента, с которыми выполняется вызов
+CLIENT_ENV_PREFIX = "GITHUB_"
+
+
+def default_socket_path() -> str:
+    """GITHUB_AUTOMATION_SOCKET или ~/.github_automation/daemon.sock"""
+    return os.getenv("GITHUB_AUTOMATION_SOCKET") or os.path.join(
+        os.path.expanduser("~"), ".github_automation", "daemon.sock")
+
+
+def unix_sockets_available() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+class DaemonError(Exception):
+    """Демон не удалось запустить"""
+
+
+class _Channel:
+    """Сообщения JSON по строке через сокет (запись из нескольких потоков)"""
+
+    def __init__(self, sock: socket.socket):
+        self.reader = sock.makefile("r", encoding="utf-8", newline="\n")
+        self.writer = sock.makefile("w", encoding="utf-8", newline="\n")
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def send(self, message: Dict):
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                self.writer.write(json.dumps(message, ensure_ascii=False) + "\n")
+                self.writer.flush()
+            except OSError:
+                # Клиент отключился: операция доводится до конца без вывода
+                self.closed = True
+
+    def close(self):
+        # Файлы makefile держат сокет открытым: без этого клиент не увидит конца соединения
+        for f in (self.reader, self.writer):
+            with contextlib.suppress(OSError):
+                f.close()
+
+    def receive(self) -> Optional[Dict]:
+        """Следующее сообщение; None — соединение закрыто. ValueError — не объект JSON"""
+        try:
+            line = self.reader.readline()
+        except OSError:
+            return None
+        if not line:
+            return None
+        message = json.loads(line)
+        if not isinstance(message, dict):
+            raise ValueError("ожидается объект JSON")
+        return message
+
+
+class _ClientOutput(io.TextIOBase):
+    """sys.stdout/sys.stderr вызова: текст уходит клиенту"""
+
+    def __init__(self, channel: _Channel, kind: str, tty: bool):
+        self.channel = channel
+        self.kind = kind
+        self.tty = tty
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return self.tty
+
+    def write(self, text: str) -> int:
+        if text:
+            self.channel.send({self.kind: text})
+        return len(text)
+
+
+class _ClientInput(io.TextIOBase):
+    """sys.stdin вызова: строка запрашивается у клиента (input() в подтверждениях)"""
+
+    def __init__(self, channel: _Channel):
+        self.channel = channel
+
+    def readable(self):
+        return True
+
+    def readline(self, size: int = -1) -> str:
+        self.channel.send({"input": True})
+        reply = self.channel.receive() or {}
+        return reply.get("line") or ""
+
+
+class AutomationDaemon:
+    """
+    Сервер на Unix-сокете: выполняет вызовы github_automation.main с прогретым состоянием
+
+    Args:
+        socket_path: Путь сокета (по умолчанию default_socket_path())
+    """
+
+    def __init__(self, socket_path: Optional[str] = None):
+        self.socket_path = socket_path or default_socket_path()
+        # Прогретое состояние по учётным данным (token, username, api_base, git_base)
+        self._warm: Dict[tuple, Dict[str, object]] = {}
+        self._stopping = False
+        self.calls = 0
+
+    def serve(self):
+        """Слушать сокет до команды stop (вызовы выполняются по очереди)"""
+        if not unix_sockets_available():
+            raise DaemonError("Unix-сокеты недоступны на этой платформе")
+        # Импорт заранее: ради этого демон и держится запущенным
+        import github_automation
+        self._main = github_automation.main
+        self._automation = github_automation.GitHubAutomation
+        server = self._listen()
+        try:
+            while not self._stopping:
+                conn, _ = server.accept()
+                with conn:
+                    channel = _Channel(conn)
+                    try:
+                        self._handle(channel)
+                    except (OSError, ValueError) as e:
+                        # Испорченный запрос или оборванное соединение — дело одного клиента
+                        channel.send({"err": f"❌ Некорректный запрос к демону: {e}\n"})
+                        channel.send({"exit": 2})
+                    finally:
+                        channel.close()
+        finally:
+            server.close()
+            with contextlib.suppress(OSError):
+                os.unlink(self.socket_path)
+
+    def _listen(self) -> socket.socket:
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if _ping(self.socket_path):
+                raise DaemonError(f"демон уже запущен ({self.socket_path})")
+            # Сокет остался от завершившегося демона
+            os.unlink(self.socket_path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Через сокет передаётся токен: доступ только владельцу
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        return server
+
+    def _handle(self, channel: _Channel):
+        request = channel.receive()
+        if not request:
+            return
+        command = request.get("command")
+        if command == "ping":
+            channel.send({"exit": 0})
+        elif command == "stop":
+            self._stopping = True
+            channel.send({"out": "🛑 Демон остановлен\n"})
+            channel.send({"exit": 0})
+        else:
+            _check_request(request)
+            channel.send({"exit": self._run(channel, request)})
+
+    def _run(self, channel: _Channel, request: Dict) -> int:
+        """Вызов main() в окружении клиента; код выхода"""
+        created = []
+
+        def automation(**kwargs):
+            github = self._automation(**kwargs)
+            key = (github.token, github.username, github.api_base, github.git_base)
+            github.adopt_warm_state(self._warm.get(key))
+            created.append((key, github))
+            return github
+
+        tty = bool(request.get("tty"))
+        saved_streams = sys.stdin, sys.stdout, sys.stderr
+        saved_cwd = os.getcwd()
+        saved_env = {name: value for name, value in os.environ.items() if name.startswith(CLIENT_ENV_PREFIX)}
+        code = 0
+        try:
+            os.chdir(request.get("cwd") or saved_cwd)
+            _replace_env(request.get("env") or {})
+            sys.stdin = _ClientInput(channel)
+            sys.stdout = _ClientOutput(channel, "out", tty)
+            sys.stderr = _ClientOutput(channel, "err", tty)
+            self._main(list(request.get("argv") or []), automation=automation)
+        except SystemExit as e:
+            if isinstance(e.code, str):
+                sys.stderr.write(e.code + "\n")
+                code = 1
+            else:
+                code = e.code or 0
+        except Exception:
+            sys.stderr.write(traceback.format_exc())
+            code = 1
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved_streams
+            _replace_env(saved_env)
+            os.chdir(saved_cwd)
+            for key, github in created:
+                self._warm[key] = github.warm_state()
+            self.calls += 1
+        return code
+
+
+def _check_request(request: Dict):
+    """ValueError, если поля вызова не того типа"""
+    argv, cwd, env = request.get("argv", []), request.get("cwd", ""), request.get("env", {})
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+        raise ValueError("argv должен быть списком строк")
+    if not isinstance(cwd, str):
+        raise ValueError("cwd должен быть строкой")
+    if not isinstance(env, dict) or not all(isinstance(v, str) for v in env.values()):
+        raise ValueError("env должен быть объектом со строковыми значениями")
+
+
+def _replace_env(env: Dict[str, str]):
+    """Переменные GITHUB_* процесса — ровно из env"""
+    for name in [name for name in os.environ if name.startswith(CLIENT_ENV_PREFIX)]:
+        if name not in env:
+            del os.environ[name]
+    for name, value in env.items():
+        if name.startswith(CLIENT_ENV_PREFIX):
+            os.environ[name] = value
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    """Соединение с демоном; None — демон не запущен"""
+    if not unix_sockets_available() or not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _ping(socket_path: str) -> bool:
+    sock = _connect(socket_path)
+    if sock is None:
+        return False
+    with sock:
+        channel = _Channel(sock)
+        channel.send({"command": "ping"})
+        return channel.receive() is not None
+
+
+def call(argv: List[str], socket_path: Optional[str] = None, command: Optional[str] = None) -> Optional[int]:
+    """
+    Выполнить команду в демоне с выводом в консоль клиента
+
+    Returns:
+        Код выхода; None — демон не запущен
+    """
+    sock = _connect(socket_path or default_socket_path())
+    if sock is None:
+        return None
+    with sock:
+        channel = _Channel(sock)
+        if command:
+            channel.send({"command": command})
+        else:
+            channel.send({
+                "argv": argv,
+                "cwd": os.getcwd(),
+                "env": {name: value for name, value in os.environ.items() if name.startswith(CLIENT_ENV_PREFIX)},
+                "tty": sys.stdout.isatty(),
+            })
+        while True:
+            message = channel.receive()
+            if message is None:
+                print("❌ Соединение с демоном прервано", file=sys.stderr)
+                return 1
+            if "out" in message:
+                sys.stdout.write(message["out"])
+                sys.stdout.flush()
+            elif "err" in message:
+                sys.stderr.write(message["err"])
+                sys.stderr.flush()
+            elif "input" in message:
+                line = sys.stdin.readline()
+                channel.send({"line": line})
+            elif "exit" in message:
+                return message["exit"]
+
+
+def main():
+    """Клиент демона; --serve запускает сам демон, --stop останавливает его"""
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--stop", action="store_true")
+    parser.add_argument("--socket")
+    options, argv = parser.parse_known_args()
+    socket_path = options.socket or default_socket_path()
+
+    if options.serve:
+        daemon = AutomationDaemon(socket_path)
+        print(f"🚀 Демон слушает {daemon.socket_path}")
+        try:
+            daemon.serve()
+        except DaemonError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            pass
+        return
+    if options.stop:
+        if call([], socket_path, command="stop") is None:
+            print("ℹ️ Демон не запущен")
+        return
+
+    code = call(argv, socket_path)
+    if code is None:
+        # Демона нет — выполнить вызов в этом процессе
+        import github_automation
+        github_automation.main(argv)
+        code = 0
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
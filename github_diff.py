@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Сравнение локального плана загрузки с деревом ветки
+
+diff_tree раскладывает файлы плана (github_plan.UploadPlan) по отношению к
+индексу удалённого дерева (path → (mode, sha)): добавленные, изменённые,
+неизменённые, перемещённые и удалённые. Удалённые и перемещённые бывают
+только в синхронизации (scopes): перемещение — файл, которого нет в ветке
+по новому пути, с тем же содержимым, что у пропавшего локально файла внутри
+scopes; такой файл становится правкой дерева без передачи содержимого.
+Без scopes файл с уже известным содержимым — просто добавление (blob
+переиспользуется при отправке), ничего не удаляется.
+"""
+
+import posixpath
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RemoteIndex = Dict[str, Tuple[str, str]]
+
+# Файлы меньше этого размера не считаются перемещёнными: одинаковое содержимое пустых
+# __init__.py, .gitkeep и т.п. ничего не говорит о том, откуда файл взялся
+RENAME_MIN_SIZE = 64
+
+
+@dataclass
+class TreeDiff:
+    """Набор изменений; файлы плана — индексами, удалённые — путями"""
+    added: List[int] = field(default_factory=list)
+    modified: List[int] = field(default_factory=list)
+    unchanged: List[int] = field(default_factory=list)
+    renamed: List[Tuple[str, int]] = field(default_factory=list)  # (старый путь, индекс в плане)
+    deleted: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.modified or self.renamed or self.deleted)
+
+    def changed_indices(self) -> List[int]:
+        """Файлы плана, которые нужно записать в дерево"""
+        return sorted(self.added + self.modified + [index for _old, index in self.renamed])
+
+
+def in_scope(path: str, scopes: Iterable[str]) -> bool:
+    """Лежит ли путь внутри одного из каталогов ('' — весь репозиторий)"""
+    return any(not scope or path == scope or path.startswith(scope + "/") for scope in scopes)
+
+
+def diff_tree(plan, remote: RemoteIndex, scopes: Optional[Iterable[str]] = None) -> TreeDiff:
+    """
+    Разложить план по отношению к удалённому дереву
+
+    Args:
+        plan: UploadPlan с заполненными sha
+        remote: Индекс дерева ветки (path → (mode, sha))
+        scopes: Каталоги репозитория, которые загрузка отражает целиком
+            (синхронизация); только в них пропавшие локально файлы считаются
+            удалёнными (и могут оказаться источником перемещения). Без scopes
+            удалений и перемещений нет
+    """
+    diff = TreeDiff()
+    scopes = [s for s in (scopes or []) if s is not None]
+    for index in range(len(plan)):
+        path = plan.path(index)
+        current = remote.get(path)
+        if current is None:
+            diff.added.append(index)
+        elif current == (plan.git_mode(index), plan.sha(index)):
+            diff.unchanged.append(index)
+        else:
+            diff.modified.append(index)
+
+    # Кандидаты в источники перемещения: пропавшие локально файлы внутри scopes
+    vanished: Dict[str, List[str]] = {}
+    for path, (_mode, sha) in remote.items():
+        if in_scope(path, scopes) and plan.find(path) is None:
+            vanished.setdefault(sha, []).append(path)
+
+    still_added = []
+    for index in diff.added:
+        candidates = vanished.get(plan.sha(index))
+        if not candidates or plan.sizes[index] < RENAME_MIN_SIZE:
+            still_added.append(index)
+            continue
+        # При нескольких кандидатах предпочитаем файл с тем же именем
+        name = plan.name(index)
+        pick = next((i for i, old in enumerate(candidates) if posixpath.basename(old) == name), 0)
+        diff.renamed.append((candidates.pop(pick), index))
+    diff.added = still_added
+    diff.deleted = sorted(path for paths in vanished.values() for path in paths)
+    return diff
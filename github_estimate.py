@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Оценка стоимости загрузки до её запуска
+
+Предпросмотр (GitHubAutomation.preview_upload) обходит и хеширует источник,
+сравнивает его с деревом ветки и по набору изменений считает, сколько
+запросов API понадобится выбранному способу загрузки, хватит ли на них
+остатка лимита и сколько это займёт.
+
+Время оценивается по модели «задержка запроса + тело / полоса»:
+    rtt       — задержка запроса с пустым телом (медиана по маленьким запросам)
+    bandwidth — байт/с на одно соединение для тел запросов
+Обе величины замеряются ThroughputMeter'ом на реальных загрузках и копятся
+в ThroughputHistory (JSON на диске) по адресу API, чтобы следующая оценка
+опиралась на недавно измеренную скорость, а не на константу.
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Тело запроса меньше этого — запрос считается «пустым» (для rtt)
+SMALL_BODY = 16 * 1024
+# Сколько последних замеров хранится на адрес API
+HISTORY_SIZE = 20
+# Без замеров: задержка и полоса по умолчанию
+DEFAULT_RTT = 0.25
+DEFAULT_BANDWIDTH = 1024 * 1024
+# Вторичный лимит GitHub на запросы, создающие содержимое (blob, коммиты, PUT contents)
+CONTENT_WRITES_PER_MINUTE = 80
+CONTENT_WRITES_PER_HOUR = 500
+# Содержимое передаётся в JSON как base64
+BASE64_RATIO = 4 / 3
+
+
+def rate_limit_from_headers(headers) -> Optional[Dict[str, int]]:
+    """Лимит запросов из заголовков X-RateLimit-* (None, если их нет)"""
+    try:
+        return {"limit": int(headers["X-RateLimit-Limit"]),
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "reset": int(headers.get("X-RateLimit-Reset", 0))}
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class ThroughputMeter:
+    """Хук вызовов (call_hooks): замер rtt и полосы на реальной загрузке"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.small_latencies: List[float] = []
+        self._bodies: List[Tuple[int, float]] = []
+
+    def record(self, record):
+        # 404 на проверке наличия — такой же полный оборот запроса; ошибки сервера не в счёт
+        if record.kind != "http" or not record.status or record.status >= 500:
+            return
+        with self._lock:
+            if record.bytes_out < SMALL_BODY:
+                self.small_latencies.append(record.latency)
+            elif record.status < 400:
+                self._bodies.append((record.bytes_out, record.latency))
+
+    @property
+    def rtt(self) -> Optional[float]:
+        with self._lock:
+            return statistics.median(self.small_latencies) if self.small_latencies else None
+
+    @property
+    def bandwidth(self) -> Optional[float]:
+        """Байт/с на соединение: тело / (задержка − rtt)"""
+        rtt = self.rtt or 0.0
+        with self._lock:
+            bodies = list(self._bodies)
+        sent = sum(size for size, _latency in bodies)
+        seconds = sum(max(latency - rtt, 1e-6) for _size, latency in bodies)
+        return sent / seconds if bodies else None
+
+
+class ThroughputHistory:
+    """
+    Недавние замеры rtt/полосы по адресу API (JSON-файл)
+
+    Args:
+        path: Файл истории; None — только в памяти
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._data: Dict[str, List[Dict]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+
+    def add(self, key: str, meter: ThroughputMeter):
+        """Сохранить замер загрузки (если в ней были запросы)"""
+        rtt, bandwidth = meter.rtt, meter.bandwidth
+        if rtt is None and bandwidth is None:
+            return
+        samples = self._data.setdefault(key, [])
+        samples.append({"rtt": rtt, "bandwidth": bandwidth, "timestamp": time.time()})
+        del samples[:-HISTORY_SIZE]
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def recent(self, key: str, name: str) -> Optional[float]:
+        """Медиана недавних замеров величины ('rtt' или 'bandwidth')"""
+        values = [s[name] for s in self._data.get(key, []) if s.get(name)]
+        return statistics.median(values) if values else None
+
+
+@dataclass
+class UploadEstimate:
+    """Итог предпросмотра: набор изменений, запросы API, лимит и время"""
+    engine: str
+    counts: Dict[str, int]
+    sizes: Dict[str, int]
+    api_calls: Dict[str, int]
+    writes: int
+    transfer_bytes: int
+    seconds: float
+    rtt: float
+    bandwidth: float
+    basis: str
+    rate_limit: Optional[Dict[str, int]] = None
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.api_calls.values())
+
+    @property
+    def within_budget(self) -> Optional[bool]:
+        """Хватит ли остатка лимита запросов (None — лимит неизвестен)"""
+        if self.rate_limit is None:
+            return None
+        return self.total_calls <= self.rate_limit["remaining"]
+
+    def to_dict(self) -> Dict:
+        data = dict(self.__dict__)
+        data["total_calls"] = self.total_calls
+        data["within_budget"] = self.within_budget
+        return data
+
+    def describe(self) -> List[str]:
+        """Текст отчёта построчно"""
+        mb = 1024 * 1024
+        labels = (("added", "добавить"), ("modified", "изменить"), ("renamed", "переместить"),
+                  ("deleted", "удалить"), ("unchanged", "без изменений"))
+        lines = ["  " + ", ".join(f"{label} {self.counts.get(key, 0)} ({self.sizes.get(key, 0) / mb:.1f} MB)"
+                                  for key, label in labels)]
+        calls = ", ".join(f"{name} {n}" for name, n in self.api_calls.items() if n)
+        lines.append(f"🌐 Запросов API ({self.engine}): {self.total_calls}" + (f" — {calls}" if calls else "")
+                     + f"; передать {self.transfer_bytes / mb:.1f} MB")
+        if self.rate_limit is None:
+            lines.append("🚦 Лимит запросов: нет данных (сервер не сообщает X-RateLimit-*)")
+        else:
+            reset = time.strftime("%H:%M", time.localtime(self.rate_limit["reset"]))
+            verdict = "хватает" if self.within_budget else f"НЕ хватает, сброс в {reset}"
+            lines.append(f"🚦 Лимит запросов: осталось {self.rate_limit['remaining']} из "
+                         f"{self.rate_limit['limit']} — {verdict}")
+        lines.append(f"⏱️ Оценка времени: {format_duration(self.seconds)} "
+                     f"(rtt {self.rtt * 1000:.0f} ms, {self.bandwidth / mb:.2f} MB/s на соединение, {self.basis})")
+        lines.extend(f"⚠️ {w}" for w in self.warnings)
+        return lines
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} с"
+    if seconds < 3600:
+        return f"{seconds // 60} мин {seconds % 60} с"
+    return f"{seconds // 3600} ч {seconds % 3600 // 60} мин"
+
+
+def content_writes_floor(writes: int) -> float:
+    """Минимальное время на writes запросов, создающих содержимое, при вторичном лимите GitHub"""
+    if writes <= CONTENT_WRITES_PER_MINUTE:
+        return 0.0
+    return max(writes / CONTENT_WRITES_PER_MINUTE * 60, (writes - 1) // CONTENT_WRITES_PER_HOUR * 3600)
+
+
+def estimate_upload(plan, diff, engine: str, remote_shas, remote_sizes: Dict[str, int], *,
+                    branch_exists: bool, blob_check_threshold: int, workers: int,
+                    rtt: float, bandwidth: float, basis: str, hash_rate: float = 0.0,
+                    rate_limit: Optional[Dict[str, int]] = None) -> UploadEstimate:
+    """
+    Оценить загрузку плана выбранным способом
+
+    Args:
+        plan: UploadPlan с заполненными sha
+        diff: TreeDiff плана относительно ветки
+        engine: contents | tree | git
+        remote_shas: SHA blob, которые уже есть в ветке
+        remote_sizes: Размеры файлов ветки (path → байт), для удаляемых
+        branch_exists: Ветка уже есть (иначе — ответвление от ветки по умолчанию)
+        blob_check_threshold: С какого размера blob проверяется HEAD-запросом (tree)
+        workers: Параллельных отправок blob (tree)
+        rtt, bandwidth, basis: Параметры сети и откуда они взяты
+        hash_rate: Скорость хеширования источника, байт/с (0 — не учитывать)
+        rate_limit: Остаток лимита запросов
+    """
+    size = plan.sizes
+    sizes = {
+        "added": sum(size[i] for i in diff.added),
+        "modified": sum(size[i] for i in diff.modified),
+        "renamed": sum(size[i] for _old, i in diff.renamed),
+        "deleted": sum(remote_sizes.get(path, 0) for path in diff.deleted),
+        "unchanged": sum(size[i] for i in diff.unchanged),
+    }
+    counts = {"added": len(diff.added), "modified": len(diff.modified), "renamed": len(diff.renamed),
+              "deleted": len(diff.deleted), "unchanged": len(diff.unchanged)}
+    lookups = 2 if branch_exists else 4  # ref (+ репозиторий и ref ветки по умолчанию) + дерево
+    warnings: List[str] = []
+
+    if engine == "tree":
+        # Как в upload_files_tree: каждый новый по содержимому blob отправляется один раз
+        new_blobs: Dict[str, int] = {}
+        for i in range(len(plan)):
+            sha = plan.sha(i)
+            if sha not in remote_shas and sha not in new_blobs:
+                new_blobs[sha] = size[i]
+        blob_bytes = sum(new_blobs.values())
+        heads = sum(1 for n in new_blobs.values() if n >= blob_check_threshold)
+        commit = 0 if branch_exists and not diff.has_changes else 4
+        api_calls = {"чтение": lookups + (1 if commit else 0), "blob": len(new_blobs), "HEAD": heads,
+                     "коммит": max(commit - 1, 0)}
+        writes = len(new_blobs) + (2 if commit else 0)
+        transfer = blob_bytes
+        parallel = max(workers, 1)
+        network = (len(new_blobs) + heads) * rtt / parallel + blob_bytes * BASE64_RATIO / bandwidth / parallel
+        fixed = (lookups + commit) * rtt
+    elif engine == "contents":
+        # Одна проверка sha на файл; PUT (отдельный коммит) — на каждый новый или изменённый путь
+        puts = diff.added + diff.modified + [i for _old, i in diff.renamed]
+        transfer = sum(size[i] for i in puts)
+        api_calls = {"чтение": len(plan), "PUT": len(puts)}
+        writes = len(puts)
+        network = (len(plan) + len(puts)) * rtt + transfer * BASE64_RATIO / bandwidth
+        fixed = 0.0
+        if diff.renamed:
+            warnings.append("Contents API не удаляет старые пути перемещённых файлов")
+    else:
+        # clone + push: API не нужен, в push уходят только новые объекты
+        transfer = sizes["added"] + sizes["modified"]
+        api_calls = {}
+        writes = 0
+        network = transfer / bandwidth
+        fixed = 4 * rtt
+        warnings.append("Для git учитывается только push; время clone зависит от размера ветки")
+
+    hashing = plan.total_bytes / hash_rate if hash_rate else 0.0
+    # Хеширование и отправка идут конвейером — перекрываются
+    seconds = max(network, hashing) + fixed
+    floor = content_writes_floor(writes)
+    if floor > seconds:
+        seconds = floor
+        warnings.append(f"{writes} запросов, создающих содержимое: вторичный лимит GitHub "
+                        f"({CONTENT_WRITES_PER_MINUTE}/мин, {CONTENT_WRITES_PER_HOUR}/ч) ограничивает скорость")
+    estimate = UploadEstimate(engine=engine, counts=counts, sizes=sizes, api_calls=api_calls, writes=writes,
+                              transfer_bytes=transfer, seconds=seconds, rtt=rtt, bandwidth=bandwidth,
+                              basis=basis, rate_limit=rate_limit, warnings=warnings)
+    if estimate.within_budget is False:
+        warnings.append(f"Нужно {estimate.total_calls} запросов, а осталось {rate_limit['remaining']}")
+    return estimate
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Структурированные события GitHubAutomation
+
+Ядро не печатает в консоль: оно публикует типизированные события в EventBus.
+Потребители подписываются колбэком или читают очередь (EventQueue), CLI рисует
+их через ConsoleRenderer, GUI — через ProgressTracker.
+"""
+
+import queue
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, List, Optional
+
+
+@dataclass
+class Event:
+    """Базовое событие"""
+    timestamp: float = field(default_factory=time.time, init=False)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["type"] = type(self).__name__
+        return data
+
+
+@dataclass
+class OperationStarted(Event):
+    operation: str = ""
+    repo: str = ""
+
+
+@dataclass
+class OperationFinished(Event):
+    operation: str = ""
+    ok: bool = True
+    duration: float = 0.0
+
+
+@dataclass
+class Message(Event):
+    """Произвольное сообщение для пользователя"""
+    text: str = ""
+    level: str = "info"  # info | success | warning
+
+
+@dataclass
+class ErrorEvent(Event):
+    message: str = ""
+    path: Optional[str] = None
+    detail: str = ""
+
+
+@dataclass
+class PlanReady(Event):
+    """План загрузки собран: известны итоговые объёмы"""
+    total_files: int = 0
+    total_bytes: int = 0
+
+
+@dataclass
+class FilePlanned(Event):
+    path: str = ""
+    size: int = 0
+
+
+@dataclass
+class FileHashed(Event):
+    path: str = ""
+    sha: str = ""
+
+
+@dataclass
+class FileSkipped(Event):
+    path: str = ""
+    reason: str = ""
+    size: int = 0
+
+
+@dataclass
+class FileProgress(Event):
+    """Отправлена часть крупного файла (потоковые передачи); sent — всего байт файла"""
+    path: str = ""
+    sent: int = 0
+    size: int = 0
+
+
+@dataclass
+class FileUploaded(Event):
+    path: str = ""
+    bytes: int = 0
+    duration: float = 0.0
+
+
+@dataclass
+class FileRenamed(Event):
+    """Файл перемещён: в дереве меняется путь, содержимое не передаётся"""
+    old_path: str = ""
+    path: str = ""
+    size: int = 0
+
+
+@dataclass
+class CommitCreated(Event):
+    sha: str = ""
+    branch: str = ""
+    files: int = 0
+
+
+@dataclass
+class TargetFinished(Event):
+    """
+    Цель обработана: fan-out (github_fanout) — committed | unchanged | failed,
+    операция над несколькими репозиториями (github_fleet, branch пуст) — done | failed
+    """
+    repo: str = ""
+    branch: str = ""
+    status: str = ""
+    commit: Optional[str] = None
+    files: int = 0
+    error: str = ""
+    duration: float = 0.0
+
+
+@dataclass
+class StepFinished(Event):
+    """Шаг манифеста (github_manifest) выполнен: done | satisfied | failed | blocked"""
+    step: str = ""
+    kind: str = ""
+    repo: str = ""
+    status: str = ""
+    error: str = ""
+    duration: float = 0.0
+
+
+class EventBus:
+    """Потокобезопасная рассылка событий подписчикам"""
+
+    def __init__(self):
+        self._subscribers: List[Callable[[Event], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[Event], None]) -> Callable[[Event], None]:
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+        return callback
+
+    def unsubscribe(self, callback: Callable[[Event], None]):
+        with self._lock:
+            self._subscribers = [cb for cb in self._subscribers if cb is not callback]
+
+    def emit(self, event: Event):
+        for callback in self._subscribers:
+            try:
+                callback(event)
+            except Exception:
+                pass
+
+    def listen(self, maxsize: int = 0) -> "EventQueue":
+        """Очередь событий для чтения из другого потока"""
+        return EventQueue(self, maxsize)
+
+
+class EventQueue:
+    """
+    Подписка-очередь: `for event in queue` отдаёт события до OperationFinished
+    (или до close()).
+
+        with gh.events.listen() as events:
+            threading.Thread(target=gh.upload_files_tree, args=(...)).start()
+            for event in events:
+                ...
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, bus: EventBus, maxsize: int = 0):
+        self._bus = bus
+        self._queue: "queue.Queue" = queue.Queue(maxsize)
+        bus.subscribe(self._queue.put)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return None if item is self._CLOSED else item
+
+    def close(self):
+        self._bus.unsubscribe(self._queue.put)
+        self._queue.put(self._CLOSED)
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is self._CLOSED:
+                return
+            yield item
+            if isinstance(item, OperationFinished):
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ProgressTracker:
+    """Счётчики прогресса загрузки по событиям (файлы и байты)"""
+
+    def __init__(self):
+        # События приходят из нескольких потоков конвейера загрузки
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.total_files = 0
+        self.total_bytes = 0
+        self.done_files = 0
+        self.done_bytes = 0
+        self.skipped = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self.current = ""
+        # Уже учтённые байты файлов, которые ещё отправляются (FileProgress)
+        self._partial = {}
+
+    def update(self, event: Event) -> bool:
+        """Учесть событие; True — если изменился прогресс"""
+        with self._lock:
+            return self._update(event)
+
+    def _update(self, event: Event) -> bool:
+        if isinstance(event, OperationStarted):
+            self.reset()
+            return False
+        if isinstance(event, PlanReady):
+            self.total_files = event.total_files
+            self.total_bytes = event.total_bytes
+        elif isinstance(event, FilePlanned):
+            self.total_files += 1
+            self.total_bytes += event.size
+        elif isinstance(event, FileProgress):
+            # Повтор передачи начинается с нуля — прогресс может и уменьшиться
+            self.done_bytes += event.sent - self._partial.get(event.path, 0)
+            self._partial[event.path] = event.sent
+            self.current = event.path
+        elif isinstance(event, FileUploaded):
+            self.done_files += 1
+            self.done_bytes += event.bytes - self._partial.pop(event.path, 0)
+            self.current = event.path
+        elif isinstance(event, FileSkipped):
+            self.done_files += 1
+            self.done_bytes += event.size
+            self.skipped += 1
+            self.current = event.path
+        elif isinstance(event, ErrorEvent):
+            self.errors += 1
+            return False
+        else:
+            return False
+        return True
+
+    @property
+    def fraction(self) -> float:
+        if self.total_bytes:
+            return min(1.0, self.done_bytes / self.total_bytes)
+        if self.total_files:
+            return min(1.0, self.done_files / self.total_files)
+        return 0.0
+
+    @property
+    def rate(self) -> float:
+        """Скорость, байт/с"""
+        elapsed = time.monotonic() - self.started
+        return self.done_bytes / elapsed if elapsed > 0 else 0.0
+
+    def describe(self) -> str:
+        mb = 1024 * 1024
+        text = f"{self.done_files}/{self.total_files} файлов · {self.done_bytes / mb:.1f}/{self.total_bytes / mb:.1f} MB"
+        if self.done_bytes:
+            text += f" · {self.rate / mb:.1f} MB/s"
+        if self.skipped:
+            text += f" · без отправки: {self.skipped}"
+        return text
+
+
+class ConsoleRenderer:
+    """
+    Вывод событий в консоль для CLI
+
+    Пофайловые события не печатаются построчно: строка прогресса обновляется
+    не чаще min_interval (вывод в консоль Windows дорогой).
+    """
+
+    def __init__(self, stream=None, min_interval: float = 0.2):
+        self.stream = stream or sys.stdout
+        self.min_interval = min_interval
+        self.tracker = ProgressTracker()
+        self._tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self._last_draw = 0.0
+        self._dirty = False
+        self._line_open = False
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        with self._lock:
+            if self.tracker.update(event):
+                self._dirty = True
+                self._draw_progress()
+            elif isinstance(event, Message):
+                self._print(event.text)
+            elif isinstance(event, ErrorEvent):
+                where = f" '{event.path}'" if event.path else ""
+                self._print(f"❌ {event.message}{where}" + (f"\n{event.detail}" if event.detail else ""))
+            elif isinstance(event, FileRenamed):
+                self._print(f"🔀 {event.old_path} → {event.path}")
+            elif isinstance(event, CommitCreated):
+                self._print(f"✅ Коммит {event.sha[:7]} записан в '{event.branch}' ({event.files} файлов)")
+            elif isinstance(event, TargetFinished):
+                # Об успехе операции над репозиторием (done) сообщает сама операция
+                target = f"{event.repo}@{event.branch}" if event.branch else event.repo
+                if event.status == "committed":
+                    self._print(f"🎯 {target}: коммит {event.commit[:7]} ({event.files} файлов)")
+                elif event.status == "unchanged":
+                    self._print(f"🎯 {target}: без изменений")
+                elif event.status == "failed":
+                    self._print(f"❌ {target}: {event.error}")
+            elif isinstance(event, StepFinished):
+                # О выполненном шаге сообщает сама операция
+                if event.status == "satisfied":
+                    self._print(f"⏭️ {event.step}: уже выполнен")
+                elif event.status == "failed":
+                    self._print(f"❌ {event.step}: {event.error}")
+                elif event.status == "blocked":
+                    self._print(f"⛔ {event.step}: пропущен — {event.error}")
+            elif isinstance(event, OperationFinished):
+                if self._dirty:
+                    self._draw_progress(force=True)
+                self._end_line()
+
+    def _draw_progress(self, force: bool = False):
+        now = time.monotonic()
+        done = self.tracker.total_files and self.tracker.done_files >= self.tracker.total_files
+        if not force and not done and now - self._last_draw < self.min_interval:
+            return
+        if not self._tty and not force and not done and now - self._last_draw < max(self.min_interval, 5.0):
+            return
+        self._last_draw = now
+        self._dirty = False
+        line = f"📤 {self.tracker.describe()}"
+        if self._tty:
+            self.stream.write(f"\r{line}\033[K")
+            self._line_open = True
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def _end_line(self):
+        if self._line_open:
+            self.stream.write("\n")
+            self.stream.flush()
+            self._line_open = False
+
+    def _print(self, text: str):
+        self._end_line()
+        self.stream.write(text + "\n")
+        self.stream.flush()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Один набор изменений — в несколько репозиториев и веток (fan-out)
+
+Источник обходится и хешируется один раз: получается UploadPlan с sha всех
+файлов. Затем для каждой цели (репозиторий, ветка) свой набор изменений
+считается по дереву ветки (github_diff). Цели одного репозитория делят blob:
+содержимое, которого нет ни в одной из его веток, отправляется один раз, и
+коммиты всех веток ссылаются на него. Репозитории обрабатываются параллельно.
+Ошибка одной цели не останавливает остальные; итог собирается в FanoutReport
+с таблицей по целям.
+
+Цель в командной строке — 'repo' (ветка по умолчанию) или 'repo:branch'.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+from github_lfs import LfsObject
+from github_plan import UploadPlan
+
+
+class Target(NamedTuple):
+    """Цель загрузки"""
+    repo: str
+    branch: str
+
+
+def parse_target(spec: str, default_branch: str = "main") -> Target:
+    """'repo' или 'repo:branch'; ValueError, если имя пустое"""
+    repo, sep, branch = spec.strip().partition(":")
+    repo, branch = repo.strip(), branch.strip() if sep else default_branch
+    if not repo or not branch:
+        raise ValueError(f"недопустимая цель '{spec}' (ожидается repo или repo:branch)")
+    return Target(repo, branch)
+
+
+def as_targets(targets: Iterable[Union[Target, Sequence[str], str]], default_branch: str = "main") -> List[Target]:
+    """Цели из строк 'repo[:branch]' и пар (repo, branch)"""
+    return [parse_target(t, default_branch) if isinstance(t, str) else Target(*t) for t in targets]
+
+
+def group_targets(targets: Iterable[Target]) -> Dict[str, List[str]]:
+    """Ветки по репозиториям — в порядке первого упоминания, без повторов"""
+    groups: Dict[str, List[str]] = {}
+    for repo, branch in targets:
+        branches = groups.setdefault(repo, [])
+        if branch not in branches:
+            branches.append(branch)
+    return groups
+
+
+@dataclass
+class ChangeSet:
+    """
+    Набор изменений, общий для всех целей
+
+    Содержимое, которое нельзя перечитать с диска (файлы из памяти и архивов,
+    указатели LFS), хранится в inline по sha blob до конца загрузки.
+    """
+    plan: UploadPlan
+    scopes: List[str]
+    sync: bool = False
+    inline: Dict[str, bytes] = field(default_factory=dict)
+    lfs_objects: List[LfsObject] = field(default_factory=list)
+    lfs_paths: List[str] = field(default_factory=list)
+
+
+@dataclass
+class TargetResult:
+    """Итог цели: committed | unchanged | failed"""
+    repo: str
+    branch: str
+    status: str
+    commit: Optional[str] = None
+    files: int = 0
+    error: str = ""
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+
+STATUS_LABELS = {"committed": "✅ коммит", "unchanged": "➖ без изменений", "failed": "❌ ошибка"}
+
+
+@dataclass
+class FanoutReport:
+    """Итог fan-out по целям; истинен, если все цели без ошибок"""
+    results: List[TargetResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+    def __bool__(self):
+        return bool(self.results) and self.ok
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+    def describe(self) -> str:
+        return (f"целей {len(self.results)}: коммитов {self.count('committed')}, "
+                f"без изменений {self.count('unchanged')}, ошибок {self.count('failed')}")
+
+    def table(self) -> List[str]:
+        """Таблица по целям (строки для вывода)"""
+        header = ("репозиторий", "ветка", "результат", "коммит", "файлов", "время")
+        rows = [(r.repo, r.branch, STATUS_LABELS.get(r.status, r.status), (r.commit or "")[:7] or "-",
+                 str(r.files) if r.status == "committed" else "-", f"{r.duration:.1f}s")
+                for r in self.results]
+        widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+        lines = ["  " + "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+                 for row in [header] + rows]
+        lines += [f"  ❌ {r.repo}@{r.branch}: {r.error}" for r in self.results if r.error]
+        return lines
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пакетные операции над множеством репозиториев (fleet)
+
+Одна операция (настройки, защита ветки, создание ветки, удаление) применяется
+ко всем выбранным репозиториям параллельно, под общим регулятором лимита
+запросов (github_ratelimit). Ошибка в одном репозитории не останавливает
+остальные; итог собирается в FleetReport с таблицей и JSON-отчётом.
+
+Репозитории выбираются RepoSelector'ом — объединение:
+
+    names    — явный список имён
+    file     — файл с именами, по одному в строке ('#' — комментарий)
+    patterns — шаблоны fnmatch ('svc-*') по списку репозиториев пользователя
+"""
+
+import fnmatch
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Операция → метод GitHubAutomation (первый аргумент — имя репозитория)
+FLEET_OPERATIONS: Dict[str, str] = {
+    "update-settings": "update_repository_settings",
+    "protect-branch": "set_branch_protection",
+    "create-branch": "create_branch",
+    "delete-repo": "delete_repository",
+}
+
+
+@dataclass
+class RepoSelector:
+    """Выбор репозиториев: список, файл и шаблоны по списку пользователя"""
+    names: List[str] = field(default_factory=list)
+    patterns: List[str] = field(default_factory=list)
+    file: Optional[str] = None
+
+    def __bool__(self):
+        return bool(self.names or self.patterns or self.file)
+
+    def resolve(self, list_names: Callable[[], Iterable[str]]) -> List[str]:
+        """
+        Имена выбранных репозиториев (без повторов, в порядке выбора)
+
+        list_names вызывается только при заданных шаблонах. OSError — файл не прочитан.
+        """
+        selected = list(self.names)
+        if self.file:
+            with open(self.file, "r", encoding="utf-8") as f:
+                selected += [line.split("#", 1)[0].strip() for line in f]
+        if self.patterns:
+            selected += [name for name in list_names()
+                         if any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns)]
+        return list(dict.fromkeys(name for name in selected if name))
+
+
+@dataclass
+class FleetResult:
+    """Итог операции над репозиторием"""
+    repo: str
+    ok: bool
+    error: str = ""
+    duration: float = 0.0
+
+
+@dataclass
+class FleetReport:
+    """Итог пакетной операции; истинен, если она выполнена во всех репозиториях"""
+    operation: str
+    results: List[FleetResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+    def __bool__(self):
+        return bool(self.results) and self.ok
+
+    @property
+    def failed(self) -> List[FleetResult]:
+        return [r for r in self.results if not r.ok]
+
+    def describe(self) -> str:
+        return (f"{self.operation}: репозиториев {len(self.results)}, "
+                f"выполнено {len(self.results) - len(self.failed)}, ошибок {len(self.failed)}")
+
+    def table(self) -> List[str]:
+        """Таблица по репозиториям (строки для вывода)"""
+        header = ("репозиторий", "результат", "время", "ошибка")
+        rows = [(r.repo, "✅ готово" if r.ok else "❌ ошибка", f"{r.duration:.1f}s", r.error)
+                for r in self.results]
+        widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+        return ["  " + "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+                for row in [header] + rows]
+
+    def to_dict(self) -> Dict:
+        return {"operation": self.operation, "ok": self.ok, "results": [asdict(r) for r in self.results]}
+
+    def write(self, path: str):
+        """JSON-отчёт в файл"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
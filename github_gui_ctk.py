@@ -5,6 +5,7 @@ import os
 import sys
 import io
 import threading
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import json
@@ -27,6 +28,7 @@ except ImportError:
     sys.exit(1)
 
 from github_automation import GitHubAutomation
+from github_events import ErrorEvent, ProgressTracker
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ОПРЕДЕЛЕНИЕ ПУТИ К ПРИЛОЖЕНИЮ (для PyInstaller)
@@ -71,6 +73,7 @@ COLORS = {
 
 ICONS = {
     "upload": "📤",
+    "release": "📦",
     "repos": "📚",
     "create": "➕",
     "branch": "🌿",
@@ -171,11 +174,20 @@ class StatusBar(ctk.CTkFrame):
         
     def show_progress(self, show: bool = True):
         if show:
+            self.progress.configure(mode="indeterminate")
             self.progress.grid()
             self.progress.start()
         else:
             self.progress.stop()
             self.progress.grid_remove()
+            
+    def set_progress(self, fraction: float):
+        """Определённый прогресс 0..1 вместо бегущей полосы"""
+        if self.progress.cget("mode") != "determinate":
+            self.progress.stop()
+            self.progress.configure(mode="determinate")
+            self.progress.grid()
+        self.progress.set(fraction)
 
 
 class CustomFileBrowser(ctk.CTkToplevel):
@@ -824,6 +836,15 @@ class LoginFrame(ctk.CTkFrame):
 # ПАНЕЛИ ФУНКЦИЙ
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Способы загрузки в UploadPanel: подпись → engine (первый — по умолчанию)
+UPLOAD_ENGINES = {
+    "🧭 Авто": "auto",
+    "Git (clone/push)": "git",
+    "Git Data API (один коммит)": "tree",
+    "Contents API (по файлу)": "contents",
+}
+
+
 class UploadPanel(ctk.CTkFrame):
     """Панель загрузки файлов"""
     def __init__(self, master, gh: GitHubAutomation, status_bar: StatusBar):
@@ -919,18 +940,38 @@ class UploadPanel(ctk.CTkFrame):
         bottom.grid(row=3, column=0, sticky="ew")
         bottom.grid_columnconfigure(0, weight=1)
         
-        self.use_git_var = tk.BooleanVar(value=True)  # По умолчанию Git (быстрее для больших файлов)
-        ctk.CTkCheckBox(
-            bottom,
-            text="Использовать Git (требуется установка Git, быстрее для больших файлов)",
-            variable=self.use_git_var,
+        # Способ загрузки: по умолчанию выбирается автоматически (github_strategy)
+        engine_frame = ctk.CTkFrame(bottom, fg_color="transparent")
+        engine_frame.grid(row=0, column=0, sticky="w")
+        ctk.CTkLabel(engine_frame, text="Способ загрузки", font=("Segoe UI", 12),
+                     text_color=COLORS["text_secondary"]).pack(side="left", padx=(0, 10))
+        self.engine_option = ctk.CTkOptionMenu(
+            engine_frame,
+            values=list(UPLOAD_ENGINES),
             font=("Segoe UI", 12),
-            checkbox_height=22,
-            checkbox_width=22,
-            corner_radius=4,
-            fg_color=COLORS["accent"],
-            hover_color=COLORS["accent_hover"]
-        ).grid(row=0, column=0, sticky="w")
+            height=38,
+            width=260,
+            corner_radius=8,
+            fg_color=COLORS["bg_tertiary"],
+            button_color=COLORS["border"],
+            button_hover_color=COLORS["text_secondary"]
+        )
+        self.engine_option.set(next(iter(UPLOAD_ENGINES)))
+        self.engine_option.pack(side="left")
+        
+        # Предпросмотр: набор изменений, число запросов, лимит и оценка времени без отправки
+        self.preview_btn = ctk.CTkButton(
+            bottom,
+            text="👁 Предпросмотр",
+            height=48,
+            width=160,
+            font=("Segoe UI Emoji", 14),
+            corner_radius=8,
+            fg_color=COLORS["bg_tertiary"],
+            hover_color=COLORS["border"],
+            command=self._preview
+        )
+        self.preview_btn.grid(row=0, column=1, sticky="e", padx=(0, 10))
         
         self.upload_btn = ctk.CTkButton(
             bottom,
@@ -943,7 +984,14 @@ class UploadPanel(ctk.CTkFrame):
             hover_color=COLORS["accent_hover"],
             command=self._upload
         )
-        self.upload_btn.grid(row=0, column=1, sticky="e")
+        self.upload_btn.grid(row=0, column=2, sticky="e")
+        
+        # Прогресс по событиям загрузки (файлы/байты)
+        self.progress_bar = ctk.CTkProgressBar(bottom, height=6, mode="determinate",
+                                               progress_color=COLORS["accent"])
+        self.progress_bar.set(0)
+        self.progress_label = ctk.CTkLabel(bottom, text="", font=("Segoe UI", 11),
+                                           text_color=COLORS["text_secondary"])
         
         self._refresh_repos()
         
@@ -982,26 +1030,326 @@ class UploadPanel(ctk.CTkFrame):
         self.upload_btn.configure(state="disabled", text="⏳ Загрузка...")
         self.status_bar.set_status("Загрузка файлов...", "loading")
         self.status_bar.show_progress(True)
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=1, column=0, columnspan=3, sticky="ew", pady=(10, 0))
+        self.progress_label.configure(text="")
+        self.progress_label.grid(row=2, column=0, columnspan=3, sticky="w")
+        
+        tracker = ProgressTracker()
+        errors = []
+        last_draw = [0.0]
+        
+        def on_event(event):
+            # Вызывается из рабочего потока; в UI — не чаще 10 раз в секунду
+            if isinstance(event, ErrorEvent):
+                errors.append(f"{event.path}: {event.message}" if event.path else event.message)
+            if not tracker.update(event):
+                return
+            now = time.monotonic()
+            finished = tracker.total_files and tracker.done_files >= tracker.total_files
+            if not finished and now - last_draw[0] < 0.1:
+                return
+            last_draw[0] = now
+            fraction, text = tracker.fraction, tracker.describe()
+            self.after(0, lambda: self._show_progress(fraction, text))
+        
+        self.gh.events.subscribe(on_event)
+        
+        upload = {
+            "auto": self.gh.upload_files_auto,
+            "git": self.gh.upload_files_git,
+            "tree": self.gh.upload_files_tree,
+            "contents": self.gh.upload_files,
+        }[UPLOAD_ENGINES[self.engine_option.get()]]
         
         def worker():
             try:
-                if self.use_git_var.get():
-                    ok = self.gh.upload_files_git(repo_name=repo, files=self.selected_paths, 
-                                                   branch=branch, commit_message=msg, repo_path_base=base)
-                else:
-                    ok = self.gh.upload_files(repo_name=repo, files=self.selected_paths,
-                                               branch=branch, commit_message=msg, repo_path_base=base)
-                if ok:
+                ok = upload(repo_name=repo, files=self.selected_paths, branch=branch,
+                            commit_message=msg, repo_path_base=base)
+                if ok and errors:
+                    summary = "\n".join(errors[:10]) + (f"\n... и ещё {len(errors) - 10}" if len(errors) > 10 else "")
+                    self.after(0, lambda: self.status_bar.set_status(f"Загрузка завершена с ошибками: {len(errors)}", "error"))
+                    self.after(0, lambda: messagebox.showwarning("Готово с ошибками", summary))
+                elif ok:
                     self.after(0, lambda: self.status_bar.set_status("Загрузка завершена!", "success"))
                     self.after(0, lambda: messagebox.showinfo("Готово", "Загрузка завершена успешно!"))
+                else:
+                    detail = errors[-1] if errors else "Загрузка не выполнена"
+                    self.after(0, lambda: self.status_bar.set_status("Ошибка загрузки", "error"))
+                    self.after(0, lambda: messagebox.showerror("Ошибка", detail))
             except Exception as e:
                 self.after(0, lambda: self.status_bar.set_status(f"Ошибка: {str(e)}", "error"))
                 self.after(0, lambda: messagebox.showerror("Ошибка", str(e)))
             finally:
+                self.gh.events.unsubscribe(on_event)
                 self.after(0, lambda: self.upload_btn.configure(state="normal", text="📤 Загрузить на GitHub"))
                 self.after(0, lambda: self.status_bar.show_progress(False))
                 
         threading.Thread(target=worker, daemon=True).start()
+        
+    def _preview(self):
+        repo = self.repo_option.get().strip()
+        if not repo or repo.startswith("<"):
+            messagebox.showwarning("Внимание", "Выберите репозиторий")
+            return
+        if not self.selected_paths:
+            messagebox.showwarning("Внимание", "Добавьте файлы или папки")
+            return
+        
+        branch = self.branch_entry.get().strip() or "main"
+        base = self.base_path_entry.get().strip()
+        engine = UPLOAD_ENGINES[self.engine_option.get()]
+        
+        self.preview_btn.configure(state="disabled", text="⏳ Анализ...")
+        self.status_bar.set_status("Предпросмотр: хеширование и сравнение с веткой...", "loading")
+        errors = []
+        
+        def on_event(event):
+            if isinstance(event, ErrorEvent):
+                errors.append(f"{event.path}: {event.message}" if event.path else event.message)
+        
+        self.gh.events.subscribe(on_event)
+        
+        def worker():
+            try:
+                estimate = self.gh.preview_upload(repo_name=repo, files=self.selected_paths, branch=branch,
+                                                  repo_path_base=base, engine=engine)
+                if estimate is None:
+                    detail = errors[-1] if errors else "Предпросмотр не выполнен"
+                    self.after(0, lambda: self.status_bar.set_status("Ошибка предпросмотра", "error"))
+                    self.after(0, lambda: messagebox.showerror("Ошибка", detail))
+                    return
+                report = "\n".join(line.strip() for line in estimate.describe())
+                level = "error" if estimate.within_budget is False else "success"
+                self.after(0, lambda: self.status_bar.set_status("Предпросмотр готов", level))
+                self.after(0, lambda: messagebox.showinfo("Предпросмотр загрузки", report))
+            except Exception as e:
+                self.after(0, lambda: self.status_bar.set_status(f"Ошибка: {str(e)}", "error"))
+                self.after(0, lambda: messagebox.showerror("Ошибка", str(e)))
+            finally:
+                self.gh.events.unsubscribe(on_event)
+                self.after(0, lambda: self.preview_btn.configure(state="normal", text="👁 Предпросмотр"))
+        
+        threading.Thread(target=worker, daemon=True).start()
+        
+    def _show_progress(self, fraction: float, text: str):
+        if not self.winfo_exists():
+            return
+        self.progress_bar.set(fraction)
+        self.progress_label.configure(text=text)
+        self.status_bar.set_progress(fraction)
+
+
+class ReleasePanel(ctk.CTkFrame):
+    """Панель загрузки файлов в релиз (ассеты)"""
+    def __init__(self, master, gh: GitHubAutomation, status_bar: StatusBar):
+        super().__init__(master, fg_color="transparent")
+        self.gh = gh
+        self.status_bar = status_bar
+        self.selected_paths = []
+        
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+        
+        ctk.CTkLabel(
+            self,
+            text="📦 Файлы релиза",
+            font=("Segoe UI Emoji", 24, "bold"),
+            text_color=COLORS["text_primary"]
+        ).grid(row=0, column=0, sticky="w", pady=(0, 20))
+        
+        # Настройки
+        settings = ctk.CTkFrame(self, fg_color=COLORS["bg_secondary"], corner_radius=12)
+        settings.grid(row=1, column=0, sticky="ew", pady=(0, 15))
+        settings.grid_columnconfigure((0, 1, 2, 3), weight=1)
+        
+        ctk.CTkLabel(settings, text="Репозиторий", font=("Segoe UI", 12),
+                     text_color=COLORS["text_secondary"]).grid(row=0, column=0, padx=15, pady=(15, 5), sticky="w")
+        repo_frame = ctk.CTkFrame(settings, fg_color="transparent")
+        repo_frame.grid(row=1, column=0, padx=15, pady=(0, 15), sticky="ew")
+        repo_frame.grid_columnconfigure(0, weight=1)
+        self.repo_option = ctk.CTkOptionMenu(
+            repo_frame,
+            values=["Загрузка..."],
+            font=("Segoe UI", 12),
+            height=38,
+            corner_radius=8,
+            fg_color=COLORS["bg_tertiary"],
+            button_color=COLORS["border"],
+            button_hover_color=COLORS["text_secondary"]
+        )
+        self.repo_option.grid(row=0, column=0, sticky="ew")
+        ctk.CTkButton(
+            repo_frame,
+            text="🔄",
+            width=40,
+            height=38,
+            font=("Segoe UI Emoji", 14),
+            fg_color=COLORS["bg_tertiary"],
+            hover_color=COLORS["border"],
+            command=self._refresh_repos
+        ).grid(row=0, column=1, padx=(5, 0))
+        
+        # Тег: релиз с этим тегом используется, а если его нет — создаётся на ветке
+        ctk.CTkLabel(settings, text="Тег", font=("Segoe UI", 12),
+                     text_color=COLORS["text_secondary"]).grid(row=0, column=1, padx=15, pady=(15, 5), sticky="w")
+        self.tag_entry = ctk.CTkEntry(
+            settings, placeholder_text="v1.0.0", height=38, corner_radius=8,
+            fg_color=COLORS["bg_tertiary"], border_color=COLORS["border"]
+        )
+        self.tag_entry.grid(row=1, column=1, padx=15, pady=(0, 15), sticky="ew")
+        
+        ctk.CTkLabel(settings, text="Название релиза", font=("Segoe UI", 12),
+                     text_color=COLORS["text_secondary"]).grid(row=0, column=2, padx=15, pady=(15, 5), sticky="w")
+        self.name_entry = ctk.CTkEntry(
+            settings, placeholder_text="по тегу", height=38, corner_radius=8,
+            fg_color=COLORS["bg_tertiary"], border_color=COLORS["border"]
+        )
+        self.name_entry.grid(row=1, column=2, padx=15, pady=(0, 15), sticky="ew")
+        
+        ctk.CTkLabel(settings, text="Ветка для тега", font=("Segoe UI", 12),
+                     text_color=COLORS["text_secondary"]).grid(row=0, column=3, padx=15, pady=(15, 5), sticky="w")
+        self.target_entry = ctk.CTkEntry(
+            settings, placeholder_text="main", height=38, corner_radius=8,
+            fg_color=COLORS["bg_tertiary"], border_color=COLORS["border"]
+        )
+        self.target_entry.insert(0, "main")
+        self.target_entry.grid(row=1, column=3, padx=15, pady=(0, 15), sticky="ew")
+        
+        self.file_zone = FileDropZone(self, on_files_added=self._on_files_changed)
+        self.file_zone.grid(row=2, column=0, sticky="nsew", pady=(0, 15))
+        
+        bottom = ctk.CTkFrame(self, fg_color="transparent")
+        bottom.grid(row=3, column=0, sticky="ew")
+        bottom.grid_columnconfigure(0, weight=1)
+        
+        self.overwrite_var = tk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            bottom,
+            text="♻️ Заменять файлы с другим содержимым",
+            variable=self.overwrite_var,
+            font=("Segoe UI Emoji", 13),
+            checkbox_height=22,
+            checkbox_width=22,
+            corner_radius=4,
+            fg_color=COLORS["accent"],
+            hover_color=COLORS["accent_hover"]
+        ).grid(row=0, column=0, sticky="w")
+        
+        self.upload_btn = ctk.CTkButton(
+            bottom,
+            text="📦 Загрузить в релиз",
+            height=48,
+            width=220,
+            font=("Segoe UI Emoji", 14, "bold"),
+            corner_radius=8,
+            fg_color=COLORS["accent"],
+            hover_color=COLORS["accent_hover"],
+            command=self._upload
+        )
+        self.upload_btn.grid(row=0, column=1, sticky="e")
+        
+        # Прогресс по байтам: крупные файлы сообщают о ходе отправки (FileProgress)
+        self.progress_bar = ctk.CTkProgressBar(bottom, height=6, mode="determinate",
+                                               progress_color=COLORS["accent"])
+        self.progress_bar.set(0)
+        self.progress_label = ctk.CTkLabel(bottom, text="", font=("Segoe UI", 11),
+                                           text_color=COLORS["text_secondary"])
+        
+        self._refresh_repos()
+        
+    def _on_files_changed(self, paths):
+        self.selected_paths = paths
+        
+    def _refresh_repos(self):
+        def worker():
+            try:
+                repos = self.gh.list_repositories()
+                names = [r.get('name', '') for r in repos if r.get('name')]
+                if not names:
+                    names = ["<нет репозиториев>"]
+                def apply():
+                    if self.winfo_exists():
+                        self.repo_option.configure(values=names)
+                        self.repo_option.set(names[0])
+                self.after(0, apply)
+            except Exception:
+                pass
+        threading.Thread(target=worker, daemon=True).start()
+        
+    def _upload(self):
+        repo = self.repo_option.get().strip()
+        tag = self.tag_entry.get().strip()
+        if not repo or repo.startswith("<"):
+            messagebox.showwarning("Внимание", "Выберите репозиторий")
+            return
+        if not tag:
+            messagebox.showwarning("Внимание", "Введите тег релиза")
+            return
+        if not self.selected_paths:
+            messagebox.showwarning("Внимание", "Добавьте файлы")
+            return
+        
+        name = self.name_entry.get().strip() or None
+        target = self.target_entry.get().strip() or "main"
+        overwrite = self.overwrite_var.get()
+        
+        self.upload_btn.configure(state="disabled", text="⏳ Загрузка...")
+        self.status_bar.set_status(f"Загрузка файлов в релиз {tag}...", "loading")
+        self.status_bar.show_progress(True)
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(10, 0))
+        self.progress_label.configure(text="")
+        self.progress_label.grid(row=2, column=0, columnspan=2, sticky="w")
+        
+        tracker = ProgressTracker()
+        errors = []
+        last_draw = [0.0]
+        
+        def on_event(event):
+            if isinstance(event, ErrorEvent):
+                errors.append(f"{event.path}: {event.message}" if event.path else event.message)
+            if not tracker.update(event):
+                return
+            now = time.monotonic()
+            finished = tracker.total_files and tracker.done_files >= tracker.total_files
+            if not finished and now - last_draw[0] < 0.1:
+                return
+            last_draw[0] = now
+            fraction, text = tracker.fraction, tracker.describe()
+            self.after(0, lambda: self._show_progress(fraction, text))
+        
+        self.gh.events.subscribe(on_event)
+        
+        def worker():
+            try:
+                ok = self.gh.upload_release_assets(repo_name=repo, files=self.selected_paths, tag=tag,
+                                                   release_name=name, target=target, overwrite=overwrite)
+                if ok:
+                    self.after(0, lambda: self.status_bar.set_status("Файлы релиза загружены!", "success"))
+                    self.after(0, lambda: messagebox.showinfo("Готово", f"Файлы загружены в релиз {tag}"))
+                else:
+                    summary = "\n".join(errors[:10]) or "Загрузка не выполнена"
+                    if len(errors) > 10:
+                        summary += f"\n... и ещё {len(errors) - 10}"
+                    self.after(0, lambda: self.status_bar.set_status("Ошибка загрузки в релиз", "error"))
+                    self.after(0, lambda: messagebox.showerror("Ошибка", summary))
+            except Exception as e:
+                self.after(0, lambda: self.status_bar.set_status(f"Ошибка: {str(e)}", "error"))
+                self.after(0, lambda: messagebox.showerror("Ошибка", str(e)))
+            finally:
+                self.gh.events.unsubscribe(on_event)
+                self.after(0, lambda: self.upload_btn.configure(state="normal", text="📦 Загрузить в релиз"))
+                self.after(0, lambda: self.status_bar.show_progress(False))
+        
+        threading.Thread(target=worker, daemon=True).start()
+        
+    def _show_progress(self, fraction: float, text: str):
+        if not self.winfo_exists():
+            return
+        self.progress_bar.set(fraction)
+        self.progress_label.configure(text=text)
+        self.status_bar.set_progress(fraction)
 
 
 class ReposPanel(ctk.CTkFrame):
@@ -1202,6 +1550,40 @@ class CreateRepoPanel(ctk.CTkFrame):
             hover_color=COLORS["accent_hover"]
         ).pack(side="left")
         
+        # Создание сразу с содержимым: локальный init + один push, без клонирования
+        self.source_dir = ""
+        self.bootstrap_var = tk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            options,
+            text="📤 Сразу загрузить папку",
+            variable=self.bootstrap_var,
+            font=("Segoe UI Emoji", 13),
+            checkbox_height=22,
+            checkbox_width=22,
+            corner_radius=4,
+            fg_color=COLORS["accent"],
+            hover_color=COLORS["accent_hover"]
+        ).pack(side="left", padx=(20, 0))
+        
+        ctk.CTkButton(
+            options,
+            text="📁",
+            width=40,
+            height=32,
+            font=("Segoe UI Emoji", 14),
+            fg_color=COLORS["bg_tertiary"],
+            hover_color=COLORS["border"],
+            command=self._choose_source
+        ).pack(side="left", padx=(10, 0))
+        
+        self.source_label = ctk.CTkLabel(
+            options,
+            text="папка не выбрана",
+            font=("Segoe UI", 11),
+            text_color=COLORS["text_secondary"]
+        )
+        self.source_label.pack(side="left", padx=(8, 0))
+        
         self.create_btn = ctk.CTkButton(
             options,
             text="➕ Создать",
@@ -1215,6 +1597,13 @@ class CreateRepoPanel(ctk.CTkFrame):
         )
         self.create_btn.pack(side="right")
         
+    def _choose_source(self):
+        path = filedialog.askdirectory(title="Папка с файлами для загрузки")
+        if path:
+            self.source_dir = path
+            self.source_label.configure(text=os.path.basename(os.path.normpath(path)) or path)
+            self.bootstrap_var.set(True)
+        
     def _create(self):
         name = self.name_entry.get().strip()
         if not name:
@@ -1223,13 +1612,23 @@ class CreateRepoPanel(ctk.CTkFrame):
             
         desc = self.desc_entry.get().strip()
         private = self.private_var.get()
+        bootstrap = self.bootstrap_var.get()
+        source = self.source_dir
+        if bootstrap and not source:
+            messagebox.showwarning("Внимание", "Выберите папку для загрузки")
+            return
         
         self.create_btn.configure(state="disabled", text="⏳ Создание...")
         self.status_bar.set_status("Создание репозитория...", "loading")
         
         def worker():
             try:
-                repo = self.gh.create_repository(repo_name=name, description=desc, private=private)
+                if bootstrap:
+                    # Содержимое папки кладём в корень репозитория
+                    repo = self.gh.create_and_upload(repo_name=name, files=[source], description=desc,
+                                                     private=private, contents=True)
+                else:
+                    repo = self.gh.create_repository(repo_name=name, description=desc, private=private)
                 if repo:
                     url = repo.get('html_url', '')
                     self.after(0, lambda: self.status_bar.set_status("Репозиторий создан!", "success"))
@@ -1934,6 +2333,7 @@ class MainApp(ctk.CTk):
         # Навигационные кнопки
         nav_items = [
             ("upload", ICONS["upload"], "Загрузка", UploadPanel),
+            ("release", ICONS["release"], "Релиз", ReleasePanel),
             ("repos", ICONS["repos"], "Репозитории", ReposPanel),
             ("create", ICONS["create"], "Создать репозиторий", CreateRepoPanel),
             ("branch", ICONS["branch"], "Ветки", BranchesPanel),
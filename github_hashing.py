@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Локальное вычисление SHA-1 blob git
+
+hashlib отпускает GIL на больших буферах, поэтому файлы хешируются
+параллельно — потоками хеширования конвейера загрузки (github_pipeline).
+Крупные файлы отображаются через mmap и подаются в hashlib без копирования
+в bytes Python; мелкие читаются целиком. BlobHasher копит статистику
+(файлы, байты, MB/s) по всем потокам.
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+import time
+from typing import Optional
+
+# С какого размера файл хешируется через mmap
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def blob_header(size: int) -> bytes:
+    return b"blob %d\0" % size
+
+
+def hash_data(data: bytes) -> str:
+    """SHA-1 содержимого как объекта blob git (совпадает с sha в ответах API)"""
+    digest = hashlib.sha1(blob_header(len(data)))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def hash_file(path: str, size: Optional[int] = None) -> str:
+    """SHA-1 файла как объекта blob git (hex)"""
+    if size is None:
+        size = os.path.getsize(path)
+    digest = hashlib.sha1(blob_header(size))
+    with open(path, "rb") as f:
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if len(view) != size:
+                    # Файл изменился после stat — хешируем то, что есть сейчас
+                    digest = hashlib.sha1(blob_header(len(view)))
+                digest.update(view)
+        else:
+            data = f.read()
+            if len(data) != size:
+                digest = hashlib.sha1(blob_header(len(data)))
+            digest.update(data)
+    return digest.hexdigest()
+
+
+class HashStats:
+    """Счётчики хеширования (потокобезопасные)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.files = 0
+        self.bytes = 0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def add(self, size: int, started: float):
+        now = time.monotonic()
+        with self._lock:
+            self.files += 1
+            self.bytes += size
+            if self.started is None or started < self.started:
+                self.started = started
+            self.finished = now
+
+    @property
+    def seconds(self) -> float:
+        if self.started is None:
+            return 0.0
+        return max(self.finished - self.started, 1e-9)
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / 1024 / 1024 / self.seconds if self.files else 0.0
+
+    def describe(self) -> str:
+        return f"{self.files} файлов · {self.bytes / 1024 / 1024:.1f} MB · {self.mb_per_s:.1f} MB/s"
+
+
+class BlobHasher:
+    """
+    Хеширование файлов из нескольких потоков с общей статистикой
+
+    Args:
+        workers: Сколько потоков хешируют одновременно (по умолчанию — по числу ядер, не больше 16)
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or min(16, os.cpu_count() or 4)
+        self.stats = HashStats()
+
+    def hash_file(self, path: str, size: Optional[int] = None) -> str:
+        """Хеш одного файла с учётом в статистике (вызывается из любого потока)"""
+        started = time.monotonic()
+        if size is None:
+            size = os.path.getsize(path)
+        sha = hash_file(path, size)
+        self.stats.add(size, started)
+        return sha
+
+    def hash_data(self, data: bytes) -> str:
+        """Хеш содержимого в памяти (запись архива) с учётом в статистике"""
+        started = time.monotonic()
+        sha = hash_data(data)
+        self.stats.add(len(data), started)
+        return sha
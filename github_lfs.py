@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Загрузка крупных файлов через Git LFS
+
+Файлы, попавшие под правила LfsRules (шаблоны в духе .gitattributes и/или
+порог размера), в дереве заменяются указателями LFS (pointer file, ~130 байт),
+а содержимое уходит в хранилище LFS через batch API:
+
+    POST {lfs}/objects/batch   → для каждого объекта: действие upload (+verify)
+                                 или ничего, если объект уже в хранилище
+    PUT  href (upload)         → содержимое потоком, без чтения в память
+    POST href (verify)         → подтверждение загрузки
+
+Передачи идут параллельно; сбойная передача повторяется с новым batch-запросом
+(свежий href, и объект, который успел загрузиться, больше не передаётся),
+поэтому повторный запуск после обрыва докачивает только недостающие объекты.
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from github_walker import IgnoreRules
+
+LFS_SPEC = "https://git-lfs.github.com/spec/v1"
+LFS_MEDIA_TYPE = "application/vnd.git-lfs+json"
+# Объектов в одном batch-запросе (предел GitHub)
+BATCH_OBJECTS = 100
+# Предел размера объекта LFS на GitHub (тарифы Free/Pro)
+LFS_FILE_LIMIT = 2 * 1024 * 1024 * 1024
+# Размер указателя с запасом (для бюджета памяти и оценок)
+POINTER_SIZE = 134
+_CHUNK = 1024 * 1024
+
+
+def lfs_oid(path: str) -> Tuple[str, int]:
+    """SHA-256 содержимого файла (oid объекта LFS) и его размер"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= _CHUNK:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                digest.update(view)
+        else:
+            digest.update(f.read())
+    return digest.hexdigest(), size
+
+
+def data_oid(data: bytes) -> Tuple[str, int]:
+    """oid и размер содержимого в памяти"""
+    return hashlib.sha256(data).hexdigest(), len(data)
+
+
+def pointer_bytes(oid: str, size: int) -> bytes:
+    """Содержимое указателя LFS, которое попадает в дерево git"""
+    return f"version {LFS_SPEC}\noid sha256:{oid}\nsize {size}\n".encode("ascii")
+
+
+class LfsRules:
+    """
+    Какие файлы хранятся в LFS
+
+    Args:
+        patterns: Шаблоны путей в репозитории ('*.psd', 'assets/video/**')
+        min_size: Файлы от этого размера (байт) — в LFS; None — без порога
+    """
+
+    def __init__(self, patterns: Iterable[str] = (), min_size: Optional[int] = None):
+        self.patterns = list(patterns)
+        self.min_size = min_size
+        self._rules = IgnoreRules(tuple(IgnoreRules.parse(self.patterns)))
+
+    def __bool__(self):
+        return bool(self.patterns) or self.min_size is not None
+
+    def by_pattern(self, repo_path: str) -> bool:
+        return bool(self._rules) and self._rules.ignored(repo_path, False)
+
+    def matches(self, repo_path: str, size: int) -> bool:
+        return (self.min_size is not None and size >= self.min_size) or self.by_pattern(repo_path)
+
+    def merge_gitattributes(self, existing: str, paths: Iterable[str]) -> Optional[str]:
+        """
+        .gitattributes с правилами filter=lfs для шаблонов и путей
+
+        Файлы, попавшие в LFS только по размеру, перечисляются поимённо.
+        Возвращает новый текст или None, если добавлять нечего.
+        """
+        lines = existing.splitlines()
+        present = {line.split()[0] for line in lines if line.strip() and not line.startswith("#")}
+        wanted = list(self.patterns) + ["/" + _escape(p) for p in sorted(paths) if not self.by_pattern(p)]
+        added = [f"{p} filter=lfs diff=lfs merge=lfs -text" for p in dict.fromkeys(wanted) if p not in present]
+        if not added:
+            return None
+        return "\n".join(lines + added) + "\n"
+
+
+def _escape(path: str) -> str:
+    # В .gitattributes пробел разделяет шаблон и атрибуты
+    return path.replace(" ", "[[:space:]]")
+
+
+@dataclass
+class LfsObject:
+    """Объект для загрузки: oid, размер и файл с содержимым (или содержимое в памяти)"""
+    oid: str
+    size: int
+    local_path: str
+    repo_path: str = ""
+    data: Optional[bytes] = None
+
+
+@dataclass
+class LfsResult:
+    """Итог загрузки объектов"""
+    uploaded: List[LfsObject] = field(default_factory=list)
+    present: List[LfsObject] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)  # repo_path → причина
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    @property
+    def uploaded_bytes(self) -> int:
+        return sum(o.size for o in self.uploaded)
+
+
+class LfsClient:
+    """
+    Клиент batch API Git LFS (базовый адаптер передачи)
+
+    Args:
+        endpoint: Адрес LFS репозитория (…/{owner}/{repo}.git/info/lfs)
+        request: Функция запроса (method, url, **kwargs) → Response;
+            у GitHubAutomation — _request, чтобы вызовы попадали в метрики
+        auth_headers: Заголовки авторизации для batch-запроса
+        workers: Параллельных передач
+        max_retries: Повторов сбойной передачи
+        retry_backoff: Базовая задержка между повторами (секунды)
+    """
+
+    def __init__(self, endpoint: str, request: Callable, auth_headers: Optional[Dict[str, str]] = None,
+                 workers: int = 4, max_retries: int = 3, retry_backoff: float = 0.5):
+        self.endpoint = endpoint.rstrip("/")
+        self.request = request
+        self.auth_headers = dict(auth_headers or {})
+        self.workers = max(workers, 1)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    def upload(self, objects: List[LfsObject]) -> LfsResult:
+        """Загрузить объекты, которых ещё нет в хранилище (параллельно)"""
+        result = LfsResult()
+        unique = list({o.oid: o for o in objects}.values())
+        sent = {id(o) for o in unique}
+        for start in range(0, len(unique), BATCH_OBJECTS):
+            chunk = unique[start:start + BATCH_OBJECTS]
+            try:
+                actions = self._batch(chunk)
+            except LfsError as e:
+                for o in chunk:
+                    result.failed[o.repo_path or o.oid] = str(e)
+                continue
+            todo = []
+            for o in chunk:
+                action = actions.get(o.oid)
+                if isinstance(action, str):
+                    result.failed[o.repo_path or o.oid] = action
+                elif action:
+                    todo.append((o, action))
+                else:
+                    result.present.append(o)
+            if len(todo) == 1:
+                outcomes = [self._transfer(*todo[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="lfs") as pool:
+                    outcomes = list(pool.map(lambda item: self._transfer(*item), todo))
+            for (o, _action), error in zip(todo, outcomes):
+                if error:
+                    result.failed[o.repo_path or o.oid] = error
+                else:
+                    result.uploaded.append(o)
+        # Объекты с одинаковым содержимым загружены вместе с первым
+        done = {o.oid for o in result.uploaded} | {o.oid for o in result.present}
+        for o in objects:
+            if id(o) not in sent and o.oid in done:
+                result.present.append(o)
+        return result
+
+    def _batch(self, objects: List[LfsObject]) -> Dict[str, object]:
+        """oid → действия ({'upload': …, 'verify': …}), None (уже есть) или текст ошибки"""
+        headers = {"Accept": LFS_MEDIA_TYPE, "Content-Type": LFS_MEDIA_TYPE, **self.auth_headers}
+        response = self.request("POST", f"{self.endpoint}/objects/batch",
+                                headers=headers, json={
+                                    "operation": "upload", "transfers": ["basic"],
+                                    "objects": [{"oid": o.oid, "size": o.size} for o in objects]})
+        if response.status_code != 200:
+            raise LfsError(f"batch: {response.status_code} {response.text[:200]}")
+        actions: Dict[str, object] = {}
+        for item in response.json().get("objects", []):
+            if item.get("error"):
+                actions[item["oid"]] = f"{item['error'].get('code')}: {item['error'].get('message')}"
+            else:
+                actions[item["oid"]] = item.get("actions") or None
+        return actions
+
+    def _transfer(self, obj: LfsObject, actions: Dict) -> Optional[str]:
+        """Передача одного объекта с повторами; возвращает текст ошибки или None"""
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+                # Ссылка могла истечь, а объект — успеть загрузиться: спрашиваем заново
+                try:
+                    actions = self._batch([obj]).get(obj.oid)
+                except LfsError as e:
+                    error = str(e)
+                    continue
+                if isinstance(actions, str):
+                    return actions
+                if not actions:
+                    return None
+            try:
+                error = self._put(obj, actions)
+            except (OSError, ValueError) as e:
+                error = str(e)
+            if error is None:
+                return None
+        return error
+
+    def _put(self, obj: LfsObject, actions: Dict) -> Optional[str]:
+        upload = actions["upload"]
+        headers = {"Content-Type": "application/octet-stream", "Content-Length": str(obj.size),
+                   **upload.get("header", {})}
+        with (io.BytesIO(obj.data) if obj.data is not None else open(obj.local_path, "rb")) as f:
+            # Содержимое отдаётся потоком из файла
+            response = self.request("PUT", upload["href"], headers=headers, data=f)
+        if response.status_code not in (200, 201):
+            return f"upload: {response.status_code}"
+        verify = actions.get("verify")
+        if verify:
+            headers = {"Accept": LFS_MEDIA_TYPE, "Content-Type": LFS_MEDIA_TYPE, **verify.get("header", {})}
+            response = self.request("POST", verify["href"],
+                                    headers=headers, json={"oid": obj.oid, "size": obj.size})
+            if response.status_code != 200:
+                return f"verify: {response.status_code}"
+        return None
+
+
+class LfsError(Exception):
+    """Ошибка batch API LFS"""
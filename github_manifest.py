@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Декларативный манифест: репозитории, загрузки, ветки, защита и PR одним запуском
+
+Манифест (JSON или YAML — для YAML нужен PyYAML) описывает желаемое
+состояние; build_steps превращает его в граф шагов, run_graph выполняет
+граф: независимые шаги — параллельно, зависимые — по порядку. Внутри
+репозитория порядок такой:
+
+    repo → upload (в ветку) → branch (от ветки) → protect → pr
+
+Загрузка в объявленную ветку ждёт её создания, ветка ждёт загрузок в свою
+исходную ветку, защита и PR — загрузок в свои ветки. Разные репозитории
+друг от друга не зависят. Каждый шаг сначала проверяет, не выполнен ли он
+уже (репозиторий есть, ветка есть, защита совпадает, PR открыт, загрузка
+без изменений), поэтому повторный запуск пропускает выполненное. Если шаг
+не выполнен, зависящие от него шаги не запускаются, остальные идут дальше.
+
+    defaults:                  # значения для всех репозиториев
+      private: true
+      branch: main             # ветка загрузок, защиты и PR по умолчанию
+    repos:
+      - name: service-a
+        description: Сервис A
+        gitignore: Python      # шаблон .gitignore нового репозитория
+        create: true           # false — репозиторий должен уже существовать
+        uploads:
+          - files: [./ci]      # пути — относительно файла манифеста
+            repo_path_base: .github
+            message: Add CI
+            sync: false
+          - files: [./feature]
+            branch: dev
+        branches:
+          - name: dev
+            from: main
+        protect:
+          - branch: main
+            reviews: 1         # 0..6; 0 — без обязательных ревью
+            code_owners: false
+        pull_requests:
+          - title: Feature
+            head: dev
+            base: main
+            body: ""
+"""
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+MANIFEST_KEYS = {"defaults", "repos"}
+REPO_KEYS = {"name", "description", "private", "gitignore", "create", "branch",
+             "uploads", "branches", "protect", "pull_requests"}
+DEFAULT_KEYS = REPO_KEYS - {"name", "uploads", "branches", "protect", "pull_requests"}
+SECTION_KEYS = {
+    "uploads": {"files", "branch", "repo_path_base", "message", "sync"},
+    "branches": {"name", "from"},
+    "protect": {"branch", "reviews", "code_owners"},
+    "pull_requests": {"title", "head", "base", "body"},
+}
+
+
+class ManifestError(Exception):
+    """Манифест не прочитан или описан с ошибкой"""
+
+
+@dataclass
+class Step:
+    """Шаг графа: kind — repo | upload | branch | protect | pr"""
+    id: str
+    kind: str
+    repo: str
+    params: Dict = field(default_factory=dict)
+    deps: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StepResult:
+    """Итог шага: done | satisfied (уже выполнен) | failed | blocked (не выполнена зависимость)"""
+    step: str
+    kind: str
+    repo: str
+    status: str
+    error: str = ""
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("done", "satisfied")
+
+
+@dataclass
+class ManifestReport:
+    """Итог манифеста по шагам; истинен, если выполнены все шаги"""
+    results: List[StepResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+    def __bool__(self):
+        return self.ok
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+    def describe(self) -> str:
+        return (f"шагов {len(self.results)}: выполнено {self.count('done')}, уже выполнено {self.count('satisfied')}, "
+                f"ошибок {self.count('failed')}, пропущено {self.count('blocked')}")
+
+    def table(self) -> List[str]:
+        """Таблица по шагам (строки для вывода)"""
+        labels = {"done": "✅ выполнен", "satisfied": "⏭️ уже выполнен", "failed": "❌ ошибка",
+                  "blocked": "⛔ пропущен"}
+        header = ("шаг", "результат", "время", "ошибка")
+        rows = [(r.step, labels.get(r.status, r.status), f"{r.duration:.1f}s", r.error) for r in self.results]
+        widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+        return ["  " + "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+                for row in [header] + rows]
+
+    def to_dict(self) -> Dict:
+        return {"ok": self.ok, "results": [asdict(r) for r in self.results]}
+
+    def write(self, path: str):
+        """JSON-отчёт в файл"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def load_manifest(path: str) -> List[Step]:
+    """Шаги манифеста из файла .json / .yaml / .yml; ManifestError при ошибке"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if path.lower().endswith((".yaml", ".yml")):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ManifestError("Для манифеста YAML нужен PyYAML: pip install pyyaml")
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+    except ManifestError:
+        raise
+    except Exception as e:
+        raise ManifestError(f"{path}: {e}") from e
+    return build_steps(data, os.path.dirname(os.path.abspath(path)))
+
+
+def _section(entry: Dict, key: str, where: str) -> List[Dict]:
+    items = entry.get(key) or []
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ManifestError(f"{where}: '{key}' — список объектов")
+    for item in items:
+        _check_keys(item, SECTION_KEYS[key], f"{where}.{key}")
+    return items
+
+
+def _check_keys(entry: Dict, allowed, where: str):
+    unknown = sorted(set(entry) - set(allowed))
+    if unknown:
+        raise ManifestError(f"{where}: неизвестные ключи {', '.join(unknown)}")
+
+
+def _required(entry: Dict, key: str, where: str) -> str:
+    value = entry.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise ManifestError(f"{where}: не задан '{key}'")
+    return value.strip()
+
+
+def _count(entry: Dict, key: str, default: int, where: str, maximum: int) -> int:
+    value = entry.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= maximum:
+        raise ManifestError(f"{where}: '{key}' должен быть целым числом от 0 до {maximum}, а не {value!r}")
+    return value
+
+
+def build_steps(data, base_dir: str = "") -> List[Step]:
+    """
+    Граф шагов из разобранного манифеста
+
+    Args:
+        data: Содержимое манифеста (dict)
+        base_dir: Каталог, от которого считаются относительные пути загрузок
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("repos"), list):
+        raise ManifestError("манифест: нужен список 'repos'")
+    _check_keys(data, MANIFEST_KEYS, "манифест")
+    defaults = data.get("defaults") or {}
+    if not isinstance(defaults, dict):
+        raise ManifestError("defaults: ожидается объект")
+    _check_keys(defaults, DEFAULT_KEYS, "defaults")
+
+    steps: List[Step] = []
+    for number, entry in enumerate(data["repos"], 1):
+        if not isinstance(entry, dict):
+            raise ManifestError(f"repos[{number}]: ожидается объект")
+        _check_keys(entry, REPO_KEYS, f"repos[{number}]")
+        entry = {**defaults, **entry}
+        name = _required(entry, "name", f"repos[{number}]")
+        where = f"repos[{number}] ({name})"
+        default_branch = entry.get("branch") or "main"
+        base = []
+        if entry.get("create", True):
+            base = [f"{name}: repo"]
+            steps.append(Step(base[0], "repo", name, {
+                "description": entry.get("description") or "",
+                "private": bool(entry.get("private", True)),
+                "gitignore": entry.get("gitignore"),
+            }))
+
+        branches = {}
+        for item in _section(entry, "branches", where):
+            branch = _required(item, "name", f"{where}.branches")
+            if branch in branches:
+                raise ManifestError(f"{where}: ветка '{branch}' объявлена дважды")
+            branches[branch] = item.get("from") or default_branch
+
+        def branch_step(branch: str) -> List[str]:
+            return [f"{name}: branch {branch}"] if branch in branches else []
+
+        # Загрузки в одну ветку — по порядку манифеста
+        uploads_to: Dict[str, List[str]] = {}
+        for index, item in enumerate(_section(entry, "uploads", where), 1):
+            files = item.get("files")
+            files = [files] if isinstance(files, str) else files
+            if not files or not all(isinstance(f, str) for f in files):
+                raise ManifestError(f"{where}.uploads[{index}]: не заданы 'files'")
+            branch = item.get("branch") or default_branch
+            step_id = f"{name}: upload {index} → {branch}"
+            steps.append(Step(step_id, "upload", name, {
+                "files": [os.path.join(base_dir, f) for f in files],
+                "branch": branch,
+                "repo_path_base": item.get("repo_path_base") or "",
+                "message": item.get("message") or "Auto upload files",
+                "sync": bool(item.get("sync", False)),
+            }, base + branch_step(branch) + uploads_to.get(branch, [])[-1:]))
+            uploads_to.setdefault(branch, []).append(step_id)
+
+        for branch, source in branches.items():
+            steps.append(Step(f"{name}: branch {branch}", "branch", name, {"name": branch, "from": source},
+                              base + branch_step(source) + uploads_to.get(source, [])))
+
+        protected = set()
+        for item in _section(entry, "protect", where):
+            branch = _required(item, "branch", f"{where}.protect")
+            if branch in protected:
+                raise ManifestError(f"{where}: защита ветки '{branch}' объявлена дважды")
+            protected.add(branch)
+            steps.append(Step(f"{name}: protect {branch}", "protect", name, {
+                "branch": branch,
+                # GitHub допускает от 0 до 6 обязательных одобрений
+                "reviews": _count(item, "reviews", 1, f"{where}.protect", 6),
+                "code_owners": bool(item.get("code_owners", False)),
+            }, base + branch_step(branch) + uploads_to.get(branch, [])))
+
+        for index, item in enumerate(_section(entry, "pull_requests", where), 1):
+            title = _required(item, "title", f"{where}.pull_requests[{index}]")
+            head = _required(item, "head", f"{where}.pull_requests[{index}]")
+            base_branch = item.get("base") or default_branch
+            deps = base + branch_step(head) + branch_step(base_branch) + uploads_to.get(head, []) + \
+                uploads_to.get(base_branch, []) + ([f"{name}: protect {base_branch}"] if base_branch in protected else [])
+            steps.append(Step(f"{name}: pr {head} → {base_branch}", "pr", name, {
+                "title": title, "body": item.get("body") or "", "head": head, "base": base_branch,
+            }, list(dict.fromkeys(deps))))
+
+    _check_graph(steps)
+    return steps
+
+
+def _check_graph(steps: List[Step]):
+    """Уникальные шаги, известные зависимости, без циклов"""
+    by_id: Dict[str, Step] = {}
+    for step in steps:
+        if step.id in by_id:
+            raise ManifestError(f"шаг '{step.id}' описан дважды (репозиторий указан несколько раз?)")
+        by_id[step.id] = step
+    state: Dict[str, int] = {}  # 1 — в обходе, 2 — проверен
+
+    def visit(step_id: str, path: List[str]):
+        if state.get(step_id) == 2:
+            return
+        if state.get(step_id) == 1:
+            raise ManifestError(f"цикл зависимостей: {' → '.join(path + [step_id])}")
+        state[step_id] = 1
+        for dep in by_id[step_id].deps:
+            visit(dep, path + [step_id])
+        state[step_id] = 2
+
+    for step in steps:
+        visit(step.id, [])
+
+
+def run_graph(steps: List[Step], run: Callable[[Step], Tuple[str, str]], workers: int = 4,
+              on_result: Optional[Callable[[StepResult], None]] = None) -> List[StepResult]:
+    """
+    Выполнить граф: шаг запускается, когда выполнены все его зависимости
+
+    Args:
+        steps: Шаги (build_steps)
+        run: Выполнение шага → (done | satisfied | failed, текст ошибки)
+        workers: Шагов одновременно
+        on_result: Колбэк на каждый итог (из потока, вызвавшего run_graph)
+
+    Returns:
+        Итоги в порядке шагов
+    """
+    results: Dict[str, StepResult] = {}
+    waiting = list(steps)
+
+    def timed(step: Step) -> StepResult:
+        started = time.monotonic()
+        try:
+            status, error = run(step)
+        except Exception as e:
+            status, error = "failed", str(e)
+        return StepResult(step.id, step.kind, step.repo, status, error, time.monotonic() - started)
+
+    def finish(result: StepResult):
+        results[result.step] = result
+        if on_result:
+            on_result(result)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="manifest") as pool:
+        running = {}
+        while waiting or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for step in list(waiting):
+                    deps = [results.get(dep) for dep in step.deps]
+                    failed = next((r for r in deps if r is not None and not r.ok), None)
+                    if failed is not None:
+                        waiting.remove(step)
+                        finish(StepResult(step.id, step.kind, step.repo, "blocked",
+                                          f"не выполнен шаг '{failed.step}'"))
+                        progressed = True
+                    elif all(r is not None for r in deps):
+                        waiting.remove(step)
+                        running[pool.submit(timed, step)] = step
+            if not running:
+                break
+            done, _pending = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                finish(future.result())
+    return [results[step.id] for step in steps]
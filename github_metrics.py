@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Инструментирование вызовов GitHub API и git
+
+Каждый HTTP-запрос и каждый запуск git превращается в CallRecord; MetricsRecorder
+собирает их в гистограммы задержек по шаблонам эндпоинтов и выгружает в JSON
+или в текстовый формат Prometheus (node_exporter textfile collector). Этапы
+операций (kind='phase') — не вызовы: они выгружаются отдельно (phases,
+..._phase_duration_seconds) и не входят в счётчики вызовов.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Границы корзин гистограммы задержек (секунды), как у Prometheus-клиентов
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Порядок важен: более конкретные шаблоны раньше общих
+_ENDPOINT_RULES = [
+    (re.compile(r"^/repos/[^/]+/[^/]+/contents/.+$"), "/repos/{owner}/{repo}/contents/{path}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/(blobs|trees|commits)/[^/]+$"), r"/repos/{owner}/{repo}/git/\1/{sha}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/refs?/heads/.+$"), "/repos/{owner}/{repo}/git/refs/heads/{branch}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/branches/.+/protection$"), "/repos/{owner}/{repo}/branches/{branch}/protection"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/compare/.+$"), "/repos/{owner}/{repo}/compare/{base}...{head}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/releases/\d+/assets$"), "/repos/{owner}/{repo}/releases/{id}/assets"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/releases/assets/\d+$"), "/repos/{owner}/{repo}/releases/assets/{id}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/releases/(tags/.+|\d+)$"), "/repos/{owner}/{repo}/releases/{id}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/(.+)$"), r"/repos/{owner}/{repo}/\1"),
+    (re.compile(r"^/repos/[^/]+/[^/]+$"), "/repos/{owner}/{repo}"),
+    # Git LFS: batch API и передачи объектов (адрес хранилища у сервера свой)
+    (re.compile(r"^/[^/]+/[^/]+\.git/info/lfs/(.+)$"), r"/{owner}/{repo}.git/info/lfs/\1"),
+    (re.compile(r"^.*/objects/[0-9a-f]{64}/verify$"), "{lfs}/objects/{oid}/verify"),
+    (re.compile(r"^.*/objects/[0-9a-f]{64}$"), "{lfs}/objects/{oid}"),
+]
+
+
+def endpoint_template(path: str) -> str:
+    """Шаблон эндпоинта без конкретных имён, путей и SHA (для группировки)"""
+    path = path.split("?", 1)[0].rstrip("/") or "/"
+    for pattern, template in _ENDPOINT_RULES:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return path
+
+
+@dataclass
+class CallRecord:
+    """Один вызов: HTTP-запрос (kind='http'), запуск git (kind='git') или этап операции (kind='phase')"""
+    kind: str
+    method: str
+    endpoint: str
+    status: int
+    bytes_out: int = 0
+    bytes_in: int = 0
+    latency: float = 0.0
+    retries: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "total", "max", "statuses", "bytes_out", "bytes_in", "retries")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.statuses: Dict[int, int] = {}
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.retries = 0
+
+    def add(self, record: CallRecord):
+        i = 0
+        while i < len(LATENCY_BUCKETS) and record.latency > LATENCY_BUCKETS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += record.latency
+        self.max = max(self.max, record.latency)
+        self.statuses[record.status] = self.statuses.get(record.status, 0) + 1
+        self.bytes_out += record.bytes_out
+        self.bytes_in += record.bytes_in
+        self.retries += record.retries
+
+    def quantile(self, q: float) -> float:
+        """Оценка квантиля по корзинам (верхняя граница корзины)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        acc = 0
+        for i, n in enumerate(self.buckets):
+            acc += n
+            if acc >= target:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+
+class MetricsRecorder:
+    """Потокобезопасный агрегатор CallRecord в гистограммы по эндпоинтам"""
+
+    def __init__(self, keep_records: bool = False):
+        self.keep_records = keep_records
+        self.records: List[CallRecord] = []
+        self._hist: Dict[Tuple[str, str, str], _Histogram] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def record(self, record: CallRecord):
+        key = (record.kind, record.method, record.endpoint)
+        with self._lock:
+            hist = self._hist.get(key)
+            if hist is None:
+                hist = self._hist[key] = _Histogram()
+            hist.add(record)
+            if self.keep_records:
+                self.records.append(record)
+
+    def reset(self):
+        with self._lock:
+            self._hist.clear()
+            self.records.clear()
+            self.started = time.time()
+
+    def totals(self) -> Dict:
+        """Суммарные показатели по всем вызовам"""
+        with self._lock:
+            hists = list(self._hist.items())
+        totals = {"http_requests": 0, "git_commands": 0, "bytes_out": 0, "bytes_in": 0,
+                  "retries": 0, "errors": 0, "latency_total": 0.0}
+        for (kind, _method, _endpoint), h in hists:
+            if kind == "phase":
+                continue
+            totals["http_requests" if kind == "http" else "git_commands"] += h.count
+            totals["bytes_out"] += h.bytes_out
+            totals["bytes_in"] += h.bytes_in
+            totals["retries"] += h.retries
+            totals["latency_total"] += h.total
+            # HTTP-запрос без ответа (обрыв соединения, таймаут) записан со статусом 0 — тоже ошибка
+            totals["errors"] += sum(n for s, n in h.statuses.items() if (s == 0 or s >= 400 if kind == "http" else s != 0))
+        return totals
+
+    def phases(self) -> Dict[str, float]:
+        """Суммарное время по этапам (kind='phase'), секунды"""
+        with self._lock:
+            return {endpoint: h.total for (kind, _m, endpoint), h in self._hist.items() if kind == "phase"}
+
+    def _split(self) -> Tuple[List, List]:
+        """Гистограммы вызовов и этапов (отсортированные)"""
+        with self._lock:
+            hists = sorted(self._hist.items())
+        return [item for item in hists if item[0][0] != "phase"], [item for item in hists if item[0][0] == "phase"]
+
+    def to_dict(self) -> Dict:
+        calls, phases = self._split()
+
+        def latency(h: _Histogram) -> Dict:
+            return {
+                "count": h.count,
+                "latency_sum": round(h.total, 6),
+                "latency_max": round(h.max, 6),
+                "latency_p50": h.quantile(0.5),
+                "latency_p95": h.quantile(0.95),
+                "buckets": {("+Inf" if i == len(LATENCY_BUCKETS) else str(LATENCY_BUCKETS[i])): n
+                            for i, n in enumerate(h.buckets)},
+            }
+
+        endpoints = []
+        for (kind, method, endpoint), h in calls:
+            endpoints.append({
+                "kind": kind,
+                "method": method,
+                "endpoint": endpoint,
+                **latency(h),
+                "statuses": {str(s): n for s, n in sorted(h.statuses.items())},
+                "bytes_out": h.bytes_out,
+                "bytes_in": h.bytes_in,
+                "retries": h.retries,
+            })
+        return {"started": self.started, "duration": round(time.time() - self.started, 6),
+                "totals": self.totals(), "endpoints": endpoints,
+                "phases": [{"phase": endpoint, **latency(h)} for (_kind, _method, endpoint), h in phases]}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self, prefix: str = "github_automation") -> str:
+        """Текстовый формат экспозиции Prometheus"""
+        def esc(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"')
+
+        def histogram(metric: str, labels: str, h: _Histogram):
+            acc = 0
+            for i, n in enumerate(h.buckets):
+                acc += n
+                le = "+Inf" if i == len(LATENCY_BUCKETS) else repr(LATENCY_BUCKETS[i])
+                lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {acc}')
+            lines.append(f"{metric}_sum{{{labels}}} {h.total:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {h.count}")
+
+        hists, phases = self._split()
+        lines = [
+            f"# HELP {prefix}_call_duration_seconds Latency of GitHub API calls and git commands",
+            f"# TYPE {prefix}_call_duration_seconds histogram",
+        ]
+        for (kind, method, endpoint), h in hists:
+            histogram(f"{prefix}_call_duration_seconds",
+                      f'kind="{kind}",method="{esc(method)}",endpoint="{esc(endpoint)}"', h)
+        for name, attr, help_text in (
+            ("bytes_sent_total", "bytes_out", "Request body bytes sent"),
+            ("bytes_received_total", "bytes_in", "Response body bytes received"),
+            ("retries_total", "retries", "Retried calls"),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for (kind, method, endpoint), h in hists:
+                labels = f'kind="{kind}",method="{esc(method)}",endpoint="{esc(endpoint)}"'
+                lines.append(f"{prefix}_{name}{{{labels}}} {getattr(h, attr)}")
+        lines.append(f"# HELP {prefix}_calls_total Calls by status code (git: exit code)")
+        lines.append(f"# TYPE {prefix}_calls_total counter")
+        for (kind, method, endpoint), h in hists:
+            for status, n in sorted(h.statuses.items()):
+                labels = f'kind="{kind}",method="{esc(method)}",endpoint="{esc(endpoint)}",status="{status}"'
+                lines.append(f"{prefix}_calls_total{{{labels}}} {n}")
+        if phases:
+            lines.append(f"# HELP {prefix}_phase_duration_seconds Duration of operation phases (clone, add, push, ...)")
+            lines.append(f"# TYPE {prefix}_phase_duration_seconds histogram")
+            for (_kind, _method, phase), h in phases:
+                histogram(f"{prefix}_phase_duration_seconds", f'phase="{esc(phase)}"', h)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Запись в файл: .prom — формат Prometheus, иначе JSON"""
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        # Атомарная замена, чтобы textfile collector не прочитал половину файла
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Локальный мок GitHub API для бенчмарков и проверки без сети
+
+Хранит объекты git в памяти (blobs, trees, commits, refs) и отвечает на те же
+эндпоинты, которые использует GitHubAutomation. Можно задать задержку,
+джиттер и лимит запросов, чтобы воспроизводимо мерить загрузку.
+
+Заодно мок играет роль сервера Git LFS (batch API, передачи basic): адрес
+LFS репозитория — {url}/{owner}/{repo}.git/info/lfs, объекты хранятся
+в MockRepo.lfs. lfs_fail_next заставляет столько следующих передач
+ответить 500 — для проверки повторов и докачки.
+
+Релизы и их ассеты тоже хранятся в памяти; asset_fail_next обрывает столько
+следующих загрузок ассетов, оставляя недозагруженный ассет (state 'starter'),
+как GitHub. Защита веток и Pull Request'ы запоминаются, чтобы повторный
+запуск манифеста мог их проверить.
+
+Пример:
+    with MockGitHubServer(latency=0.02) as server:
+        gh = GitHubAutomation(token="x", username="bench")
+        gh.api_base = server.url
+"""
+
+import base64
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+def git_blob_sha(data: bytes) -> str:
+    """SHA-1 объекта blob в формате git"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class MockRepo:
+    """Репозиторий в памяти: деревья хранятся плоско (path -> (mode, sha))"""
+
+    def __init__(self, name: str, owner: str, private: bool = True, description: str = ""):
+        self.name = name
+        self.owner = owner
+        self.private = private
+        self.description = description
+        self.default_branch = "main"
+        self.blobs: Dict[str, bytes] = {}
+        self.trees: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        self.commits: Dict[str, Dict] = {}
+        self.refs: Dict[str, str] = {}
+        # Хранилище LFS: oid (sha256) -> содержимое
+        self.lfs: Dict[str, bytes] = {}
+        # Релизы: id -> релиз; ассеты релиза — в release["assets"] (id -> ассет с полем data)
+        self.releases: Dict[int, Dict] = {}
+        # Защита веток: ветка -> настройки (тело PUT); Pull Request'ы — по порядку номеров
+        self.protections: Dict[str, Dict] = {}
+        self.pulls: List[Dict] = []
+        self.lock = threading.RLock()
+
+    # --- объекты ---
+
+    def put_blob(self, data: bytes) -> str:
+        sha = git_blob_sha(data)
+        self.blobs[sha] = data
+        return sha
+
+    def put_tree(self, entries: Dict[str, Tuple[str, str]]) -> str:
+        payload = json.dumps(sorted(entries.items()), separators=(",", ":")).encode()
+        sha = hashlib.sha1(b"tree " + payload).hexdigest()
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def put_commit(self, tree: str, parents: List[str], message: str) -> str:
+        payload = json.dumps([tree, parents, message, time.time_ns()]).encode()
+        sha = hashlib.sha1(b"commit " + payload).hexdigest()
+        self.commits[sha] = {"tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def branch_tree(self, branch: str) -> Dict[str, Tuple[str, str]]:
+        sha = self.refs.get(branch)
+        if not sha:
+            return {}
+        return self.trees[self.commits[sha]["tree"]]
+
+    def commit_files(self, branch: str, changes: Dict[str, Optional[Tuple[str, str]]], message: str) -> str:
+        """Коммит набора изменений (None — удаление) поверх вершины ветки"""
+        entries = dict(self.branch_tree(branch))
+        for path, entry in changes.items():
+            if entry is None:
+                entries.pop(path, None)
+            else:
+                entries[path] = entry
+        parent = self.refs.get(branch)
+        sha = self.put_commit(self.put_tree(entries), [parent] if parent else [], message)
+        self.refs[branch] = sha
+        return sha
+
+    def info(self, api_base: str) -> Dict:
+        return {
+            "name": self.name,
+            "full_name": f"{self.owner}/{self.name}",
+            "private": self.private,
+            "description": self.description,
+            "html_url": f"{api_base}/{self.owner}/{self.name}",
+            "default_branch": self.default_branch,
+            "size": sum(len(b) for b in self.blobs.values()) // 1024,
+            "stargazers_count": 0,
+            "forks_count": 0,
+        }
+
+
+class MockGitHubServer:
+    """
+    In-process HTTP-сервер, имитирующий GitHub API
+
+    Args:
+        owner: Имя пользователя, от которого работает клиент
+        latency: Базовая задержка ответа (секунды)
+        jitter: Случайная добавка к задержке (секунды, равномерно 0..jitter)
+        rate_limit: Лимит запросов (None — без лимита); при исчерпании отвечает 403
+        seed: Зерно генератора джиттера для воспроизводимости
+    """
+
+    def __init__(self, owner: str = "bench", latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit: Optional[int] = None, seed: int = 0, host: str = "127.0.0.1", port: int = 0):
+        self.owner = owner
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.rate_remaining = rate_limit
+        self.repos: Dict[str, MockRepo] = {}
+        self.request_count = 0
+        self.requests_by_route: Dict[str, int] = {}
+        self.bytes_received = 0
+        self.lfs_fail_next = 0
+        self.asset_fail_next = 0
+        # Рекурсивное дерево длиннее стольких записей обрезается с truncated: true (как у GitHub)
+        self.tree_limit: Optional[int] = None
+        self._next_id = 1
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGitHubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_counters(self):
+        with self._lock:
+            self.request_count = 0
+            self.requests_by_route = {}
+            self.bytes_received = 0
+            self.rate_remaining = self.rate_limit
+
+    # --- подготовка данных ---
+
+    def add_repo(self, name: str, files: Optional[Dict[str, bytes]] = None, private: bool = True,
+                 branch: str = "main") -> MockRepo:
+        repo = MockRepo(name, self.owner, private=private)
+        repo.default_branch = branch
+        self.repos[name] = repo
+        if files is not None:
+            changes = {path: ("100644", repo.put_blob(data)) for path, data in files.items()}
+            repo.commit_files(branch, changes, "Initial commit")
+        return repo
+
+    def add_many_repos(self, count: int, prefix: str = "repo"):
+        for i in range(count):
+            self.add_repo(f"{prefix}-{i:05d}")
+
+    # --- HTTP ---
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                parsed = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                # Ассет релиза — сырое тело любого типа (в том числе .json)
+                is_json = "json" in (self.headers.get("Content-Type") or "") and not parsed.path.endswith("/assets")
+                body = json.loads(raw) if raw and is_json else raw
+                delay = server.latency + (server._rng.random() * server.jitter if server.jitter else 0.0)
+                if delay:
+                    time.sleep(delay)
+                # HEAD — тот же GET, но без тела ответа
+                status, payload, headers = server.dispatch("GET" if method == "HEAD" else method,
+                                                           unquote(parsed.path), query, body, len(raw))
+                data = b"" if payload is None else (payload if isinstance(payload, bytes) else json.dumps(payload).encode())
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                if method != "HEAD":
+                    self.wfile.write(data)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_HEAD(self):
+                self._handle("HEAD")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PUT(self):
+                self._handle("PUT")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+        return Handler
+
+    ROUTES = [
+        ("GET", r"/user", "user"),
+        ("GET", r"/user/repos", "list_repos"),
+        ("POST", r"/user/repos", "create_repo"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)", "get_repo"),
+        ("PATCH", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)", "update_repo"),
+        ("DELETE", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)", "delete_repo"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/contents/(?P<path>.+)", "get_contents"),
+        ("PUT", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/contents/(?P<path>.+)", "put_contents"),
+        ("POST", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/blobs", "create_blob"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/blobs/(?P<sha>\w+)", "get_blob"),
+        ("POST", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/trees", "create_tree"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/trees/(?P<sha>[^/]+)", "get_tree"),
+        ("POST", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/commits", "create_commit"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/commits/(?P<sha>\w+)", "get_commit"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/ref/heads/(?P<branch>.+)", "get_ref"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/refs/heads/(?P<branch>.+)", "get_ref"),
+        ("PATCH", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/refs/heads/(?P<branch>.+)", "update_ref"),
+        ("POST", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/git/refs", "create_ref"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/compare/(?P<base>\w+)\.\.\.(?P<head>\w+)", "compare"),
+        ("PUT", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/branches/(?P<branch>.+)/protection", "protect"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/branches/(?P<branch>.+)/protection", "get_protection"),
+        ("POST", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/pulls", "create_pull"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/pulls", "list_pulls"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/releases/tags/(?P<tag>.+)", "get_release_by_tag"),
+        ("POST", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/releases", "create_release"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/releases/(?P<release_id>\d+)/assets", "list_assets"),
+        ("POST", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/releases/(?P<release_id>\d+)/assets", "upload_asset"),
+        ("DELETE", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/releases/assets/(?P<asset_id>\d+)", "delete_asset"),
+        ("POST", r"/(?P<owner>[^/]+)/(?P<repo>[^/]+)\.git/info/lfs/objects/batch", "lfs_batch"),
+        ("PUT", r"/lfs/(?P<owner>[^/]+)/(?P<repo>[^/]+)/objects/(?P<oid>[0-9a-f]{64})", "lfs_upload"),
+        ("POST", r"/lfs/(?P<owner>[^/]+)/(?P<repo>[^/]+)/objects/(?P<oid>[0-9a-f]{64})/verify", "lfs_verify"),
+        ("GET", r"/lfs/(?P<owner>[^/]+)/(?P<repo>[^/]+)/objects/(?P<oid>[0-9a-f]{64})", "lfs_download"),
+    ]
+
+    def dispatch(self, method: str, path: str, query: Dict, body, body_len: int) -> Tuple[int, object, Dict]:
+        headers = {}
+        with self._lock:
+            self.request_count += 1
+            self.bytes_received += body_len
+            # LFS не расходует лимит запросов API
+            if self.rate_remaining is not None and not (path.startswith("/lfs/") or "/info/lfs/" in path):
+                if self.rate_remaining <= 0:
+                    reset = int(time.time()) + 60
+                    return 403, {"message": "API rate limit exceeded"}, {
+                        "X-RateLimit-Limit": str(self.rate_limit), "X-RateLimit-Remaining": "0",
+                        "X-RateLimit-Reset": str(reset)}
+                self.rate_remaining -= 1
+                headers = {"X-RateLimit-Limit": str(self.rate_limit),
+                           "X-RateLimit-Remaining": str(self.rate_remaining),
+                           "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+        for route_method, pattern, name in self.ROUTES:
+            if route_method != method:
+                continue
+            m = re.fullmatch(pattern, path)
+            if not m:
+                continue
+            with self._lock:
+                self.requests_by_route[name] = self.requests_by_route.get(name, 0) + 1
+            params = m.groupdict()
+            repo = None
+            if "repo" in params:
+                repo = self.repos.get(params.pop("repo"))
+                params.pop("owner", None)
+                if repo is None:
+                    return 404, {"message": "Not Found"}, headers
+            handler = getattr(self, f"_h_{name}")
+            try:
+                if repo is not None:
+                    with repo.lock:
+                        status, payload, extra = handler(repo, query, body, **params)
+                else:
+                    status, payload, extra = handler(query, body, **params)
+            except (KeyError, ValueError, TypeError) as e:
+                return 422, {"message": f"Validation Failed: {e}"}, headers
+            headers.update(extra)
+            return status, payload, headers
+        return 404, {"message": "Not Found"}, headers
+
+    # --- обработчики ---
+
+    def _h_user(self, query, body):
+        return 200, {"login": self.owner}, {}
+
+    def _h_list_repos(self, query, body):
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = int(query.get("page", 1))
+        names = sorted(self.repos)
+        chunk = names[(page - 1) * per_page: page * per_page]
+        extra = {}
+        if page * per_page < len(names):
+            extra["Link"] = f'<{self.url}/user/repos?per_page={per_page}&page={page + 1}>; rel="next"'
+        return 200, [self.repos[n].info(self.url) for n in chunk], extra
+
+    def _h_create_repo(self, query, body):
+        name = body["name"]
+        if name in self.repos:
+            return 422, {"message": "name already exists on this account"}, {}
+        repo = self.add_repo(name, private=body.get("private", True))
+        repo.description = body.get("description", "")
+        if body.get("auto_init"):
+            repo.commit_files("main", {"README.md": ("100644", repo.put_blob(f"# {name}\n".encode()))}, "Initial commit")
+        return 201, repo.info(self.url), {}
+
+    def _h_get_repo(self, repo, query, body):
+        return 200, repo.info(self.url), {}
+
+    def _h_update_repo(self, repo, query, body):
+        if "private" in body:
+            repo.private = body["private"]
+        if "description" in body:
+            repo.description = body["description"]
+        return 200, repo.info(self.url), {}
+
+    def _h_delete_repo(self, repo, query, body):
+        self.repos.pop(repo.name, None)
+        return 204, None, {}
+
+    def _h_get_contents(self, repo, query, body, path):
+        ref = query.get("ref") or repo.default_branch
+        # ref — ветка или SHA коммита
+        tree = repo.trees[repo.commits[ref]["tree"]] if ref in repo.commits else repo.branch_tree(ref)
+        entry = tree.get(path)
+        if not entry:
+            return 404, {"message": "Not Found"}, {}
+        data = repo.blobs[entry[1]]
+        return 200, {"path": path, "sha": entry[1], "size": len(data),
+                     "content": base64.b64encode(data).decode()}, {}
+
+    def _h_put_contents(self, repo, query, body, path):
+        branch = body.get("branch") or repo.default_branch
+        current = repo.branch_tree(branch).get(path)
+        if current and body.get("sha") != current[1]:
+            return 409, {"message": f"{path} does not match {body.get('sha')}"}, {}
+        if not current and body.get("sha"):
+            return 409, {"message": f"{path} does not exist"}, {}
+        sha = repo.put_blob(base64.b64decode(body["content"]))
+        commit = repo.commit_files(branch, {path: ("100644", sha)}, body.get("message", ""))
+        return (200 if current else 201), {"content": {"path": path, "sha": sha}, "commit": {"sha": commit}}, {}
+
+    def _h_create_blob(self, repo, query, body):
+        content = body["content"]
+        data = base64.b64decode(content) if body.get("encoding") == "base64" else content.encode()
+        sha = repo.put_blob(data)
+        return 201, {"sha": sha, "url": f"{self.url}/repos/{repo.owner}/{repo.name}/git/blobs/{sha}"}, {}
+
+    def _h_get_blob(self, repo, query, body, sha):
+        if sha not in repo.blobs:
+            return 404, {"message": "Not Found"}, {}
+        data = repo.blobs[sha]
+        return 200, {"sha": sha, "size": len(data), "encoding": "base64",
+                     "content": base64.b64encode(data).decode()}, {}
+
+    def _h_create_tree(self, repo, query, body):
+        entries = dict(repo.trees[body["base_tree"]]) if body.get("base_tree") else {}
+        for e in body["tree"]:
+            if e.get("sha") is None and "content" not in e:
+                entries.pop(e["path"], None)
+                continue
+            sha = e["sha"] if e.get("sha") else repo.put_blob(e["content"].encode())
+            if sha not in repo.blobs:
+                return 422, {"message": f"tree.sha {sha} is not a valid blob"}, {}
+            entries[e["path"]] = (e.get("mode", "100644"), sha)
+        sha = repo.put_tree(entries)
+        return 201, {"sha": sha}, {}
+
+    def _h_get_tree(self, repo, query, body, sha):
+        if sha in repo.refs:
+            sha = repo.commits[repo.refs[sha]]["tree"]
+        elif sha in repo.commits:
+            sha = repo.commits[sha]["tree"]
+        if sha not in repo.trees:
+            return 404, {"message": "Not Found"}, {}
+        entries = repo.trees[sha]
+        items, dirs = [], set()
+        for path, (mode, blob_sha) in sorted(entries.items()):
+            parts = path.split("/")
+            for i in range(1, len(parts)):
+                dirs.add("/".join(parts[:i]))
+            items.append({"path": path, "mode": mode, "type": "blob", "sha": blob_sha,
+                          "size": len(repo.blobs.get(blob_sha, b""))})
+        truncated = False
+        if query.get("recursive"):
+            items += [{"path": d, "mode": "040000", "type": "tree", "sha": ""} for d in sorted(dirs)]
+            if self.tree_limit is not None and len(items) > self.tree_limit:
+                items, truncated = items[:self.tree_limit], True
+        else:
+            items = [i for i in items if "/" not in i["path"]]
+            items += [{"path": d, "mode": "040000", "type": "tree", "sha": ""} for d in sorted(dirs) if "/" not in d]
+        return 200, {"sha": sha, "tree": items, "truncated": truncated}, {}
+
+    def _h_create_commit(self, repo, query, body):
+        if body["tree"] not in repo.trees:
+            return 422, {"message": "tree not found"}, {}
+        sha = repo.put_commit(body["tree"], list(body.get("parents", [])), body.get("message", ""))
+        return 201, {"sha": sha, "tree": {"sha": body["tree"]}}, {}
+
+    def _h_get_commit(self, repo, query, body, sha):
+        commit = repo.commits.get(sha)
+        if not commit:
+            return 404, {"message": "Not Found"}, {}
+        return 200, {"sha": sha, "tree": {"sha": commit["tree"]},
+                     "parents": [{"sha": p} for p in commit["parents"]], "message": commit["message"]}, {}
+
+    def _h_get_ref(self, repo, query, body, branch):
+        sha = repo.refs.get(branch)
+        if not sha:
+            return 404, {"message": "Not Found"}, {}
+        return 200, {"ref": f"refs/heads/{branch}", "object": {"sha": sha, "type": "commit"}}, {}
+
+    def _is_ancestor(self, repo, ancestor: str, sha: str) -> bool:
+        stack, seen = [sha], set()
+        while stack:
+            cur = stack.pop()
+            if cur == ancestor:
+                return True
+            if cur in seen or cur not in repo.commits:
+                continue
+            seen.add(cur)
+            stack.extend(repo.commits[cur]["parents"])
+        return False
+
+    def _h_update_ref(self, repo, query, body, branch):
+        current = repo.refs.get(branch)
+        if not current:
+            return 422, {"message": "Reference does not exist"}, {}
+        if not body.get("force") and not self._is_ancestor(repo, current, body["sha"]):
+            return 422, {"message": "Update is not a fast forward"}, {}
+        repo.refs[branch] = body["sha"]
+        return 200, {"ref": f"refs/heads/{branch}", "object": {"sha": body["sha"]}}, {}
+
+    def _h_create_ref(self, repo, query, body):
+        branch = body["ref"][len("refs/heads/"):]
+        if branch in repo.refs:
+            return 422, {"message": "Reference already exists"}, {}
+        repo.refs[branch] = body["sha"]
+        return 201, {"ref": body["ref"], "object": {"sha": body["sha"]}}, {}
+
+    def _h_compare(self, repo, query, body, base, head):
+        if base not in repo.commits or head not in repo.commits:
+            return 404, {"message": "Not Found"}, {}
+        old = repo.trees[repo.commits[base]["tree"]]
+        new = repo.trees[repo.commits[head]["tree"]]
+        files = [{"filename": p} for p in sorted(set(old) | set(new)) if old.get(p) != new.get(p)]
+        return 200, {"status": "ahead", "files": files}, {}
+
+    def _h_protect(self, repo, query, body, branch):
+        if branch not in repo.refs:
+            return 404, {"message": "Branch not found"}, {}
+        repo.protections[branch] = body
+        return 200, self._protection_info(repo, branch), {}
+
+    def _h_get_protection(self, repo, query, body, branch):
+        if branch not in repo.protections:
+            return 404, {"message": "Branch not protected"}, {}
+        return 200, self._protection_info(repo, branch), {}
+
+    def _protection_info(self, repo, branch) -> Dict:
+        info = {"url": f"{self.url}/repos/{repo.owner}/{repo.name}/branches/{branch}/protection"}
+        reviews = repo.protections[branch].get("required_pull_request_reviews")
+        if reviews:
+            info["required_pull_request_reviews"] = dict(reviews)
+        return info
+
+    def _h_create_pull(self, repo, query, body):
+        if body.get("head") not in repo.refs or body.get("base") not in repo.refs:
+            return 422, {"message": "Validation Failed"}, {}
+        if any(p["head"] == body["head"] and p["base"] == body["base"] and p["state"] == "open" for p in repo.pulls):
+            return 422, {"message": "A pull request already exists"}, {}
+        number = len(repo.pulls) + 1
+        pull = {"number": number, "title": body.get("title", ""), "head": body["head"], "base": body["base"],
+                "state": "open"}
+        repo.pulls.append(pull)
+        return 201, self._pull_info(repo, pull), {}
+
+    def _h_list_pulls(self, repo, query, body):
+        # head в запросе — 'owner:branch'
+        head = query.get("head", "").split(":")[-1]
+        pulls = [p for p in repo.pulls
+                 if p["state"] == query.get("state", "open") and (not head or p["head"] == head)
+                 and p["base"] == query.get("base", p["base"])]
+        return 200, [self._pull_info(repo, p) for p in pulls], {}
+
+    def _pull_info(self, repo, pull) -> Dict:
+        return {"number": pull["number"], "title": pull["title"], "state": pull["state"],
+                "html_url": f"{self.url}/{repo.owner}/{repo.name}/pull/{pull['number']}",
+                "head": {"ref": pull["head"]}, "base": {"ref": pull["base"]}}
+
+    def _new_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def _release_info(self, repo, release) -> Dict:
+        return {**{k: v for k, v in release.items() if k != "assets"},
+                "upload_url": f"{self.url}/repos/{repo.owner}/{repo.name}/releases/{release['id']}/assets{{?name,label}}",
+                "html_url": f"{self.url}/{repo.owner}/{repo.name}/releases/tag/{release['tag_name']}",
+                "assets": [self._asset_info(a) for a in release["assets"].values()]}
+
+    @staticmethod
+    def _asset_info(asset) -> Dict:
+        return {k: v for k, v in asset.items() if k != "data"}
+
+    def _h_get_release_by_tag(self, repo, query, body, tag):
+        release = next((r for r in repo.releases.values() if r["tag_name"] == tag), None)
+        if release is None:
+            return 404, {"message": "Not Found"}, {}
+        return 200, self._release_info(repo, release), {}
+
+    def _h_create_release(self, repo, query, body):
+        tag = body["tag_name"]
+        if any(r["tag_name"] == tag for r in repo.releases.values()):
+            return 422, {"message": "Validation Failed", "errors": [{"code": "already_exists"}]}, {}
+        release = {"id": self._new_id(), "tag_name": tag, "name": body.get("name") or tag,
+                   "body": body.get("body", ""), "target_commitish": body.get("target_commitish", "main"),
+                   "draft": bool(body.get("draft")), "prerelease": bool(body.get("prerelease")), "assets": {}}
+        repo.releases[release["id"]] = release
+        return 201, self._release_info(repo, release), {}
+
+    def _h_list_assets(self, repo, query, body, release_id):
+        release = repo.releases.get(int(release_id))
+        if release is None:
+            return 404, {"message": "Not Found"}, {}
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = int(query.get("page", 1))
+        assets = list(release["assets"].values())
+        extra = {}
+        if page * per_page < len(assets):
+            extra["Link"] = (f'<{self.url}/repos/{repo.owner}/{repo.name}/releases/{release_id}/assets'
+                             f'?per_page={per_page}&page={page + 1}>; rel="next"')
+        return 200, [self._asset_info(a) for a in assets[(page - 1) * per_page: page * per_page]], extra
+
+    def _h_upload_asset(self, repo, query, body, release_id):
+        release = repo.releases.get(int(release_id))
+        if release is None:
+            return 404, {"message": "Not Found"}, {}
+        name = query["name"]
+        if any(a["name"] == name for a in release["assets"].values()):
+            return 422, {"message": "Validation Failed", "errors": [{"code": "already_exists", "field": "name"}]}, {}
+        asset = {"id": self._new_id(), "name": name, "size": len(body), "state": "uploaded",
+                 "content_type": "application/octet-stream", "digest": f"sha256:{hashlib.sha256(body).hexdigest()}",
+                 "browser_download_url": f"{self.url}/{repo.owner}/{repo.name}/releases/download/"
+                                         f"{release['tag_name']}/{name}", "data": body}
+        with self._lock:
+            fail = self.asset_fail_next > 0
+            if fail:
+                self.asset_fail_next -= 1
+        if fail:
+            # Обрыв посреди передачи: ассет остаётся недозагруженным и занимает имя
+            asset.update(state="starter", size=0, digest=None, data=b"")
+            release["assets"][asset["id"]] = asset
+            return 502, {"message": "Bad Gateway"}, {}
+        release["assets"][asset["id"]] = asset
+        return 201, self._asset_info(asset), {}
+
+    def _h_delete_asset(self, repo, query, body, asset_id):
+        for release in repo.releases.values():
+            if release["assets"].pop(int(asset_id), None) is not None:
+                return 204, None, {}
+        return 404, {"message": "Not Found"}, {}
+
+    def _h_lfs_batch(self, repo, query, body):
+        operation = body["operation"]
+        objects = []
+        for obj in body["objects"]:
+            oid, size = obj["oid"], int(obj["size"])
+            href = f"{self.url}/lfs/{repo.owner}/{repo.name}/objects/{oid}"
+            item = {"oid": oid, "size": size, "authenticated": True}
+            if operation == "upload":
+                # Объект уже в хранилище — действий нет, передавать не нужно
+                if oid not in repo.lfs:
+                    item["actions"] = {"upload": {"href": href, "header": {"Authorization": "RemoteAuth mock"}},
+                                       "verify": {"href": f"{href}/verify"}}
+            elif oid in repo.lfs:
+                item["actions"] = {"download": {"href": href}}
+            else:
+                item["error"] = {"code": 404, "message": "Object does not exist"}
+            objects.append(item)
+        return 200, {"transfer": "basic", "objects": objects}, {}
+
+    def _h_lfs_upload(self, repo, query, body, oid):
+        with self._lock:
+            if self.lfs_fail_next:
+                self.lfs_fail_next -= 1
+                return 500, {"message": "Injected failure"}, {}
+        if hashlib.sha256(body).hexdigest() != oid:
+            return 422, {"message": "oid does not match content"}, {}
+        repo.lfs[oid] = body
+        return 200, None, {}
+
+    def _h_lfs_verify(self, repo, query, body, oid):
+        data = repo.lfs.get(oid)
+        if data is None or len(data) != int(body["size"]):
+            return 404, {"message": "Object does not exist"}, {}
+        return 200, {}, {}
+
+    def _h_lfs_download(self, repo, query, body, oid):
+        if oid not in repo.lfs:
+            return 404, {"message": "Not Found"}, {}
+        return 200, repo.lfs[oid], {}
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Локальный мок GitHub API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    args = parser.parse_args()
+    server = MockGitHubServer(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit, port=args.port)
+    print(f"🧪 Мок GitHub API: {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
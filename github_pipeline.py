@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Конвейер загрузки: обход → хеширование → отправка
+
+Стадии работают одновременно и связаны ограниченными очередями, поэтому
+первый файл уходит в сеть, пока обход дерева ещё идёт, а память не растёт
+с размером дерева: обход ждёт, если хешеры не успевают, хешеры ждут, если
+отправка не успевает, а суммарный объём содержимого между обходом и
+отправкой ограничен max_inflight_bytes. Бюджет занимается до постановки
+элемента в очередь, поэтому в него входит и содержимое, которое источник
+держит в памяти (записи архивов).
+"""
+
+import queue
+import threading
+from typing import Callable, Iterable, List
+
+_DONE = object()
+
+
+class PipelineAborted(Exception):
+    """Стадия сообщила об ошибке сама и просит остановить конвейер"""
+
+
+class ByteBudget:
+    """Ограничение объёма данных «в полёте» (между чтением и отправкой)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size: int, cancelled: Callable[[], bool] = lambda: False):
+        with self._cond:
+            # Файл крупнее всего бюджета пропускается, когда в полёте ничего нет
+            while self.used and self.used + size > self.limit and not cancelled():
+                self._cond.wait(0.1)
+            self.used += size
+
+    def release(self, size: int):
+        with self._cond:
+            self.used -= size
+            self._cond.notify_all()
+
+
+class UploadPipeline:
+    """
+    Трёхстадийный конвейер с обратным давлением
+
+    Args:
+        hash_item: Стадия чтения/хеширования: item → результат для отправки
+            (None — отправлять нечего)
+        send_item: Стадия отправки
+        size_of: Объём данных элемента для бюджета памяти
+        hashers: Потоков хеширования
+        senders: Потоков отправки (1 — строго последовательные коммиты)
+        queue_size: Ёмкость каждой очереди между стадиями
+        max_inflight_bytes: Предел содержимого в очередях и стадиях (от обхода до отправки)
+
+    Исключения стадий останавливают конвейер и пробрасываются из run();
+    ошибки отдельных файлов стадии должны обрабатывать сами.
+    """
+
+    def __init__(self, hash_item: Callable, send_item: Callable, size_of: Callable = lambda item: 0,
+                 hashers: int = 4, senders: int = 1, queue_size: int = 256,
+                 max_inflight_bytes: int = 64 * 1024 * 1024):
+        self.hash_item = hash_item
+        self.send_item = send_item
+        self.size_of = size_of
+        self.hashers = max(1, hashers)
+        self.senders = max(1, senders)
+        self.queue_size = queue_size
+        self.budget = ByteBudget(max_inflight_bytes)
+        self._errors: List[BaseException] = []
+        self._stop = threading.Event()
+
+    def run(self, source: Iterable) -> int:
+        """Прогнать все элементы source; возвращает число обработанных элементов"""
+        to_hash: "queue.Queue" = queue.Queue(self.queue_size)
+        to_send: "queue.Queue" = queue.Queue(self.queue_size)
+        counter = [0]
+        counter_lock = threading.Lock()
+
+        hashers = [threading.Thread(target=self._hash_worker, args=(to_hash, to_send), daemon=True,
+                                    name=f"pipeline-hash-{i}") for i in range(self.hashers)]
+        senders = [threading.Thread(target=self._send_worker, args=(to_send, counter, counter_lock), daemon=True,
+                                    name=f"pipeline-send-{i}") for i in range(self.senders)]
+        for t in hashers + senders:
+            t.start()
+
+        try:
+            # Обход идёт в вызывающем потоке: put() блокируется, пока хешеры заняты
+            for item in source:
+                size = self.size_of(item)
+                self.budget.acquire(size, self._stop.is_set)
+                if not self._put(to_hash, (item, size)):
+                    self.budget.release(size)
+                    break
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for _ in hashers:
+                self._put(to_hash, _DONE, force=True)
+            for t in hashers:
+                t.join()
+            for _ in senders:
+                self._put(to_send, _DONE, force=True)
+            for t in senders:
+                t.join()
+
+        if self._errors:
+            raise self._errors[0]
+        return counter[0]
+
+    def _hash_worker(self, to_hash: "queue.Queue", to_send: "queue.Queue"):
+        while True:
+            entry = to_hash.get()
+            if entry is _DONE:
+                return
+            item, size = entry
+            if self._stop.is_set():
+                self.budget.release(size)
+                continue
+            try:
+                result = self.hash_item(item)
+            except BaseException as e:
+                self.budget.release(size)
+                self._fail(e)
+                continue
+            if result is None:
+                self.budget.release(size)
+                continue
+            if not self._put(to_send, (result, size)):
+                self.budget.release(size)
+
+    def _send_worker(self, to_send: "queue.Queue", counter: List[int], counter_lock: threading.Lock):
+        while True:
+            entry = to_send.get()
+            if entry is _DONE:
+                return
+            result, size = entry
+            try:
+                if not self._stop.is_set():
+                    self.send_item(result)
+                    with counter_lock:
+                        counter[0] += 1
+            except BaseException as e:
+                self._fail(e)
+            finally:
+                self.budget.release(size)
+
+    def _put(self, q: "queue.Queue", item, force: bool = False) -> bool:
+        """put с периодической проверкой остановки (False — конвейер остановлен)"""
+        while True:
+            if self._stop.is_set() and not force:
+                return False
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+    def _fail(self, error: BaseException):
+        self._errors.append(error)
+        self._stop.set()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Предварительная проверка источника до любых сетевых запросов
+
+Загрузка по файлу узнаёт о проблемах по одной и посреди работы: файл больше
+лимита GitHub, нечитаемый файл, два источника с одним путём в репозитории,
+файл, пропавший после обхода. PreflightChecker проверяет весь план сразу
+(stat и открытие файлов — пулом потоков) и возвращает полный список проблем;
+что с ними делать, решает политика вызывающего кода:
+
+    abort — при любой ошибке загрузка не начинается
+    skip  — проблемные файлы исключаются, остальные загружаются
+    off   — без проверки (обход идёт прямо в конвейер загрузки)
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Collection, Dict, List, Optional, Set
+
+from github_lfs import LFS_FILE_LIMIT
+
+# GitHub отклоняет файлы больше 100 MB и предупреждает о файлах больше 50 MB
+GITHUB_FILE_LIMIT = 100 * 1024 * 1024
+GITHUB_FILE_WARNING = 50 * 1024 * 1024
+# Файлов плана на одну задачу пула
+CHUNK_FILES = 256
+
+POLICIES = ("abort", "skip", "off")
+
+# Вид проблемы → (ошибка ли, подпись)
+KINDS = {
+    "too_large": (True, "больше лимита GitHub"),
+    "too_large_lfs": (True, "больше лимита Git LFS"),
+    "unreadable": (True, "нет доступа на чтение"),
+    "vanished": (True, "пропал после обхода"),
+    "missing": (True, "путь не найден"),
+    "bad_archive": (True, "архив не читается"),
+    "bad_source": (True, "файл из памяти не принят"),
+    "collision": (True, "совпадает путь в репозитории"),
+    "large": (False, "крупный файл"),
+    "case_collision": (False, "пути различаются только регистром"),
+}
+
+
+@dataclass
+class Problem:
+    """Проблема одного файла плана (index — индекс в плане, -1 для входного пути)"""
+    kind: str
+    path: str
+    detail: str = ""
+    index: int = -1
+
+    @property
+    def is_error(self) -> bool:
+        return KINDS[self.kind][0]
+
+    @property
+    def message(self) -> str:
+        label = KINDS[self.kind][1]
+        return f"{label} ({self.detail})" if self.detail else label
+
+
+@dataclass
+class PreflightReport:
+    """Итог проверки: число файлов, объём и все найденные проблемы"""
+    files: int = 0
+    bytes: int = 0
+    problems: List[Problem] = field(default_factory=list)
+
+    @property
+    def errors(self) -> List[Problem]:
+        return [p for p in self.problems if p.is_error]
+
+    @property
+    def warnings(self) -> List[Problem]:
+        return [p for p in self.problems if not p.is_error]
+
+    @property
+    def rejected(self) -> Set[int]:
+        """Индексы файлов плана, которые нельзя загружать"""
+        return {p.index for p in self.errors if p.index >= 0}
+
+    def summary(self) -> str:
+        counts: Dict[str, int] = {}
+        for p in self.problems:
+            counts[p.kind] = counts.get(p.kind, 0) + 1
+        kinds = ", ".join(f"{KINDS[kind][1]}: {n}" for kind, n in counts.items())
+        return (f"{self.files} файлов, {self.bytes / 1024 / 1024:.1f} MB; "
+                f"ошибок {len(self.errors)}, предупреждений {len(self.warnings)}" + (f" ({kinds})" if kinds else ""))
+
+
+class PreflightChecker:
+    """
+    Проверка плана загрузки (github_plan.UploadPlan)
+
+    Args:
+        workers: Потоков для stat/открытия файлов
+        max_file_bytes: Файлы крупнее — ошибка
+        warn_file_bytes: Файлы крупнее — предупреждение
+        lfs: Правила Git LFS (github_lfs.LfsRules): для файлов LFS вместо
+            лимитов GitHub действует лимит объекта LFS
+    """
+
+    def __init__(self, workers: int = 8, max_file_bytes: int = GITHUB_FILE_LIMIT,
+                 warn_file_bytes: int = GITHUB_FILE_WARNING, lfs=None):
+        self.workers = max(workers, 1)
+        self.max_file_bytes = max_file_bytes
+        self.warn_file_bytes = warn_file_bytes
+        self.lfs = lfs
+
+    def check(self, plan, missing_inputs: Optional[List[str]] = None,
+              archived: Collection[int] = ()) -> PreflightReport:
+        """
+        Проверить все файлы плана; размеры в плане обновляются по свежему stat
+
+        archived — индексы записей архивов (github_archive): их содержимого нет
+        на диске, проверяются размер из заголовка архива и пути.
+        """
+        report = PreflightReport(files=len(plan))
+        for path in missing_inputs or []:
+            report.problems.append(Problem("missing", path))
+        report.problems.extend(self._collisions(plan))
+
+        chunks = [range(start, min(start + CHUNK_FILES, len(plan))) for start in range(0, len(plan), CHUNK_FILES)]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="preflight") as pool:
+            for problems in pool.map(lambda chunk: self._check_files(plan, chunk, archived), chunks):
+                report.problems.extend(problems)
+        report.bytes = plan.total_bytes
+        return report
+
+    def _check_files(self, plan, indices, archived: Collection[int]) -> List[Problem]:
+        problems = []
+        for index in indices:
+            local_path = plan.local_path(index)
+            if index in archived:
+                size = plan.sizes[index]
+            else:
+                try:
+                    # Открытие, а не os.access: проверяет то же, что сделает загрузка
+                    with open(local_path, "rb") as f:
+                        size = os.fstat(f.fileno()).st_size
+                except FileNotFoundError:
+                    problems.append(Problem("vanished", local_path, index=index))
+                    continue
+                except OSError as e:
+                    problems.append(Problem("unreadable", local_path, e.strerror or str(e), index=index))
+                    continue
+                # Каждый индекс — только в одной задаче пула
+                plan.sizes[index] = size
+            if self.lfs and self.lfs.matches(plan.path(index), size):
+                if size > LFS_FILE_LIMIT:
+                    problems.append(Problem("too_large_lfs", local_path, f"{size / 1024 / 1024:.1f} MB",
+                                            index=index))
+            elif size > self.max_file_bytes:
+                problems.append(Problem("too_large", local_path, f"{size / 1024 / 1024:.1f} MB", index=index))
+            elif size > self.warn_file_bytes:
+                problems.append(Problem("large", local_path, f"{size / 1024 / 1024:.1f} MB", index=index))
+        return problems
+
+    def _collisions(self, plan) -> List[Problem]:
+        """Один путь у двух файлов, файл на месте каталога, пути, различающиеся только регистром"""
+        problems = []
+        files: Dict[str, int] = {}
+        folded: Dict[str, str] = {}
+        dirs: Set[str] = set()
+        for index in range(len(plan)):
+            path = plan.path(index)
+            first = files.get(path)
+            if first is not None:
+                problems.append(Problem("collision", plan.local_path(index),
+                                        f"{path} уже занят {plan.local_path(first)}", index=index))
+                continue
+            parts = path.split("/")
+            parents = ["/".join(parts[:i]) for i in range(1, len(parts))]
+            clash = next((p for p in parents if p in files), None)
+            if clash is not None or path in dirs:
+                detail = f"{clash} — файл, а не каталог" if clash is not None else f"{path} — каталог"
+                problems.append(Problem("collision", plan.local_path(index), detail, index=index))
+                continue
+            files[path] = index
+            dirs.update(parents)
+            other = folded.setdefault(path.lower(), path)
+            if other != path:
+                problems.append(Problem("case_collision", plan.local_path(index), f"{path} и {other}",
+                                        index=index))
+        return problems
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Общий регулятор запросов к API GitHub
+
+Все потоки одного GitHubAutomation (конвейер загрузки, LFS, fan-out,
+пакетные операции) отправляют запросы через один RateLimitScheduler:
+
+    - одновременно выполняется не больше max_concurrent запросов;
+    - когда остаток лимита (X-RateLimit-Remaining) опускается до reserve,
+      новые запросы ждут его сброса (X-RateLimit-Reset);
+    - ответ 429 или 403 с Retry-After / исчерпанным лимитом приостанавливает
+      все потоки на указанное время, после чего запрос повторяется.
+
+Пауза длиннее max_wait не выжидается: ответ возвращается вызывающему как есть.
+"""
+
+import contextlib
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+# Пауза по вторичному лимиту без Retry-After (рекомендация GitHub — не меньше минуты)
+SECONDARY_LIMIT_DELAY = 60.0
+
+
+class RateLimitScheduler:
+    """
+    Args:
+        max_concurrent: Запросов одновременно (на все потоки)
+        reserve: Остаток лимита, при котором новые запросы ждут сброса
+        max_wait: Самая долгая пауза, которую имеет смысл выждать (секунды)
+        max_retries: Повторов запроса после паузы по лимиту
+    """
+
+    def __init__(self, max_concurrent: int = 16, reserve: int = 0, max_wait: float = 600.0,
+                 max_retries: int = 3, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.max_concurrent = max(max_concurrent, 1)
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._remaining: Optional[int] = None
+        self._reset = 0.0
+        # До какого момента (clock) запросы приостановлены
+        self._paused_until = 0.0
+        self.waited = 0.0
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """Место для одного запроса: ждёт паузы и свободного слота"""
+        delay = self.delay()
+        if 0 < delay <= self.max_wait:
+            self._wait(delay)
+        with self._slots:
+            yield
+
+    def delay(self) -> float:
+        """Сколько ждать до следующего запроса (0 — можно сразу)"""
+        now = self._clock()
+        with self._lock:
+            until = self._paused_until
+            if self._remaining is not None and self._remaining <= self.reserve and self._reset > now:
+                until = max(until, self._reset)
+        return max(0.0, until - now)
+
+    def observe(self, status: int, headers) -> Optional[float]:
+        """
+        Учесть ответ; для ответа «лимит исчерпан» — пауза перед повтором (секунды),
+        иначе None
+        """
+        now = self._clock()
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        reset = _int_header(headers, "X-RateLimit-Reset")
+        retry_after = _int_header(headers, "Retry-After")
+        with self._lock:
+            if remaining is not None:
+                self._remaining = remaining
+                self._reset = float(reset or 0)
+            limited = status == 429 or (status == 403 and (retry_after is not None or remaining == 0))
+            if not limited:
+                return None
+            if retry_after is not None:
+                delay = float(retry_after)
+            elif remaining == 0 and reset:
+                delay = max(0.0, reset - now) + 1.0
+            else:
+                delay = SECONDARY_LIMIT_DELAY
+            self._paused_until = max(self._paused_until, now + delay)
+            return delay
+
+    def _wait(self, delay: float):
+        with self._lock:
+            self.waited += delay
+        self._sleep(delay)
+
+
+def _int_header(headers, name: str) -> Optional[int]:
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
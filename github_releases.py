@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Загрузка файлов в релиз GitHub (release assets)
+
+Файл отправляется на upload_url релиза сырым телом — без base64 и без чтения
+в память: ProgressReader отдаёт его блоками по мере отправки и сообщает,
+сколько байт ушло. plan_assets сверяет файлы с ассетами, которые уже есть
+в релизе, поэтому повторный запуск после сбоя загружает только недостающее:
+
+    skip     — ассет с тем же именем и размером уже загружен (и совпадает
+               sha256, если сервер его сообщает)
+    upload   — ассета нет
+    replace  — ассет недозагружен (state 'starter', остаётся после обрыва)
+               или отличается, а overwrite разрешён
+    conflict — ассет отличается, overwrite не задан
+"""
+
+import mimetypes
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from github_lfs import lfs_oid
+from github_walker import SourceFile
+
+# Предел размера ассета релиза на GitHub
+RELEASE_ASSET_LIMIT = 2 * 1024 * 1024 * 1024
+# Шаг событий прогресса при отправке одного файла
+PROGRESS_STEP = 1024 * 1024
+
+
+class ProgressReader:
+    """
+    Файл как тело запроса: длина известна заранее (Content-Length), содержимое
+    читается блоками по запросу http.client
+
+    Args:
+        f: Открытый на чтение двоичный файл
+        size: Размер тела
+        on_progress: Колбэк (отправлено байт всего), не чаще чем раз в PROGRESS_STEP
+    """
+
+    def __init__(self, f, size: int, on_progress: Optional[Callable[[int], None]] = None):
+        self._f = f
+        self._size = size
+        self._on_progress = on_progress
+        self._sent = 0
+        self._reported = 0
+
+    def __len__(self):
+        return self._size
+
+    def read(self, n: int = -1) -> bytes:
+        chunk = self._f.read(n)
+        self._sent += len(chunk)
+        if self._on_progress and (self._sent - self._reported >= PROGRESS_STEP or
+                                  (not chunk and self._sent > self._reported)):
+            self._reported = self._sent
+            self._on_progress(self._sent)
+        return chunk
+
+
+@dataclass
+class AssetAction:
+    """Что сделать с файлом: skip | upload | replace | conflict"""
+    name: str
+    action: str
+    source: SourceFile
+    asset: Optional[Dict] = None  # существующий ассет релиза
+    reason: str = ""
+
+
+def content_type(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def asset_matches(source: SourceFile, asset: Dict) -> bool:
+    """Загружен ли ассет полностью и с тем же содержимым, что и файл"""
+    if asset.get("state", "uploaded") != "uploaded" or asset.get("size") != source.size:
+        return False
+    digest = asset.get("digest") or ""
+    if digest.startswith("sha256:"):
+        # Размер совпал — сверяем содержимое, если сервер сообщает хеш
+        return lfs_oid(source.local_path)[0] == digest[len("sha256:"):]
+    return True
+
+
+def plan_assets(sources: Dict[str, SourceFile], remote: Dict[str, Dict], overwrite: bool = False) -> List[AssetAction]:
+    """
+    Действия для файлов релиза
+
+    Args:
+        sources: Имя ассета → файл
+        remote: Имя ассета → ассет релиза (ответ API)
+        overwrite: Заменять отличающиеся ассеты
+    """
+    actions = []
+    for name, source in sources.items():
+        asset = remote.get(name)
+        if asset is None:
+            actions.append(AssetAction(name, "upload", source))
+        elif asset.get("state", "uploaded") != "uploaded":
+            actions.append(AssetAction(name, "replace", source, asset, "недозагружен"))
+        elif asset_matches(source, asset):
+            actions.append(AssetAction(name, "skip", source, asset))
+        elif overwrite:
+            actions.append(AssetAction(name, "replace", source, asset, "отличается"))
+        else:
+            actions.append(AssetAction(name, "conflict", source, asset,
+                                       f"в релизе уже есть другой файл ({asset.get('size', 0)} байт)"))
+    return actions
+
+
+class AssetStats:
+    """Итог загрузки ассетов (обновляется из нескольких потоков)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.uploaded = 0
+        self.uploaded_bytes = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def add(self, counter: str, size: int = 0):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            if counter == "uploaded":
+                self.uploaded_bytes += size
+
+    def describe(self) -> str:
+        return (f"загружено {self.uploaded} ({self.uploaded_bytes / 1024 / 1024:.1f} MB), "
+                f"без изменений {self.skipped}, ошибок {self.failed}")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Исходные файлы из памяти
+
+Конвейеры генерируют файлы (конфиги, отчёты) в памяти; memory_source
+превращает пару (путь в репозитории, содержимое) в исходный файл загрузки
+(github_walker.SourceFile с data), не записывая его на диск. Содержимое:
+
+    bytes / bytearray / memoryview
+    str                    — в UTF-8
+    файловый объект        — всё, что вернёт read()
+    итератор кусков        — bytes или str (например, генератор)
+
+Содержимое читается, когда файл доходит до конвейера загрузки, поэтому
+генератор отчёта работает одновременно с отправкой предыдущих файлов.
+"""
+
+from typing import BinaryIO, Iterable, Union
+
+from github_archive import safe_member_path
+from github_walker import SourceFile
+
+Content = Union[bytes, bytearray, memoryview, str, BinaryIO, Iterable[Union[bytes, str]]]
+
+# Префикс local_path файлов из памяти (для сообщений и плана)
+MEMORY_PREFIX = "<memory>"
+
+
+def _chunk(chunk) -> bytes:
+    return chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk)
+
+
+def content_bytes(content: Content) -> bytes:
+    """Содержимое как bytes; TypeError, если тип не поддерживается"""
+    if isinstance(content, (bytes, bytearray, memoryview, str)):
+        return _chunk(content)
+    read = getattr(content, "read", None)
+    if callable(read):
+        return _chunk(read())
+    if isinstance(content, Iterable):
+        return b"".join(_chunk(chunk) for chunk in content)
+    raise TypeError(f"неподдерживаемое содержимое: {type(content).__name__}")
+
+
+def memory_source(repo_path: str, content: Content, repo_path_base: str = "") -> SourceFile:
+    """
+    Исходный файл из памяти: путь — относительно repo_path_base
+
+    ValueError — путь пустой или выходит за пределы repo_path_base.
+    """
+    rel_path = safe_member_path(str(repo_path))
+    if rel_path is None:
+        raise ValueError(f"недопустимый путь '{repo_path}'")
+    base = safe_member_path(repo_path_base or "")
+    if base:
+        rel_path = f"{base}/{rel_path}"
+    data = content_bytes(content)
+    return SourceFile(f"{MEMORY_PREFIX}/{rel_path}", rel_path, len(data), 0o100644, 0.0, data)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Автоматический выбор способа загрузки (contents / tree / git)
+
+Решение принимается по измеренным входным данным до отправки чего-либо:
+число файлов, общий объём и самый крупный файл источника (один обход без
+чтения содержимого), размер репозитория (от него зависит clone), наличие
+git и остаток лимита запросов API.
+
+    contents — до contents_max_files файлов: 2 запроса на файл, без накладных
+               расходов коммита Git Data API и без clone
+    git      — с git_min_files файлов или git_min_bytes байт, пока clone
+               не дороже git_max_remote_kb; а также когда API не годится
+               (файл крупнее api_max_file_bytes, не хватает лимита запросов)
+    tree     — всё остальное: один коммит, blob параллельно
+
+Файл крупнее api_max_file_bytes без git загрузить нечем (engine None):
+API его не примет, пока он не уходит в LFS (правила --lfs / --lfs-threshold).
+
+Пороги хранятся в JSON и подбираются по результатам бенчмарков:
+
+    python bench_api.py --latency 0.05 --json bench_api.json
+    python bench_git.py --json bench_git.json
+    python github_strategy.py --api bench_api.json --git bench_git.json --out engine_thresholds.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+from dataclasses import asdict, dataclass, field, fields
+from typing import Dict, List, Optional, Tuple
+
+MB = 1024 * 1024
+# Запросы Git Data API сверх blob: ref, дерево ветки, коммит, tree, commit, ref (с запасом на новую ветку)
+TREE_FIXED_CALLS = 8
+
+
+@dataclass
+class EngineThresholds:
+    """Пороги выбора способа загрузки"""
+    contents_max_files: int = 20
+    api_max_file_bytes: int = 50 * MB
+    git_min_files: int = 3000
+    git_min_bytes: int = 512 * MB
+    git_max_remote_kb: int = 2 * 1024 * 1024
+    rate_limit_reserve: int = 100
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EngineThresholds":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: int(v) for k, v in data.items() if k in known})
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "EngineThresholds":
+        """Пороги из JSON; без файла (или при ошибке чтения) — значения по умолчанию"""
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return cls.from_dict(json.load(f))
+            except (OSError, ValueError, TypeError):
+                pass
+        return cls()
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, indent=2)
+
+
+@dataclass
+class SourceStats:
+    """Объём источника по результатам обхода"""
+    files: int = 0
+    bytes: int = 0
+    largest: int = 0
+    largest_path: str = ""
+
+    def add(self, path: str, size: int):
+        self.files += 1
+        self.bytes += size
+        if size > self.largest:
+            self.largest, self.largest_path = size, path
+
+
+@dataclass
+class EngineChoice:
+    """Выбранный способ и доводы в пользу него; engine None — ни один способ не подходит"""
+    engine: Optional[str]
+    reasons: List[str] = field(default_factory=list)
+
+
+def git_available() -> bool:
+    """Установлен ли git (и запускается ли)"""
+    if not shutil.which("git"):
+        return False
+    try:
+        subprocess.run(["git", "--version"], capture_output=True, check=True)
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+
+def choose_engine(stats: SourceStats, thresholds: EngineThresholds, git: bool,
+                  remote_size_kb: Optional[int] = None, rate_remaining: Optional[int] = None) -> EngineChoice:
+    """
+    Выбрать способ загрузки
+
+    Args:
+        stats: Объём источника
+        thresholds: Пороги выбора
+        git: Доступен ли git
+        remote_size_kb: Размер репозитория в KB (поле size API; None — неизвестен)
+        rate_remaining: Остаток лимита запросов (None — неизвестен)
+    """
+    t = thresholds
+    reasons = [f"источник: {stats.files} файлов, {stats.bytes / MB:.1f} MB, "
+               f"крупнейший {stats.largest / MB:.1f} MB"]
+    budget = None if rate_remaining is None else rate_remaining - t.rate_limit_reserve
+    clone_ok = remote_size_kb is None or remote_size_kb <= t.git_max_remote_kb
+    if remote_size_kb is not None:
+        reasons.append(f"репозиторий: {remote_size_kb / 1024:.1f} MB")
+
+    if stats.largest > t.api_max_file_bytes:
+        reasons.append(f"{stats.largest_path} крупнее {t.api_max_file_bytes / MB:.0f} MB — через API не передать")
+        if git:
+            return EngineChoice("git", reasons)
+        reasons.append("git не установлен — нужен git или правило LFS для этого файла")
+        return EngineChoice(None, reasons)
+
+    tree_calls = stats.files + TREE_FIXED_CALLS
+    if budget is not None and budget < tree_calls:
+        reasons.append(f"лимит запросов: осталось {rate_remaining}, нужно до {tree_calls}")
+        if git:
+            return EngineChoice("git", reasons)
+        reasons.append("git не установлен — загрузка упрётся в лимит")
+        return EngineChoice("tree", reasons)
+
+    if stats.files <= t.contents_max_files and (budget is None or budget >= 2 * stats.files):
+        reasons.append(f"не больше {t.contents_max_files} файлов — по файлу через Contents API дешевле")
+        return EngineChoice("contents", reasons)
+
+    bulk = stats.files >= t.git_min_files or stats.bytes >= t.git_min_bytes
+    if bulk and git and clone_ok:
+        reasons.append(f"массовая загрузка (от {t.git_min_files} файлов или {t.git_min_bytes / MB:.0f} MB) — "
+                       f"git push быстрее")
+        return EngineChoice("git", reasons)
+    if bulk and not git:
+        reasons.append("git не установлен")
+    elif bulk:
+        reasons.append(f"clone репозитория больше {t.git_max_remote_kb / 1024:.0f} MB обойдётся дороже")
+    reasons.append("Git Data API: один коммит, blob параллельно")
+    return EngineChoice("tree", reasons)
+
+
+# ─── подбор порогов по бенчмаркам ──────────────────────────────────────────────
+
+def _fit(points: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """Прямая y = a + b·x методом наименьших квадратов (None, если x не различаются)"""
+    n = len(points)
+    if n < 2:
+        return None
+    mean_x = sum(x for x, _y in points) / n
+    mean_y = sum(y for _x, y in points) / n
+    var = sum((x - mean_x) ** 2 for x, _y in points)
+    if not var:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+    return mean_y - slope * mean_x, slope
+
+
+def tune_thresholds(api_report: Dict, git_report: Optional[Dict] = None,
+                    base: Optional[EngineThresholds] = None) -> Tuple[EngineThresholds, List[str]]:
+    """
+    Пороги по отчётам bench_api.py и bench_git.py (--json)
+
+    Стоимость способа — прямая «постоянная часть + цена файла»: точки пересечения
+    прямых дают contents_max_files (contents ↔ tree) и git_min_files (tree ↔ git),
+    а полоса из сценария few-huge и из прогонов git — git_min_bytes.
+    Пороги, для которых данных не хватило, остаются прежними.
+    """
+    t = EngineThresholds(**asdict(base or EngineThresholds()))
+    notes = []
+    rows = {(r["scenario"], r.get("engine")): r for r in api_report.get("results", []) if r.get("ok")}
+
+    contents = rows.get(("many-small", "contents"))
+    tree = rows.get(("many-small", "tree"))
+    tree_fixed = rows.get(("unchanged", "tree"))
+    if not (contents and tree and tree_fixed):
+        notes.append("нет many-small[contents|tree] и unchanged[tree] — пороги API не изменены")
+        return t, notes
+    fixed_tree = tree_fixed["wall"]
+    per_file_contents = contents["wall"] / contents["files"]
+    per_file_tree = max(tree["wall"] - fixed_tree, 0.0) / tree["files"]
+    if per_file_contents > per_file_tree:
+        t.contents_max_files = max(1, int(fixed_tree / (per_file_contents - per_file_tree)))
+        notes.append(f"contents ↔ tree: {per_file_contents * 1000:.2f} / {per_file_tree * 1000:.2f} ms на файл, "
+                     f"постоянная часть tree {fixed_tree:.3f} s → contents_max_files={t.contents_max_files}")
+
+    huge = rows.get(("few-huge", "tree"))
+    api_bandwidth = huge["bytes"] / max(huge["wall"] - fixed_tree, 1e-6) if huge else None
+
+    git_rows = [r for r in (git_report or {}).get("results", []) if r.get("ok")]
+    if not git_rows:
+        notes.append("нет отчёта bench_git — пороги git не изменены")
+        return t, notes
+    # Меньше всего существующих файлов — время clone минимально, остаётся цена новых файлов
+    least = min(r["existing_files"] for r in git_rows)
+    line = _fit([(r["new_files"], r["wall"]) for r in git_rows if r["existing_files"] == least])
+    if line is None:
+        notes.append("в bench_git нужны прогоны с разным числом новых файлов — пороги git не изменены")
+        return t, notes
+    fixed_git, per_file_git = line
+    if per_file_tree > per_file_git and fixed_git > fixed_tree:
+        t.git_min_files = max(1, int((fixed_git - fixed_tree) / (per_file_tree - per_file_git)))
+        notes.append(f"tree ↔ git: {per_file_tree * 1000:.2f} / {per_file_git * 1000:.2f} ms на файл, "
+                     f"постоянная часть git {fixed_git:.3f} s → git_min_files={t.git_min_files}")
+    git_bytes = sum(r["new_files"] * r["file_size"] for r in git_rows if r["existing_files"] == least)
+    git_seconds = sum(max(r["wall"] - fixed_git, 1e-6) for r in git_rows if r["existing_files"] == least)
+    git_bandwidth = git_bytes / git_seconds
+    if api_bandwidth and git_bandwidth > api_bandwidth and fixed_git > fixed_tree:
+        t.git_min_bytes = int((fixed_git - fixed_tree) / (1 / api_bandwidth - 1 / git_bandwidth))
+        notes.append(f"полоса API {api_bandwidth / MB:.1f} MB/s, git {git_bandwidth / MB:.1f} MB/s "
+                     f"→ git_min_bytes={t.git_min_bytes / MB:.0f} MB")
+    else:
+        notes.append("по объёму git не выигрывает у API (или нет сценария few-huge[tree]) — git_min_bytes не изменён")
+    return t, notes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Подбор порогов автоматического выбора способа загрузки")
+    parser.add_argument("--api", required=True, help="Отчёт bench_api.py --json")
+    parser.add_argument("--git", help="Отчёт bench_git.py --json")
+    parser.add_argument("--base", help="Текущие пороги (JSON), которые нужно уточнить")
+    parser.add_argument("--out", help="Куда сохранить пороги (по умолчанию — вывести)")
+    args = parser.parse_args()
+
+    with open(args.api, "r", encoding="utf-8") as f:
+        api_report = json.load(f)
+    git_report = None
+    if args.git:
+        with open(args.git, "r", encoding="utf-8") as f:
+            git_report = json.load(f)
+    thresholds, notes = tune_thresholds(api_report, git_report, EngineThresholds.load(args.base))
+    for note in notes:
+        print(f"📐 {note}")
+    if args.out:
+        thresholds.save(args.out)
+        print(f"📊 Пороги сохранены: {args.out}")
+    else:
+        print(json.dumps(asdict(thresholds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Обход исходных папок для загрузки
+
+SourceWalker читает каталоги через os.scandir параллельно (пул потоков по
+подкаталогам) и применяет правила исключения в стиле .gitignore: встроенный
+список мусора (__pycache__, .venv, node_modules, ...), шаблоны --exclude,
+.git/info/exclude и .gitignore внутри дерева. Исключённые каталоги
+отсекаются целиком и не обходятся. Служебный каталог .git пропускается
+всегда, независимо от правил.
+"""
+
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Служебные данные git: не загружаются никогда (и с --no-default-excludes)
+GIT_DIR = ".git"
+
+# Что не попадает в репозиторий, если пользователь явно не отключил
+DEFAULT_EXCLUDES = [
+    "__pycache__/",
+    "*.py[cod]",
+    ".venv/",
+    "venv/",
+    "node_modules/",
+    ".pytest_cache/",
+    ".mypy_cache/",
+    ".tox/",
+    "build/",
+    "dist/",
+    "*.egg-info/",
+    ".DS_Store",
+    "Thumbs.db",
+]
+
+
+def in_git_dir(rel_path: str) -> bool:
+    """Лежит ли путь (через '/') внутри каталога .git"""
+    return GIT_DIR in rel_path.split("/")
+
+
+class WalkEntry(NamedTuple):
+    """Файл, найденный при обходе"""
+    local_path: str
+    rel_path: str  # относительно корня обхода, через '/'
+    size: int
+    mtime: float
+    mode: int
+
+
+class SourceFile(NamedTuple):
+    """Исходный файл с путём назначения в репозитории"""
+    local_path: str
+    repo_path: str
+    size: int
+    mode: int
+    mtime: float = 0.0
+    # Содержимое в памяти (например, запись архива); None — файл читается с диска
+    data: Optional[bytes] = None
+
+
+def _translate(pattern: str) -> str:
+    """Шаблон gitignore → регулярное выражение (без якорей)"""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i:i + 2] == "**":
+                at_start = i == 0 or pattern[i - 1] == "/"
+                if at_start and pattern[i + 2:i + 3] == "/":
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+                if at_start and i + 2 == n:
+                    out.append(".*")
+                    i += 2
+                    continue
+                out.append("[^/]*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 2 if pattern[i + 1:i + 2] in ("!", "]") else i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """
+    Набор правил исключения (семантика .gitignore): побеждает последнее
+    совпавшее правило, '!' возвращает путь, '/' в конце — только каталоги.
+    Правила из вложенного .gitignore действуют относительно его каталога.
+    """
+
+    __slots__ = ("_rules",)
+
+    def __init__(self, rules: Tuple = ()):
+        self._rules = rules
+
+    @staticmethod
+    def parse(lines: Iterable[str], base: str = "") -> List[Tuple]:
+        rules = []
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip("\r")
+            if not line.strip() or line.startswith("#"):
+                continue
+            # Хвостовые пробелы значимы только если экранированы
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\!") or line.startswith("\\#"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            line = line.lstrip("/")
+            regex = _translate(line)
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+            rules.append((base, re.compile(regex + r"\Z"), negate, dir_only))
+        return rules
+
+    def extend(self, lines: Iterable[str], base: str = "") -> "IgnoreRules":
+        """Новый набор с добавленными правилами (исходный не меняется)"""
+        added = self.parse(lines, base)
+        return IgnoreRules(self._rules + tuple(added)) if added else self
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        result = False
+        for base, regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                sub = rel_path[len(base) + 1:]
+            else:
+                sub = rel_path
+            if regex.match(sub):
+                result = not negate
+        return result
+
+    def __bool__(self):
+        return bool(self._rules)
+
+
+class SourceWalker:
+    """
+    Параллельный обход каталогов с отсечением исключённых поддеревьев
+
+    Args:
+        excludes: Дополнительные шаблоны (синтаксис .gitignore)
+        use_default_excludes: Применять DEFAULT_EXCLUDES
+        use_gitignore: Учитывать .gitignore и .git/info/exclude в исходниках
+        workers: Число потоков сканирования
+    """
+
+    def __init__(self, excludes: Optional[Iterable[str]] = None, use_default_excludes: bool = True,
+                 use_gitignore: bool = True, workers: Optional[int] = None):
+        self.use_gitignore = use_gitignore
+        self.workers = workers or min(16, (os.cpu_count() or 4) * 2)
+        rules = IgnoreRules()
+        if use_default_excludes:
+            rules = rules.extend(DEFAULT_EXCLUDES)
+        self.base_rules = rules.extend(excludes or [])
+
+    def rules_for_root(self, root: str) -> IgnoreRules:
+        rules = self.base_rules
+        if self.use_gitignore:
+            exclude_file = os.path.join(root, ".git", "info", "exclude")
+            if os.path.isfile(exclude_file):
+                rules = rules.extend(_read_lines(exclude_file))
+        return rules
+
+    def walk(self, root: str) -> Iterator[WalkEntry]:
+        """Файлы под root в порядке обнаружения (каталоги сканируются параллельно)"""
+        rules = self.rules_for_root(root)
+        if self.workers <= 1:
+            stack = [(root, "", rules)]
+            while stack:
+                files, subdirs = self._scan(*stack.pop())
+                yield from files
+                stack.extend(reversed(subdirs))
+            return
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="walk")
+        try:
+            pending = {pool.submit(self._scan, root, "", rules)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    for subdir in subdirs:
+                        pending.add(pool.submit(self._scan, *subdir))
+                    yield from files
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _scan(self, dir_path: str, rel: str, rules: IgnoreRules) -> Tuple[List[WalkEntry], List[Tuple]]:
+        files, subdirs = [], []
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            return files, subdirs
+        if self.use_gitignore:
+            for entry in entries:
+                if entry.name == ".gitignore" and entry.is_file():
+                    rules = rules.extend(_read_lines(entry.path), rel)
+                    break
+        for entry in entries:
+            if entry.name == GIT_DIR:
+                continue
+            child_rel = f"{rel}/{entry.name}" if rel else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not rules.ignored(child_rel, True):
+                        subdirs.append((entry.path, child_rel, rules))
+                elif entry.is_file():
+                    if rules.ignored(child_rel, False):
+                        continue
+                    st = entry.stat()
+                    files.append(WalkEntry(entry.path, child_rel, st.st_size, st.st_mtime, st.st_mode))
+            except OSError:
+                # Файл исчез или недоступен между scandir и stat
+                continue
+        return files, subdirs
+
+
+def _read_lines(path: str) -> List[str]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.readlines()
+    except OSError:
+        return []
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Загрузка содержимого архивов против MockGitHubServer: файлы архива, а не сам архив
+
+Запуск: python -m pytest -q (или python -m unittest test_archive_upload)
+"""
+
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from github_automation import GitHubAutomation
+from github_mock_server import MockGitHubServer
+
+FILES = {"proj/main.py": b"print(1)\n", "proj/pkg/util.py": b"x = 1\n", "proj/build/out.o": b"\0\1"}
+
+
+class ArchiveUploadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockGitHubServer(owner="bench").start()
+        env = mock.patch.dict(os.environ, {
+            "GITHUB_AUTOMATION_HISTORY": os.path.join(self.tmp.name, "throughput.json"),
+            "GITHUB_AUTOMATION_THRESHOLDS": os.path.join(self.tmp.name, "thresholds.json"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.repo = self.server.add_repo("demo", {})
+        self.gh = GitHubAutomation(token="x", username="bench", api_base=self.server.url, git_base=self.server.url)
+        self.gh.expand_archives = True
+        self.gh.exclude_patterns = ["build/"]
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def make_zip(self) -> str:
+        path = os.path.join(self.tmp.name, "proj.zip")
+        with zipfile.ZipFile(path, "w") as zf:
+            for name, data in FILES.items():
+                zf.writestr(name, data)
+            zf.writestr("../evil.txt", b"outside\n")
+        return path
+
+    def make_tar(self) -> str:
+        path = os.path.join(self.tmp.name, "proj.tar.gz")
+        with tarfile.open(path, "w:gz") as tf:
+            for name, data in FILES.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+        return path
+
+    def contents(self, branch: str = "main"):
+        return {path: self.repo.blobs[sha] for path, (_mode, sha) in self.repo.branch_tree(branch).items()}
+
+    def test_tree_upload_of_zip_and_tar(self):
+        expected = {"dist/proj/main.py": b"print(1)\n", "dist/proj/pkg/util.py": b"x = 1\n"}
+        for archive in (self.make_zip(), self.make_tar()):
+            with self.subTest(archive=os.path.basename(archive)):
+                self.repo.commit_files("main", {path: None for path in self.repo.branch_tree("main")}, "clear")
+                self.assertTrue(self.gh.upload_files_tree("demo", [archive], repo_path_base="dist"))
+                self.assertEqual(self.contents(), expected)
+
+    def test_contents_upload_of_zip(self):
+        self.assertTrue(self.gh.upload_files("demo", [self.make_zip()]))
+        self.assertEqual(self.contents(), {"proj/main.py": b"print(1)\n", "proj/pkg/util.py": b"x = 1\n"})
+
+    def test_archive_uploaded_as_file_without_expand(self):
+        self.gh.expand_archives = False
+        archive = self.make_zip()
+        with open(archive, "rb") as f:
+            data = f.read()
+
+        self.assertTrue(self.gh.upload_files_tree("demo", [archive]))
+        self.assertEqual(self.contents(), {"proj.zip": data})
+
+
+if __name__ == "__main__":
+    unittest.main()
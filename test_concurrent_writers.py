@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Параллельный писатель сдвигает ветку между чтением и обновлением: повторы
+Git Data API (422), Contents API (409) и git push (non-fast-forward)
+
+Запуск: python -m pytest -q (или python -m unittest test_concurrent_writers)
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from github_automation import GitHubAutomation
+from github_events import ErrorEvent
+from github_mock_server import MockGitHubServer
+
+GIT_IDENTITY = {"GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@localhost",
+                "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@localhost"}
+
+
+class ConcurrentWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        env = mock.patch.dict(os.environ, {
+            "GITHUB_AUTOMATION_HISTORY": os.path.join(self.tmp.name, "throughput.json"),
+            "GITHUB_AUTOMATION_THRESHOLDS": os.path.join(self.tmp.name, "thresholds.json"),
+            **GIT_IDENTITY,
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.src = os.path.join(self.tmp.name, "src")
+        os.makedirs(self.src)
+        with open(os.path.join(self.src, "a.txt"), "wb") as f:
+            f.write(b"ours\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def automation(self, api_base: str = "http://127.0.0.1:9", git_base: str = "") -> GitHubAutomation:
+        gh = GitHubAutomation(token="x", username="bench", api_base=api_base, git_base=git_base or api_base)
+        gh.retry_backoff = 0
+        gh.max_retries = 2
+        self.errors = []
+        gh.events.subscribe(lambda e: self.errors.append(e.message) if isinstance(e, ErrorEvent) else None)
+        return gh
+
+
+class ApiWriterTest(ConcurrentWriterTest):
+    def setUp(self):
+        super().setUp()
+        self.server = MockGitHubServer(owner="bench").start()
+        self.repo = self.server.add_repo("demo", {"keep.txt": b"base\n"})
+        self.gh = self.automation(self.server.url)
+        self.other_commits = []
+
+    def tearDown(self):
+        self.server.stop()
+        super().tearDown()
+
+    def other_writer(self, path: str = "other.txt"):
+        """Коммит другого писателя прямо в ветку mock-сервера"""
+        n = len(self.other_commits)
+        with self.repo.lock:
+            sha = self.repo.commit_files("main", {path: ("100644", self.repo.put_blob(f"other {n}\n".encode())),
+                                                  f"other-{n}.txt": ("100644", self.repo.put_blob(b"x\n"))},
+                                         f"other writer {n}")
+        self.other_commits.append(sha)
+
+    def history(self):
+        messages, sha = [], self.repo.refs["main"]
+        while sha:
+            commit = self.repo.commits[sha]
+            messages.append(commit["message"])
+            sha = commit["parents"][0] if commit["parents"] else None
+        return messages
+
+    def move_branch_before(self, name: str, times: int, path: str = "other.txt"):
+        """Перед каждым из первых times вызовов gh.<name> ветку сдвигает другой писатель"""
+        original = getattr(self.gh, name)
+        calls = []
+
+        def wrapper(*args, **kwargs):
+            result = original(*args, **kwargs)
+            calls.append(args)
+            if len(calls) <= times:
+                self.other_writer(path)
+            return result
+        setattr(self.gh, name, wrapper)
+        return calls
+
+    def test_tree_ref_update_retries_on_top_of_new_tip(self):
+        self.move_branch_before("_commit_tree", 1)
+
+        self.assertTrue(self.gh.upload_files_tree("demo", [self.src], commit_message="ours"))
+        self.assertEqual(self.history().count("ours"), 1)
+        self.assertEqual(self.history()[:2], ["ours", "other writer 0"])
+        self.assertEqual(sorted(self.repo.branch_tree("main")),
+                         ["keep.txt", "other-0.txt", "other.txt", "src/a.txt"])
+        self.assertEqual(self.errors, [])
+
+    def test_tree_ref_update_gives_up_after_max_retries(self):
+        calls = self.move_branch_before("_commit_tree", 100)
+
+        self.assertFalse(self.gh.upload_files_tree("demo", [self.src], commit_message="ours"))
+        self.assertEqual(len(calls), self.gh.max_retries + 1)
+        self.assertEqual(self.repo.refs["main"], self.other_commits[-1])
+        self.assertNotIn("ours", self.history())
+        self.assertIn("Ошибка обновления ветки 'main': 422", self.errors)
+
+    def test_tree_stops_when_other_writer_touched_same_path(self):
+        self.move_branch_before("_commit_tree", 1, path="src/a.txt")
+
+        self.assertFalse(self.gh.upload_files_tree("demo", [self.src], commit_message="ours"))
+        self.assertEqual(self.repo.refs["main"], self.other_commits[-1])
+        self.assertTrue(any(e.startswith("Конфликт с параллельным изменением") for e in self.errors))
+
+    def test_contents_put_retries_with_fresh_sha(self):
+        self.repo.commit_files("main", {"src/a.txt": ("100644", self.repo.put_blob(b"base\n"))}, "seed a")
+        self.move_branch_before("_get_file_sha", 1, path="src/a.txt")
+
+        self.assertTrue(self.gh.upload_files("demo", [self.src], commit_message="ours"))
+        self.assertEqual(self.history()[:2], ["ours", "other writer 0"])
+        tree = self.repo.branch_tree("main")
+        self.assertEqual(self.repo.blobs[tree["src/a.txt"][1]], b"ours\n")
+        self.assertIn("other-0.txt", tree)
+        self.assertEqual(self.server.requests_by_route.get("put_contents"), 2)
+        self.assertEqual(self.errors, [])
+
+    def test_contents_put_gives_up_after_max_retries(self):
+        self.repo.commit_files("main", {"src/a.txt": ("100644", self.repo.put_blob(b"base\n"))}, "seed a")
+        calls = self.move_branch_before("_get_file_sha", 100, path="src/a.txt")
+
+        self.gh.upload_files("demo", [self.src], commit_message="ours")
+        self.assertEqual(len(calls), self.gh.max_retries + 1)
+        self.assertNotIn("ours", self.history())
+        self.assertEqual(self.errors, ["Ошибка загрузки: 409"])
+
+
+@unittest.skipUnless(shutil.which("git"), "нужен git")
+class GitPushWriterTest(ConcurrentWriterTest):
+    def setUp(self):
+        super().setUp()
+        remotes = os.path.join(self.tmp.name, "remotes")
+        self.bare = os.path.join(remotes, "bench", "demo.git")
+        self.git("init", "-q", "--bare", "-b", "main", self.bare)
+        self.other = os.path.join(self.tmp.name, "other")
+        self.git("clone", "-q", self.bare, self.other)
+        self.git("checkout", "-q", "-b", "main", cwd=self.other)
+        self.other_writer()
+        self.gh = self.automation(git_base=f"file://{remotes}")
+        self.pushes = 0
+
+    def git(self, *args, cwd=None) -> str:
+        return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+    def other_writer(self):
+        """Коммит другого писателя в bare-репозиторий"""
+        n = len(self.git("rev-list", "--all", cwd=self.other).split())
+        with open(os.path.join(self.other, f"other-{n}.txt"), "w") as f:
+            f.write(f"other {n}\n")
+        self.git("add", ".", cwd=self.other)
+        self.git("commit", "-q", "-m", f"other writer {n}", cwd=self.other)
+        self.git("push", "-q", "origin", "main", cwd=self.other)
+
+    def move_branch_before_push(self, times: int):
+        original = self.gh._run_git
+
+        def wrapper(args, *rest, **kwargs):
+            if args[0] == "push":
+                self.pushes += 1
+                if self.pushes <= times:
+                    self.other_writer()
+            return original(args, *rest, **kwargs)
+        self.gh._run_git = wrapper
+
+    def remote_log(self):
+        return self.git("log", "--format=%s", "main", cwd=self.bare).split("\n")[:-1]
+
+    def test_push_retries_with_cherry_pick(self):
+        self.move_branch_before_push(1)
+
+        self.assertTrue(self.gh.upload_files_git("demo", [self.src], commit_message="ours"))
+        self.assertEqual(self.pushes, 2)
+        self.assertEqual(self.remote_log(), ["ours", "other writer 1", "other writer 0"])
+        files = self.git("ls-tree", "-r", "--name-only", "main", cwd=self.bare).split()
+        self.assertEqual(sorted(files), ["other-0.txt", "other-1.txt", "src/a.txt"])
+
+    def test_push_gives_up_after_max_retries(self):
+        self.move_branch_before_push(100)
+
+        self.assertFalse(self.gh.upload_files_git("demo", [self.src], commit_message="ours"))
+        self.assertEqual(self.pushes, self.gh.max_retries + 1)
+        self.assertNotIn("ours", self.remote_log())
+        self.assertEqual(len(self.errors), 1)
+        self.assertTrue(self.errors[0].startswith("Ошибка Git"))
+
+
+if __name__ == "__main__":
+    unittest.main()
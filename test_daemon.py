@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Демон CLI: испорченные запросы не останавливают его
+
+Запуск: python -m pytest -q (или python -m unittest test_daemon)
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+import github_daemon
+
+
+@unittest.skipUnless(github_daemon.unix_sockets_available(), "нужны Unix-сокеты")
+class DaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "daemon.sock")
+        self.daemon = github_daemon.AutomationDaemon(self.path)
+        self.thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        self.thread.start()
+        for _ in range(100):
+            if github_daemon._ping(self.path):
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        github_daemon.call([], self.path, command="stop")
+        self.thread.join(5)
+        self.tmp.cleanup()
+
+    def send_raw(self, payload: bytes):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(self.path)
+            sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("r", encoding="utf-8") as f:
+                return [json.loads(line) for line in f]
+
+    def test_bad_requests_keep_daemon_serving(self):
+        for payload in (b"{not json\n", b"[1, 2]\n", b'{"argv": 5}\n', b"\xff\xfe\n", b'{"argv": ["--act'):
+            replies = self.send_raw(payload)
+            self.assertEqual(replies[-1], {"exit": 2}, payload)
+            self.assertIn("err", replies[0])
+        self.assertTrue(github_daemon._ping(self.path))
+        self.assertEqual(self.daemon.calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fan-out против MockGitHubServer: один набор изменений в несколько репозиториев и веток
+
+Запуск: python -m pytest -q (или python -m unittest test_fanout)
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from github_automation import GitHubAutomation
+from github_mock_server import MockGitHubServer
+
+SOURCE = {"main.py": b"print(1)\n", "pkg/util.py": b"x = 1\n"}
+
+
+class FanoutTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockGitHubServer(owner="bench").start()
+        env = mock.patch.dict(os.environ, {
+            "GITHUB_AUTOMATION_HISTORY": os.path.join(self.tmp.name, "throughput.json"),
+            "GITHUB_AUTOMATION_THRESHOLDS": os.path.join(self.tmp.name, "thresholds.json"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.gh = GitHubAutomation(token="x", username="bench", api_base=self.server.url, git_base=self.server.url)
+        self.gh.retry_backoff = 0
+        self.src = os.path.join(self.tmp.name, "src")
+        for rel, data in SOURCE.items():
+            path = os.path.join(self.src, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def contents(self, repo: str, branch: str = "main"):
+        repo = self.server.repos[repo]
+        return {path: repo.blobs[sha] for path, (_mode, sha) in repo.branch_tree(branch).items()}
+
+    def test_targets_share_blobs_and_fail_independently(self):
+        self.server.add_repo("a", {"README.md": b"a\n"})
+        self.server.add_repo("b", {"src/main.py": b"print(1)\n", "src/pkg/util.py": b"x = 1\n"})
+        unchanged = self.server.repos["b"].refs["main"]
+
+        report = self.gh.upload_files_fanout(["a", "a:dev", "b", "missing"], [self.src], commit_message="fan")
+        self.assertFalse(report)
+        statuses = {(r.repo, r.branch): r.status for r in report.results}
+        self.assertEqual(statuses, {("a", "main"): "committed", ("a", "dev"): "committed",
+                                    ("b", "main"): "unchanged", ("missing", "main"): "failed"})
+
+        expected = {"README.md": b"a\n", "src/main.py": b"print(1)\n", "src/pkg/util.py": b"x = 1\n"}
+        self.assertEqual(self.contents("a"), expected)
+        self.assertEqual(self.contents("a", "dev"), expected)
+        self.assertEqual(self.server.repos["b"].refs["main"], unchanged)
+        # Обе ветки «a» ссылаются на одни blob: каждый отправлен один раз
+        self.assertEqual(self.server.requests_by_route.get("create_blob"), len(SOURCE))
+
+    def test_sync_deletes_in_every_target(self):
+        for name in ("a", "b"):
+            self.server.add_repo(name, {"lib/src/stale.py": b"old\n", "keep.txt": b"k\n"})
+
+        report = self.gh.upload_files_fanout(["a", "b"], [self.src], sync=True, repo_path_base="lib")
+        self.assertTrue(report)
+        for name in ("a", "b"):
+            self.assertEqual(sorted(self.contents(name)), ["keep.txt", "lib/src/main.py", "lib/src/pkg/util.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пакетные операции (fleet) против MockGitHubServer: выбор по шаблону и итог по репозиториям
+
+Запуск: python -m pytest -q (или python -m unittest test_fleet)
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from github_automation import GitHubAutomation
+from github_fleet import RepoSelector
+from github_mock_server import MockGitHubServer
+
+
+class FleetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockGitHubServer(owner="bench").start()
+        env = mock.patch.dict(os.environ, {
+            "GITHUB_AUTOMATION_HISTORY": os.path.join(self.tmp.name, "throughput.json"),
+            "GITHUB_AUTOMATION_THRESHOLDS": os.path.join(self.tmp.name, "thresholds.json"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.gh = GitHubAutomation(token="x", username="bench", api_base=self.server.url, git_base=self.server.url)
+        self.gh.retry_backoff = 0
+        for name in ("svc-a", "svc-b", "svc-c", "tools"):
+            self.server.add_repo(name, {"README.md": name.encode()})
+        self.selector = RepoSelector(patterns=["svc-*"])
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def resolve(self):
+        return self.selector.resolve(lambda: [repo["name"] for repo in self.gh.list_repositories()])
+
+    def test_settings_applied_to_selected_repos(self):
+        repos = self.resolve()
+        self.assertEqual(sorted(repos), ["svc-a", "svc-b", "svc-c"])
+
+        report = self.gh.run_fleet(repos, "update-settings", description="service")
+        self.assertTrue(report)
+        self.assertEqual({name: repo.description for name, repo in self.server.repos.items()},
+                         {"svc-a": "service", "svc-b": "service", "svc-c": "service", "tools": ""})
+
+    def test_failed_repo_does_not_stop_others(self):
+        self.server.repos["svc-b"].refs["develop"] = self.server.repos["svc-b"].refs.pop("main")
+
+        report = self.gh.run_fleet(self.resolve() + ["gone"], "protect-branch", branch_name="main",
+                                   required_approving_review_count=2)
+        self.assertFalse(report)
+        self.assertEqual(sorted(r.repo for r in report.failed), ["gone", "svc-b"])
+        self.assertTrue(all(r.error for r in report.failed))
+        for name in ("svc-a", "svc-c"):
+            reviews = self.server.repos[name].protections["main"]["required_pull_request_reviews"]
+            self.assertEqual(reviews["required_approving_review_count"], 2)
+
+        path = os.path.join(self.tmp.name, "report.json")
+        report.write(path)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual((data["operation"], data["ok"], len(data["results"])), ("protect-branch", False, 4))
+
+    def test_delete_selected_repos(self):
+        report = self.gh.run_fleet(self.resolve(), "delete-repo")
+        self.assertTrue(report)
+        self.assertEqual(sorted(self.server.repos), ["tools"])
+
+
+if __name__ == "__main__":
+    unittest.main()
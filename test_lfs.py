@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Git LFS против MockGitHubServer: объекты в хранилище, указатели в дереве
+
+Запуск: python -m pytest -q (или python -m unittest test_lfs)
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from github_automation import GitHubAutomation
+from github_lfs import LfsClient, LfsObject, data_oid, pointer_bytes
+from github_mock_server import MockGitHubServer, git_blob_sha
+
+
+class LfsUploadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockGitHubServer(owner="bench").start()
+        env = mock.patch.dict(os.environ, {
+            "GITHUB_AUTOMATION_HISTORY": os.path.join(self.tmp.name, "throughput.json"),
+            "GITHUB_AUTOMATION_THRESHOLDS": os.path.join(self.tmp.name, "thresholds.json"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.repo = self.server.add_repo("demo", {})
+        self.gh = GitHubAutomation(token="x", username="bench", api_base=self.server.url, git_base=self.server.url)
+        self.gh.retry_backoff = 0
+        self.gh.lfs_patterns = ["*.bin"]
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def write(self, rel: str, data: bytes) -> str:
+        path = os.path.join(self.tmp.name, "src", rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_tree_upload_stores_objects_and_pointers(self):
+        payload = os.urandom(4096)
+        self.write("a.bin", payload)
+        self.write("copy/a.bin", payload)
+        self.write("main.py", b"print(1)\n")
+        self.server.lfs_fail_next = 1
+
+        self.assertTrue(self.gh.upload_files_tree("demo", [os.path.join(self.tmp.name, "src")]))
+        oid, size = data_oid(payload)
+        self.assertEqual(self.repo.lfs, {oid: payload})
+        # Одна передача на общее содержимое и один повтор после сбоя
+        self.assertEqual(self.server.requests_by_route.get("lfs_upload"), 2)
+        tree = self.repo.branch_tree("main")
+        pointer = git_blob_sha(pointer_bytes(oid, size))
+        self.assertEqual(tree["src/a.bin"][1], pointer)
+        self.assertEqual(tree["src/copy/a.bin"][1], pointer)
+        self.assertEqual(self.repo.blobs[tree["src/main.py"][1]], b"print(1)\n")
+        self.assertIn(b"*.bin filter=lfs", self.repo.blobs[tree[".gitattributes"][1]])
+
+    def test_client_reports_duplicates_as_present(self):
+        data = b"same content\n"
+        oid, size = data_oid(data)
+        objects = [LfsObject(oid, size, "", f"{i}.bin", data) for i in range(3)]
+        client = LfsClient(f"{self.server.url}/bench/demo.git/info/lfs", self.gh._request, retry_backoff=0)
+
+        result = client.upload(objects)
+        self.assertTrue(result.ok)
+        self.assertEqual(len(result.uploaded), 1)
+        self.assertEqual(sorted(o.repo_path for o in result.uploaded + result.present), ["0.bin", "1.bin", "2.bin"])
+        self.assertEqual(self.server.requests_by_route.get("lfs_upload"), 1)
+
+        again = client.upload(objects)
+        self.assertEqual((len(again.uploaded), len(again.present)), (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Манифест: разбор и проверка полей
+
+Запуск: python -m pytest -q (или python -m unittest test_manifest)
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from github_manifest import ManifestError, build_steps, load_manifest
+
+
+def manifest(**protect):
+    return {"repos": [{"name": "a", "protect": [dict(branch="main", **protect)]}]}
+
+
+class ManifestTest(unittest.TestCase):
+    def test_reviews_default_and_value(self):
+        for data, expected in ((manifest(), 1), (manifest(reviews=0), 0), (manifest(reviews=6), 6)):
+            steps = build_steps(data)
+            self.assertEqual([s.params["reviews"] for s in steps if s.kind == "protect"], [expected])
+
+    def test_bad_reviews_is_manifest_error(self):
+        for value in ("two", True, -1, 7, 2.5):
+            with self.assertRaises(ManifestError) as ctx:
+                build_steps(manifest(reviews=value))
+            self.assertIn("repos[1] (a).protect", str(ctx.exception))
+
+    def test_load_manifest_reports_bad_reviews(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plan.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(manifest(reviews="two"), f)
+            with self.assertRaises(ManifestError):
+                load_manifest(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Метрики вызовов: этапы операций отдельно от вызовов API и git, подсчёт ошибок
+
+Запуск: python -m pytest -q (или python -m unittest test_metrics)
+"""
+
+import unittest
+
+from github_metrics import CallRecord, MetricsRecorder
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsRecorder()
+        self.metrics.record(CallRecord("http", "GET", "/repos/{owner}/{repo}", 200, latency=0.02))
+        self.metrics.record(CallRecord("git", "git", "git push", 0, latency=0.3))
+        self.metrics.record(CallRecord("phase", "phase", "clone", 0, latency=1.2))
+
+    def test_prometheus_phases_are_separate_family(self):
+        text = self.metrics.to_prometheus()
+        calls = [line for line in text.splitlines() if line.startswith("github_automation_calls_total")]
+        self.assertEqual(len(calls), 2)
+        self.assertNotIn('kind="phase"', text)
+        self.assertIn('github_automation_phase_duration_seconds_count{phase="clone"} 1', text)
+
+    def test_json_phases_are_separate(self):
+        data = self.metrics.to_dict()
+        self.assertEqual(sorted(e["kind"] for e in data["endpoints"]), ["git", "http"])
+        self.assertEqual([p["phase"] for p in data["phases"]], ["clone"])
+        self.assertEqual(data["totals"]["http_requests"] + data["totals"]["git_commands"], 2)
+
+    def test_http_without_response_counts_as_error(self):
+        self.metrics.record(CallRecord("http", "PUT", "/repos/{owner}/{repo}/contents/{path}", 0, latency=5.0))
+        self.metrics.record(CallRecord("http", "GET", "/repos/{owner}/{repo}", 404, latency=0.02))
+        self.metrics.record(CallRecord("git", "git", "git fetch", 128, latency=0.1))
+        self.assertEqual(self.metrics.totals()["errors"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
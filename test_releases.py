@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ассеты релиза против MockGitHubServer: загрузка, докачка после сбоя, повторный запуск
+
+Запуск: python -m pytest -q (или python -m unittest test_releases)
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from github_automation import GitHubAutomation
+from github_events import ErrorEvent
+from github_mock_server import MockGitHubServer
+
+
+class ReleaseAssetsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockGitHubServer(owner="bench").start()
+        env = mock.patch.dict(os.environ, {
+            "GITHUB_AUTOMATION_HISTORY": os.path.join(self.tmp.name, "throughput.json"),
+            "GITHUB_AUTOMATION_THRESHOLDS": os.path.join(self.tmp.name, "thresholds.json"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.repo = self.server.add_repo("demo", {"README.md": b"demo\n"})
+        self.gh = GitHubAutomation(token="x", username="bench", api_base=self.server.url, git_base=self.server.url)
+        self.gh.retry_backoff = 0
+        self.errors = []
+        self.gh.events.subscribe(lambda e: self.errors.append(e.message) if isinstance(e, ErrorEvent) else None)
+        self.dist = os.path.join(self.tmp.name, "dist")
+        os.makedirs(self.dist)
+        self.files = {"app.tar.gz": os.urandom(2048), "app.whl": os.urandom(1024)}
+        for name, data in self.files.items():
+            with open(os.path.join(self.dist, name), "wb") as f:
+                f.write(data)
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def assets(self, tag: str = "v1"):
+        release = next(r for r in self.repo.releases.values() if r["tag_name"] == tag)
+        return {a["name"]: (a["state"], a["data"]) for a in release["assets"].values()}
+
+    def test_upload_creates_release_and_resumes_after_failure(self):
+        self.server.asset_fail_next = 1
+
+        self.assertTrue(self.gh.upload_release_assets("demo", [self.dist], tag="v1"))
+        self.assertEqual(self.assets(), {name: ("uploaded", data) for name, data in self.files.items()})
+        self.assertEqual(self.server.requests_by_route.get("upload_asset"), 3)
+        self.assertEqual(self.errors, [])
+
+        # Повторный запуск ничего не передаёт
+        self.server.reset_counters()
+        self.assertTrue(self.gh.upload_release_assets("demo", [self.dist], tag="v1"))
+        self.assertEqual(self.server.requests_by_route.get("upload_asset", 0), 0)
+        self.assertEqual(len(self.repo.releases), 1)
+
+    def test_changed_asset_needs_overwrite(self):
+        self.assertTrue(self.gh.upload_release_assets("demo", [self.dist], tag="v1"))
+        changed = b"rebuilt\n"
+        with open(os.path.join(self.dist, "app.whl"), "wb") as f:
+            f.write(changed)
+
+        self.assertFalse(self.gh.upload_release_assets("demo", [self.dist], tag="v1"))
+        self.assertEqual(self.assets()["app.whl"], ("uploaded", self.files["app.whl"]))
+        self.assertEqual(len(self.errors), 1)
+
+        self.assertTrue(self.gh.upload_release_assets("demo", [self.dist], tag="v1", overwrite=True))
+        self.assertEqual(self.assets()["app.whl"], ("uploaded", changed))
+
+
+if __name__ == "__main__":
+    unittest.main()
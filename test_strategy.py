@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Выбор способа загрузки: файл, который не пропустит API
+
+Запуск: python -m pytest -q (или python -m unittest test_strategy)
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from github_automation import GitHubAutomation
+from github_mock_server import MockGitHubServer
+from github_strategy import MB, EngineThresholds, SourceStats, choose_engine
+
+
+class ChooseEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.stats = SourceStats()
+        self.stats.add("small.txt", 10)
+        self.stats.add("video.mp4", 60 * MB)
+
+    def test_large_file_goes_through_git(self):
+        self.assertEqual(choose_engine(self.stats, EngineThresholds(), git=True).engine, "git")
+
+    def test_large_file_without_git_has_no_engine(self):
+        choice = choose_engine(self.stats, EngineThresholds(), git=False)
+        self.assertIsNone(choice.engine)
+        self.assertIn("video.mp4", "; ".join(choice.reasons))
+
+
+class AutoUploadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        env = mock.patch.dict(os.environ, {
+            "GITHUB_AUTOMATION_HISTORY": os.path.join(self.tmp.name, "throughput.json"),
+            "GITHUB_AUTOMATION_THRESHOLDS": os.path.join(self.tmp.name, "thresholds.json"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.server = MockGitHubServer(owner="bench").start()
+        self.server.add_repo("demo", {})
+        self.gh = GitHubAutomation(token="x", username="bench", api_base=self.server.url, git_base=self.server.url)
+        self.gh._git_available = False
+        self.gh.engine_thresholds.api_max_file_bytes = 1024
+        self.src = os.path.join(self.tmp.name, "src")
+        os.makedirs(self.src)
+        with open(os.path.join(self.src, "big.bin"), "wb") as f:
+            f.write(b"\0" * 4096)
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_auto_refuses_before_sending(self):
+        self.assertIsNone(self.gh.choose_engine("demo", [self.src]))
+        self.assertFalse(self.gh.upload_files_auto("demo", [self.src]))
+        self.assertEqual(self.server.requests_by_route.get("create_blob", 0), 0)
+        self.assertEqual(self.server.repos["demo"].branch_tree("main"), {})
+
+    def test_lfs_rule_makes_api_usable(self):
+        self.gh.lfs_patterns = ["*.bin"]
+        self.assertEqual(self.gh.choose_engine("demo", [self.src]), "contents")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Загрузка через Git Data API против MockGitHubServer: что остаётся в ветке
+
+Запуск: python -m pytest -q (или python -m unittest test_upload_tree)
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from github_automation import GitHubAutomation
+from github_mock_server import MockGitHubServer
+
+
+class TreeUploadTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = MockGitHubServer(owner="bench").start()
+        env = mock.patch.dict(os.environ, {
+            "GITHUB_AUTOMATION_HISTORY": os.path.join(self.tmp.name, "throughput.json"),
+            "GITHUB_AUTOMATION_THRESHOLDS": os.path.join(self.tmp.name, "thresholds.json"),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.gh = GitHubAutomation(token="x", username="bench", api_base=self.server.url, git_base=self.server.url)
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def write(self, rel: str, data: bytes) -> str:
+        path = os.path.join(self.tmp.name, "src", rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def tree(self, repo: str, branch: str = "main"):
+        return self.server.repos[repo].branch_tree(branch)
+
+    def test_upload_keeps_remote_files_with_same_content(self):
+        # Пустой __init__.py совпадает по содержимому с файлом в ветке — это не перемещение
+        self.server.add_repo("demo", {"src/old/__init__.py": b"", "src/old/mod.py": b"print('old')\n"})
+        self.write("new/__init__.py", b"")
+
+        self.assertTrue(self.gh.upload_files_tree("demo", [os.path.join(self.tmp.name, "src")]))
+        self.assertEqual(sorted(self.tree("demo")),
+                         ["src/new/__init__.py", "src/old/__init__.py", "src/old/mod.py"])
+
+    def test_upload_reuses_blob_without_deleting(self):
+        content = b"shared module body\n" * 10
+        self.server.add_repo("demo", {"src/old/mod.py": content})
+        self.write("new/mod.py", content)
+
+        self.assertTrue(self.gh.upload_files_tree("demo", [os.path.join(self.tmp.name, "src")]))
+        tree = self.tree("demo")
+        self.assertEqual(sorted(tree), ["src/new/mod.py", "src/old/mod.py"])
+        self.assertEqual(tree["src/new/mod.py"], tree["src/old/mod.py"])
+        self.assertEqual(self.server.requests_by_route.get("create_blob", 0), 0)
+
+    def test_sync_moves_and_deletes(self):
+        content = b"shared module body\n" * 10
+        self.server.add_repo("demo", {"src/old/__init__.py": b"", "src/old/mod.py": content})
+        self.write("new/__init__.py", b"")
+        self.write("new/mod.py", content)
+
+        self.assertTrue(self.gh.upload_files_tree("demo", [os.path.join(self.tmp.name, "src")], sync=True))
+        self.assertEqual(sorted(self.tree("demo")), ["src/new/__init__.py", "src/new/mod.py"])
+
+    def test_fanout_keeps_remote_files_with_same_content(self):
+        self.server.add_repo("a", {"src/old/__init__.py": b"", "src/old/mod.py": b"x = 1\n"})
+        self.server.add_repo("b", {"src/old/__init__.py": b""})
+        self.write("new/__init__.py", b"")
+
+        report = self.gh.upload_files_fanout(["a", "b"], [os.path.join(self.tmp.name, "src")])
+        self.assertTrue(report)
+        self.assertEqual(sorted(self.tree("a")), ["src/new/__init__.py", "src/old/__init__.py", "src/old/mod.py"])
+        self.assertEqual(sorted(self.tree("b")), ["src/new/__init__.py", "src/old/__init__.py"])
+
+    def test_sync_aborts_on_truncated_tree(self):
+        repo = self.server.add_repo("demo", {"src/a.txt": b"a\n", "src/b.txt": b"b\n", "src/c.txt": b"c\n"})
+        head = repo.refs["main"]
+        self.server.tree_limit = 2
+        self.write("a.txt", b"new\n")
+
+        self.assertFalse(self.gh.upload_files_tree("demo", [os.path.join(self.tmp.name, "src")], sync=True))
+        self.assertEqual(repo.refs["main"], head)
+        report = self.gh.upload_files_fanout(["demo"], [os.path.join(self.tmp.name, "src")], sync=True)
+        self.assertEqual(report.count("failed"), 1)
+        self.assertEqual(repo.refs["main"], head)
+
+        # Без синхронизации неполный индекс — только подсказка
+        self.assertTrue(self.gh.upload_files_tree("demo", [os.path.join(self.tmp.name, "src")]))
+        self.assertEqual(sorted(self.tree("demo")), ["src/a.txt", "src/b.txt", "src/c.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Обход источников: правила исключения и служебный каталог .git
+
+Запуск: python -m pytest -q (или python -m unittest test_walker)
+"""
+
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from github_archive import ArchiveReader
+from github_automation import GitHubAutomation
+from github_mock_server import MockGitHubServer
+from github_walker import SourceWalker
+
+
+class GitDirTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "proj")
+        for rel, data in {"main.py": b"print(1)\n", ".git/config": b"[core]\n", ".git/HEAD": b"ref\n",
+                          "lib/.git/config": b"[core]\n", "__pycache__/main.pyc": b"\0"}.items():
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_walker_skips_git_without_default_excludes(self):
+        for workers in (1, 4):
+            walker = SourceWalker(use_default_excludes=False, workers=workers)
+            paths = sorted(entry.rel_path for entry in walker.walk(self.root))
+            self.assertEqual(paths, ["__pycache__/main.pyc", "main.py"])
+
+    def test_walker_git_not_returned_by_negation(self):
+        walker = SourceWalker(["!.git/", "__pycache__/"], use_default_excludes=False, workers=1)
+        self.assertEqual(sorted(entry.rel_path for entry in walker.walk(self.root)), ["main.py"])
+
+    def test_archive_skips_git_entries(self):
+        archive = os.path.join(self.tmp.name, "proj.zip")
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("proj/main.py", b"print(1)\n")
+            zf.writestr("proj/.git/config", b"[core]\n")
+            zf.writestr(".git/HEAD", b"ref\n")
+        paths = [entry.rel_path for entry in ArchiveReader(archive).entries(with_data=False)]
+        self.assertEqual(paths, ["proj/main.py"])
+
+    def test_tree_upload_skips_git_without_default_excludes(self):
+        env = {"GITHUB_AUTOMATION_HISTORY": os.path.join(self.tmp.name, "throughput.json"),
+               "GITHUB_AUTOMATION_THRESHOLDS": os.path.join(self.tmp.name, "thresholds.json")}
+        with mock.patch.dict(os.environ, env), MockGitHubServer(owner="bench") as server:
+            server.add_repo("demo", {})
+            gh = GitHubAutomation(token="x", username="bench", api_base=server.url, git_base=server.url)
+            gh.use_default_excludes = False
+            self.assertTrue(gh.upload_files_tree("demo", [self.root]))
+            self.assertEqual(sorted(server.repos["demo"].branch_tree("main")),
+                             ["proj/__pycache__/main.pyc", "proj/main.py"])
+
+    def test_contents_walk_applies_folder_rules(self):
+        for rel, data in {".gitignore": b"*.log\n", "debug.log": b"x\n", "node_modules/dep.js": b"x\n"}.items():
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        gh = GitHubAutomation(token="x", username="bench")
+        paths = sorted(source.repo_path for source in gh._walk_sources([self.root], "site", contents=True))
+        self.assertEqual(paths, ["site/.gitignore", "site/main.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()